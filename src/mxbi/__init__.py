@@ -1,8 +1,24 @@
 def main() -> None:
+    import sys
+
+    if sys.argv[1:2] == ["replay"]:
+        from mxbi.tools.replay.main import app
+
+        app(args=sys.argv[2:], prog_name="mxbi replay")
+        return
+
+    if sys.argv[1:2] == ["bundle"]:
+        from mxbi.tools.bundle.main import app
+
+        app(args=sys.argv[2:], prog_name="mxbi bundle")
+        return
+
+    from mxbi.columnar import compact_recent
     from mxbi.theater import Theater
     from mxbi.tmp_post_porcess import HabituationTrainingStagePostProcess
     from mxbi.tools.sync_data.sync_data import sync_data
     from mxbi.ui.launch_panel import LaunchPanel
+    from mxbi.utils.logger import logger
 
     LaunchPanel()
 
@@ -10,8 +26,17 @@ def main() -> None:
     data_paths = theater.data_path
 
     HabituationTrainingStagePostProcess(data_paths)
+
+    # Back up the raw data first; compaction is optional analysis support.
     sync_data()
 
+    try:
+        compact_recent()
+    except ModuleNotFoundError as e:
+        logger.warning(f"Skipping trial log compaction: {e}")
+    except Exception as e:
+        logger.error(f"Trial log compaction failed: {e}")
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,281 @@
+"""
+Columnar copies of the per-stage trial logs, for analysis.
+
+`compact_day` turns every stage's JSONL of one day into one Parquet file
+per stage, at <data>/.columnar/<YYYYMMDD>/<stage>.parquet. It holds all
+sessions and animals of that day. Each row gets `date` and `session_id`
+columns. Nested objects are flattened into dotted columns (e.g.
+`trial_config.level`). Lists of objects such as `touch_events` stay
+list<struct> columns. Strings are dictionary-encoded, so they load as
+pandas categoricals. The JSONL files are never modified.
+
+`load_trials` reads only the requested columns, days and animals back
+into a DataFrame.
+
+pyarrow (the `columnar` extra) is only needed here and is imported on first
+use.
+"""
+
+import json
+import os
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable
+
+from mxbi.path import COLUMNAR_DIR_NAME, DATA_DIR_PATH
+from mxbi.utils.jsonl import read_jsonl
+from mxbi.utils.logger import logger
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow as pa
+
+DATE_FORMAT = "%Y%m%d"
+# Per-animal directories that hold logs other than trials.
+NON_TRIAL_DIRS = frozenset({"scheduler"})
+PARQUET_COMPRESSION = "zstd"
+
+
+def compact_day(
+    day: str, data_dir: Path = DATA_DIR_PATH, *, force: bool = False
+) -> list[Path]:
+    """
+    Write the Parquet files of `day` (YYYYMMDD) and return those written.
+
+    A stage whose Parquet file is newer than all of its JSONL sources is
+    skipped unless `force` is set, so running this repeatedly is cheap.
+    """
+    pa, pq = _require_pyarrow()
+
+    sources = _stage_sources(data_dir / day)
+    out_dir = data_dir / COLUMNAR_DIR_NAME / day
+    written: list[Path] = []
+    for stage, files in sorted(sources.items()):
+        out_path = out_dir / f"{stage}.parquet"
+        if not force and _is_current(out_path, [path for _, _, path in files]):
+            continue
+
+        table = _build_table(pa, day, files)
+        if table is None:
+            continue
+
+        out_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = out_path.with_name(f"{out_path.name}.{os.getpid()}.tmp")
+        try:
+            pq.write_table(table, tmp_path, compression=PARQUET_COMPRESSION)
+            os.replace(tmp_path, out_path)
+        except OSError as e:
+            logger.error(f"Failed to write {out_path}: {e}")
+            tmp_path.unlink(missing_ok=True)
+            continue
+        logger.info(f"Compacted {table.num_rows} {stage} trials of {day}")
+        written.append(out_path)
+    return written
+
+
+def compact_recent(
+    days: int = 2, data_dir: Path = DATA_DIR_PATH, *, force: bool = False
+) -> list[Path]:
+    """Compact today and the `days - 1` days before it (a session may span midnight)."""
+    today = datetime.now().date()
+    written: list[Path] = []
+    for offset in range(days):
+        day = (today - timedelta(days=offset)).strftime(DATE_FORMAT)
+        if (data_dir / day).is_dir():
+            written += compact_day(day, data_dir, force=force)
+    return written
+
+
+def compact_all(data_dir: Path = DATA_DIR_PATH, *, force: bool = False) -> list[Path]:
+    written: list[Path] = []
+    for day_dir in sorted(data_dir.iterdir()):
+        if day_dir.is_dir() and _parse_day(day_dir.name) is not None:
+            written += compact_day(day_dir.name, data_dir, force=force)
+    return written
+
+
+def load_trials(
+    stage: str,
+    *,
+    columns: Iterable[str] | None = None,
+    start: date | None = None,
+    end: date | None = None,
+    animals: Iterable[str] | None = None,
+    data_dir: Path = DATA_DIR_PATH,
+) -> "pd.DataFrame":
+    """
+    The compacted trials of `stage` from `start` to `end` (both inclusive).
+
+    `stage` is a STAGE_NAME (not a TaskEnum value), matched
+    case-insensitively. Only `columns` are read (all if None). Days without the
+    stage, and requested columns a day does not have, are skipped. Such
+    columns come back as missing values.
+    """
+    pa, pq = _require_pyarrow()
+
+    wanted = list(columns) if columns is not None else None
+    animal_filter = list(animals) if animals is not None else None
+    tables = []
+    for day, path in _stage_files(data_dir / COLUMNAR_DIR_NAME, str(stage)):
+        if (start is not None and day < start) or (end is not None and day > end):
+            continue
+
+        available = pq.read_schema(path).names
+        read_columns = (
+            available if wanted is None else [c for c in wanted if c in available]
+        )
+        filters = None
+        if animal_filter is not None and "animal" in available:
+            filters = [("animal", "in", animal_filter)]
+        tables.append(pq.read_table(path, columns=read_columns, filters=filters))
+
+    if not tables:
+        import pandas as pd
+
+        return pd.DataFrame(columns=wanted or [])
+
+    table = pa.concat_tables(
+        _as_json_where_mixed(pa, tables), promote_options="permissive"
+    )
+    frame = table.to_pandas()
+    if wanted is not None:
+        frame = frame.reindex(columns=wanted)
+    return frame
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ModuleNotFoundError as e:
+        raise ModuleNotFoundError(
+            "Columnar trial files need pyarrow; install the `columnar` extra "
+            "(e.g. `uv sync --extra columnar` or `pip install 'mxbi[columnar]'`)"
+        ) from e
+    return pa, pq
+
+
+def _stage_sources(day_dir: Path) -> dict[str, list[tuple[int, str, Path]]]:
+    """stage name -> (session ID, animal, JSONL path) for every trial log of the day."""
+    sources: dict[str, list[tuple[int, str, Path]]] = {}
+    if not day_dir.is_dir():
+        return sources
+
+    session_dirs = [p for p in day_dir.iterdir() if p.is_dir() and p.name.isdigit()]
+    for session_dir in sorted(session_dirs, key=lambda p: int(p.name)):
+        for animal_dir in sorted(session_dir.iterdir()):
+            if not animal_dir.is_dir() or animal_dir.name in NON_TRIAL_DIRS:
+                continue
+            for path in sorted(animal_dir.glob("*.jsonl")):
+                sources.setdefault(path.stem, []).append(
+                    (int(session_dir.name), animal_dir.name, path)
+                )
+    return sources
+
+
+def _stage_files(columnar_dir: Path, stage: str) -> list[tuple[date, Path]]:
+    if not columnar_dir.is_dir():
+        return []
+
+    files = []
+    for day_dir in sorted(columnar_dir.iterdir()):
+        day = _parse_day(day_dir.name)
+        if day is None or not day_dir.is_dir():
+            continue
+        for path in day_dir.glob("*.parquet"):
+            if path.stem.lower() == stage.lower():
+                files.append((day, path))
+    return files
+
+
+def _is_current(out_path: Path, sources: list[Path]) -> bool:
+    try:
+        built = out_path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return False
+    return all(source.stat().st_mtime_ns <= built for source in sources)
+
+
+def _build_table(
+    pa, day: str, files: list[tuple[int, str, Path]]
+) -> "pa.Table | None":
+    rows: list[dict[str, Any]] = []
+    for session_id, animal, path in files:
+        for record in read_jsonl(path):
+            record.setdefault("animal", animal)
+            rows.append({"date": day, "session_id": session_id, **record})
+    if not rows:
+        return None
+
+    names = list(dict.fromkeys(key for row in rows for key in row))
+    arrays = [_to_array(pa, name, [row.get(name) for row in rows]) for name in names]
+    table = pa.table(arrays, names=names)
+
+    while any(pa.types.is_struct(field.type) for field in table.schema):
+        table = table.flatten()
+
+    return pa.table(
+        [
+            column.dictionary_encode() if pa.types.is_string(column.type) else column
+            for column in table.columns
+        ],
+        names=table.column_names,
+    )
+
+
+def _to_array(pa, name: str, values: list[Any]) -> "pa.Array":
+    try:
+        return pa.array(values)
+    except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+        # The field changed type between versions of a stage; keep it readable.
+        logger.warning(f"Storing column {name} as JSON text: {e}")
+        return pa.array(
+            [None if value is None else json.dumps(value) for value in values],
+            pa.string(),
+        )
+
+
+def _as_json_where_mixed(pa, tables: list["pa.Table"]) -> list["pa.Table"]:
+    """Store columns whose type changed between days as JSON text, as _to_array does."""
+    fields: dict[str, list["pa.Field"]] = {}
+    for table in tables:
+        for field in table.schema:
+            fields.setdefault(field.name, []).append(field)
+
+    mixed = []
+    for name, same_name in fields.items():
+        try:
+            pa.unify_schemas(
+                [pa.schema([field]) for field in same_name],
+                promote_options="permissive",
+            )
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+            logger.warning(f"Reading column {name} as JSON text: {e}")
+            mixed.append(name)
+    if not mixed:
+        return tables
+
+    converted = []
+    for table in tables:
+        for name in mixed:
+            i = table.schema.get_field_index(name)
+            if i < 0:
+                continue
+            values = table.column(i).to_pylist()
+            text = pa.array(
+                [None if value is None else json.dumps(value) for value in values],
+                pa.string(),
+            )
+            table = table.set_column(i, name, text.dictionary_encode())
+        converted.append(table)
+    return converted
+
+
+def _parse_day(name: str) -> date | None:
+    if len(name) != 8 or not name.isdigit():
+        return None
+    try:
+        return datetime.strptime(name, DATE_FORMAT).date()
+    except ValueError:
+        return None
+
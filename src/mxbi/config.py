@@ -1,7 +1,12 @@
+import atexit
 import json
 import os
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Generic, TypeVar
+from threading import Condition, Lock, Thread
+from time import monotonic
+from typing import Generic, Literal, TypeVar
 
 from pydantic import BaseModel, ValidationError
 
@@ -11,12 +16,109 @@ from mxbi.utils.logger import logger
 
 T = TypeVar("T", bound=BaseModel)
 
+SAVE_DELAY_S = 1.0
+FsyncPolicy = Literal["always", "never"]
+
+
+def write_atomic(path: Path, text: str, fsync: FsyncPolicy = "always") -> None:
+    """Replace `path` with `text` via a temp file, so readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with tmp_path.open("w", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        if fsync == "always":
+            os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+    if fsync == "always":
+        dir_fd = os.open(path.parent, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+class _WriteBehind:
+    """
+    Writes the latest submitted snapshot on a background thread.
+
+    The first submit opens a window of `delay` seconds; later submits inside
+    the window only replace the snapshot, so a burst costs one write.
+    """
+
+    def __init__(self, path: Path, delay: float, fsync: FsyncPolicy) -> None:
+        self._path = path
+        self._delay = delay
+        self._fsync: FsyncPolicy = fsync
+        self._cond = Condition()
+        self._io_lock = Lock()
+        self._pending: str | None = None
+        self._thread: Thread | None = None
+        self.writes = 0
+        self.coalesced = 0
+
+    def submit(self, text: str) -> None:
+        with self._cond:
+            if self._pending is not None:
+                self.coalesced += 1
+            self._pending = text
+            if self._thread is None:
+                self._thread = Thread(
+                    target=self._run, name=f"write_behind:{self._path.name}", daemon=True
+                )
+                self._thread.start()
+            self._cond.notify()
+
+    def write_now(self, text: str) -> None:
+        """Write synchronously, superseding anything pending."""
+        with self._io_lock:
+            with self._cond:
+                self._pending = None
+            self._write(text)
+
+    def flush(self) -> bool:
+        with self._io_lock:
+            with self._cond:
+                text, self._pending = self._pending, None
+            if text is None:
+                return False
+            self._write(text)
+            return True
+
+    def _write(self, text: str) -> None:
+        write_atomic(self._path, text, self._fsync)
+        self.writes += 1
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while self._pending is None:
+                    self._cond.wait()
+                deadline = monotonic() + self._delay
+                while (remaining := deadline - monotonic()) > 0:
+                    self._cond.wait(remaining)
+
+            try:
+                if self.flush():
+                    logger.info(f"Configuration saved to {self._path}")
+            except Exception as e:
+                logger.error(f"Failed to save configuration file: {e}")
+
 
 class Configure(Generic[T]):
-    def __init__(self, config_path: Path, config_class: type[T]) -> None:
+    def __init__(
+        self,
+        config_path: Path,
+        config_class: type[T],
+        save_delay: float = SAVE_DELAY_S,
+        fsync: FsyncPolicy = "always",
+    ) -> None:
         self._config_path = config_path
         self._config_class = config_class
+        self._writer = _WriteBehind(config_path, save_delay, fsync)
         self._config = self._load_config()
+        self._in_memory = 0
 
     @property
     def value(self) -> T:
@@ -25,10 +127,7 @@ class Configure(Generic[T]):
     def _create_default_config(self) -> T:
         config = self._config_class()
         try:
-            self._config_path.parent.mkdir(parents=True, exist_ok=True)
-
-            with self._config_path.open("w", encoding="utf-8") as f:
-                json.dump(config.model_dump(), f, indent=4)
+            self._writer.write_now(self._dump(config))
 
             logger.info(f"Created default configuration file at {self._config_path}")
             return config
@@ -61,24 +160,71 @@ class Configure(Generic[T]):
             logger.error(f"Unexpected error while loading configuration: {e}")
             return self._create_default_config()
 
+    @contextmanager
+    def in_memory(self, data: T | None = None) -> Iterator[T]:
+        """
+        Work on a copy of the configuration (or of `data`) that is never written.
+
+        Inside the block saves only update the in-memory value; the previous
+        value is restored on exit. For simulations that must not touch the
+        rig's configuration file.
+        """
+        previous = self._config
+        self._config = (data or previous).model_copy(deep=True)
+        self._in_memory += 1
+        try:
+            yield self._config
+        finally:
+            self._in_memory -= 1
+            self._config = previous
+
     def save(self, data: T | None = None) -> None:
+        """Write the configuration now; anything scheduled by save_later() is superseded."""
+        if self._in_memory:
+            self._config = data or self._config
+            return
         try:
             if data is not None:
                 self._config = data
 
-            self._config_path.parent.mkdir(parents=True, exist_ok=True)
-
-            with self._config_path.open("w", encoding="utf-8") as f:
-                json.dump(self._config.model_dump(), f, indent=4)
+            self._writer.write_now(self._dump(self._config))
 
             logger.info(f"Configuration saved to {self._config_path}")
         except Exception as e:
             logger.error(f"Failed to save configuration file: {e}")
             raise
 
+    def save_later(self, data: T | None = None) -> None:
+        """
+        Snapshot the configuration and write it in the background.
+
+        Calls within the save delay are coalesced into one write. Use flush()
+        or save() where the file must be on disk before continuing.
+        """
+        if data is not None:
+            self._config = data
+        if self._in_memory:
+            return
+        self._writer.submit(self._dump(self._config))
+
+    def flush(self) -> None:
+        if self._in_memory:
+            return
+        try:
+            self._writer.flush()
+        except Exception as e:
+            logger.error(f"Failed to save configuration file: {e}")
+            raise
+
+    @staticmethod
+    def _dump(config: BaseModel) -> str:
+        return json.dumps(config.model_dump(), indent=4)
+
 
 session_options = Configure(OPTIONS_SESSION_PATH, SessionOptions)
 session_config = Configure(CONFIG_SESSION_PATH, SessionConfig)
+atexit.register(session_options.flush)
+atexit.register(session_config.flush)
 
 
 if __name__ == "__main__":
@@ -1,12 +1,16 @@
+import atexit
 import csv
 import json
+import os
 import sys
 from datetime import datetime
 from enum import StrEnum
 from pathlib import Path
-from typing import TYPE_CHECKING
+from threading import Condition, Lock, Thread
+from typing import TYPE_CHECKING, TextIO
 
-from mxbi.path import DATA_DIR_PATH
+from mxbi.path import DATA_DIR_PATH, SESSION_INDEX_FILENAME, STATE_DIR_NAME
+from mxbi.session_index import SessionIndex
 from mxbi.utils.logger import logger
 
 if TYPE_CHECKING:
@@ -20,6 +24,198 @@ class DataLoggerType(StrEnum):
     JSON = "json"
 
 
+DEFAULT_BATCH_SIZE = 64
+DEFAULT_FLUSH_INTERVAL = 1.0  # seconds
+
+
+class BufferedJsonlWriter:
+    """
+    Write-behind sink for JSONL records.
+
+    Lines are queued by the caller and written by a background thread that keeps
+    one append handle per path. A batch is committed once `batch_size` lines are
+    pending or `flush_interval` seconds after the first pending line, optionally
+    followed by an fsync. After close() writes fall back to synchronous appends
+    so late records (e.g. a cancelled trial saved during shutdown) are not lost.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        fsync: bool = False,
+    ) -> None:
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._fsync = fsync
+
+        self._cond = Condition()
+        self._io_lock = Lock()
+        self._pending: list[tuple[Path, str]] = []
+        self._handles: dict[Path, TextIO] = {}
+        self._thread: Thread | None = None
+        self._closed = False
+
+    def configure(
+        self,
+        *,
+        batch_size: int | None = None,
+        flush_interval: float | None = None,
+        fsync: bool | None = None,
+    ) -> None:
+        with self._cond:
+            if batch_size is not None:
+                self._batch_size = max(1, batch_size)
+            if flush_interval is not None:
+                self._flush_interval = max(0.0, flush_interval)
+            if fsync is not None:
+                self._fsync = fsync
+
+    def write(self, path: Path, line: str) -> None:
+        with self._cond:
+            if not self._closed:
+                self._pending.append((path, line))
+                pending = len(self._pending)
+                if pending == 1 or pending >= self._batch_size:
+                    self._cond.notify()
+                if self._thread is None:
+                    self._thread = Thread(
+                        target=self._run, name="DataLoggerWriter", daemon=True
+                    )
+                    self._thread.start()
+                return
+
+        with self._io_lock:
+            self._write_batch([(path, line)])
+            self._close_handles()
+
+    def flush(self) -> None:
+        """Synchronously commit every queued line."""
+        with self._io_lock:
+            with self._cond:
+                batch, self._pending = self._pending, []
+            self._write_batch(batch)
+
+    def release(self, directory: Path) -> None:
+        """Commit every queued line and close the handles of files under `directory`."""
+        with self._io_lock:
+            with self._cond:
+                batch, self._pending = self._pending, []
+            self._write_batch(batch)
+            for path in [p for p in self._handles if p.is_relative_to(directory)]:
+                try:
+                    self._handles.pop(path).close()
+                except IOError as e:
+                    logger.error(f"Failed to close file {path}: {e}")
+
+    def close(self) -> None:
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify()
+            thread = self._thread
+
+        if thread is not None:
+            thread.join(timeout=5.0)
+
+        self.flush()
+        with self._io_lock:
+            self._close_handles()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._closed and not self._pending:
+                    self._cond.wait()
+                # Group commit: give a burst of records a chance to share one write.
+                if not self._closed and len(self._pending) < self._batch_size:
+                    self._cond.wait(self._flush_interval)
+                closed = self._closed
+
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Unexpected error in data logger writer: {e}")
+
+            if closed:
+                return
+
+    def _write_batch(self, batch: list[tuple[Path, str]]) -> None:
+        if not batch:
+            return
+
+        touched: dict[Path, TextIO] = {}
+        for path, line in batch:
+            try:
+                handle = self._handles.get(path)
+                if handle is None:
+                    handle = open(path, "a", encoding="utf-8")
+                    self._handles[path] = handle
+                handle.write(line)
+                touched[path] = handle
+            except IOError as e:
+                logger.error(f"Failed to write to file {path}: {e}")
+
+        for path, handle in touched.items():
+            try:
+                handle.flush()
+                if self._fsync:
+                    os.fsync(handle.fileno())
+            except IOError as e:
+                logger.error(f"Failed to flush file {path}: {e}")
+
+    def _close_handles(self) -> None:
+        for path, handle in self._handles.items():
+            try:
+                handle.close()
+            except IOError as e:
+                logger.error(f"Failed to close file {path}: {e}")
+        self._handles.clear()
+
+
+jsonl_writer = BufferedJsonlWriter()
+atexit.register(jsonl_writer.close)
+
+_data_root = DATA_DIR_PATH
+_session_index: SessionIndex | None = None
+
+
+def data_dir() -> Path:
+    """The directory new sessions are written under."""
+    return _data_root
+
+
+def set_data_dir(path: Path | None) -> None:
+    """Write new sessions under `path`; None restores DATA_DIR_PATH."""
+    global _data_root
+    _data_root = DATA_DIR_PATH if path is None else path
+
+
+def session_index() -> SessionIndex:
+    """The index of the current data directory."""
+    global _session_index
+    if _session_index is None or _session_index.root != _data_root:
+        if _session_index is not None:
+            _session_index.close()
+        _session_index = SessionIndex(
+            _data_root, _data_root / STATE_DIR_NAME / SESSION_INDEX_FILENAME
+        )
+    return _session_index
+
+
+def _close_session_index() -> None:
+    if _session_index is not None:
+        _session_index.close()
+
+
+atexit.register(_close_session_index)
+
+
+def _date_dir_name() -> str:
+    return f"{now.year}{now.month:02d}{now.day:02d}"
+
+
 class DataLogger:
     def __init__(
         self,
@@ -27,15 +223,25 @@ class DataLogger:
         monkey: str,
         filename: str,
         type: DataLoggerType = DataLoggerType.JSONL,
+        buffered: bool = True,
     ) -> None:
         self.__session_state = session_config
         self._monkey = monkey
         self._filename = filename
         self._session_id = self.__session_state.session_id
         self._type = type
+        self._buffered = buffered
 
         self._data_dir = self._ensure_data_dir()
         self._data_path = self._get_path(f".{self._type.value}")
+        session_index().register_file(
+            _date_dir_name(),
+            self._session_id,
+            self.__session_state.start_time,
+            self._monkey,
+            self._filename,
+            self._data_path,
+        )
 
     @property
     def path(self) -> Path:
@@ -43,30 +249,14 @@ class DataLogger:
 
     @staticmethod
     def init_session_id() -> int:
-        now = datetime.now()
-        date_path = Path(f"{now.year}{now.month:02d}{now.day:02d}")
-        base_path = DATA_DIR_PATH / date_path
-
-        if not base_path.exists():
-            return 0
-
-        latest_session_id = max(
-            (
-                int(child.name)
-                for child in base_path.iterdir()
-                if child.is_dir() and child.name.isdigit()
-            ),
-            default=-1,
-        )
-
-        return latest_session_id + 1
+        return session_index().allocate_session_id(_date_dir_name())
 
     def _ensure_data_dir(self) -> Path:
-        date_path = Path(f"{now.year}{now.month:02d}{now.day:02d}")
+        date_path = Path(_date_dir_name())
         session_path = Path(f"{self._session_id}")
         monkey_path = Path(f"{self._monkey}")
 
-        base_dir = DATA_DIR_PATH / date_path / session_path / monkey_path
+        base_dir = _data_root / date_path / session_path / monkey_path
 
         try:
             base_dir.mkdir(parents=True, exist_ok=True)
@@ -88,10 +278,18 @@ class DataLogger:
     def save_jsonl(self, data: dict) -> None:
         self._save_jsonl(data)
 
+    def flush(self) -> None:
+        if self._buffered:
+            jsonl_writer.flush()
+
     def _save_jsonl(self, data: dict) -> None:
         try:
             json_line = json.dumps(data, ensure_ascii=False)
 
+            if self._buffered:
+                jsonl_writer.write(self._data_path, json_line + "\n")
+                return
+
             with open(self._data_path, "a", encoding="utf-8") as f:
                 f.write(json_line + "\n")
 
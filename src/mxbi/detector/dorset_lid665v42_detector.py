@@ -1,7 +1,8 @@
-from threading import Event, Lock, Thread, Timer
+from threading import Event, Lock, Thread
 from typing import Callable
 
 from mxbi.detector.detector import DetectionResult, Detector
+from mxbi.detector.presence_tracker import PresenceTracker, PresenceTrackerStats
 from mxbi.models.rfid_animal import animal_db
 from mxbi.peripheral.rfid.dorset_lid665v42 import DorsetLID665v42, Result
 
@@ -23,7 +24,15 @@ class DorsetLID665v42Detector(Detector):
         self._callback: Callable[[Result], None] | None = None
 
         self._detection_interval = detection_interval
-        self._timer: Timer | None = None
+        self._presence = PresenceTracker(
+            self._detection_interval,
+            self._on_timeout,
+            name="DorsetLID665v42Presence",
+        )
+
+    @property
+    def presence_stats(self) -> PresenceTrackerStats:
+        return self._presence.stats
 
     # -------------------------------
     # Public lifecycle methods
@@ -35,6 +44,7 @@ class DorsetLID665v42Detector(Detector):
         self._scanner.subscribe(self._callback)
 
         self._stop_event.clear()
+        self._presence.start()
 
         self._reader_thread = Thread(
             target=self._scanner.read,
@@ -50,10 +60,7 @@ class DorsetLID665v42Detector(Detector):
             self._scanner.unsubscribe(self._callback)
             self._callback = None
 
-        with self._lock:
-            if self._timer:
-                self._timer.cancel()
-                self._timer = None
+        self._presence.stop()
 
         self._scanner.close()
 
@@ -76,13 +83,7 @@ class DorsetLID665v42Detector(Detector):
                 detect_time=result.detect_time,
             )
 
-            if self._timer:
-                self._timer.cancel()
-
-            self._timer = Timer(self._detection_interval, self._on_timeout)
-            self._timer.daemon = True
-            self._timer.start()
-
+        self._presence.touch(animal.name)
         self.process_detection(DetectionResult(animal.name, False))
 
     def _on_timeout(self) -> None:
@@ -91,6 +92,5 @@ class DorsetLID665v42Detector(Detector):
                 return
 
             self._result = None
-            self._timer = None
 
         self.process_detection(DetectionResult(None, False))
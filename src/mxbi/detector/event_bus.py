@@ -0,0 +1,145 @@
+from bisect import bisect_left
+from collections import deque
+from dataclasses import dataclass
+from threading import Lock
+from time import perf_counter
+from tkinter import Misc
+from typing import Callable
+
+from mxbi.detector.detector import DetectorEvent
+from mxbi.utils.logger import logger
+
+PUMP_INTERVAL_MS = 10
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+COALESCED_EVENTS = frozenset({DetectorEvent.ANIMAL_STAYED})
+
+
+@dataclass
+class _QueuedEvent:
+    event: DetectorEvent
+    animal_name: str
+    enqueued_at: float
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram of enqueue -> handled latency in milliseconds."""
+
+    def __init__(self, buckets_ms: tuple[int, ...] = LATENCY_BUCKETS_MS) -> None:
+        self._buckets_ms = buckets_ms
+        self.counts = [0] * (len(buckets_ms) + 1)
+        self.total = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, latency_ms: float) -> None:
+        self.counts[bisect_left(self._buckets_ms, latency_ms)] += 1
+        self.total += 1
+        self.sum_ms += latency_ms
+        self.max_ms = max(self.max_ms, latency_ms)
+
+    @property
+    def mean_ms(self) -> float:
+        return self.sum_ms / self.total if self.total else 0.0
+
+    def to_dict(self) -> dict[str, int | float]:
+        labels = [f"<={b}ms" for b in self._buckets_ms] + [
+            f">{self._buckets_ms[-1]}ms"
+        ]
+        return {
+            **dict(zip(labels, self.counts)),
+            "total": self.total,
+            "mean_ms": round(self.mean_ms, 3),
+            "max_ms": round(self.max_ms, 3),
+        }
+
+
+class DetectorEventBus:
+    """
+    Hands detector events from reader threads to the Tk thread.
+
+    publish() only appends to a queue, so the detector never waits on UI
+    work. A single after() pump on the Tk thread drains the queue in order
+    and runs the subscribers there. A repeated ANIMAL_STAYED for the same
+    animal that is still waiting in the queue is folded into the queued one.
+
+    With `interval_ms=None` there is no pump: publish() dispatches right away,
+    which is only correct when every publisher already runs on the Tk thread
+    (a headless run, where polling would dominate virtual time).
+    """
+
+    def __init__(self, root: Misc, interval_ms: int | None = PUMP_INTERVAL_MS) -> None:
+        self._root = root
+        self._interval_ms = interval_ms
+
+        self._lock = Lock()
+        self._queue: deque[_QueuedEvent] = deque()
+        self._callbacks: dict[DetectorEvent, list[Callable[[str], None]]] = {}
+        self._after_id: str | None = None
+        self._running = False
+
+        self.coalesced = 0
+        self.histograms: dict[DetectorEvent, LatencyHistogram] = {}
+
+    def subscribe(self, event: DetectorEvent, callback: Callable[[str], None]) -> None:
+        self._callbacks.setdefault(event, []).append(callback)
+
+    def publisher(self, event: DetectorEvent) -> Callable[[str], None]:
+        return lambda animal_name: self.publish(event, animal_name)
+
+    def publish(self, event: DetectorEvent, animal_name: str) -> None:
+        with self._lock:
+            if event in COALESCED_EVENTS and self._queue:
+                last = self._queue[-1]
+                if last.event == event and last.animal_name == animal_name:
+                    self.coalesced += 1
+                    return
+            self._queue.append(_QueuedEvent(event, animal_name, perf_counter()))
+
+        if self._interval_ms is None and self._running:
+            self.pump()
+
+    def start(self) -> None:
+        """Must be called on the Tk thread."""
+        self._running = True
+        if self._interval_ms is None:
+            self.pump()
+        elif self._after_id is None:
+            self._after_id = self._root.after(self._interval_ms, self._pump)
+
+    def stop(self) -> None:
+        self._running = False
+        if self._after_id is not None:
+            try:
+                self._root.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+
+    def pump(self) -> None:
+        """Dispatch everything queued so far on the calling (Tk) thread."""
+        with self._lock:
+            batch = list(self._queue)
+            self._queue.clear()
+
+        for queued in batch:
+            for callback in self._callbacks.get(queued.event, ()):
+                try:
+                    callback(queued.animal_name)
+                except Exception:
+                    logger.exception(f"Error handling detector event {queued.event}")
+
+            latency_ms = (perf_counter() - queued.enqueued_at) * 1000
+            self.histograms.setdefault(queued.event, LatencyHistogram()).add(latency_ms)
+
+    def summary(self) -> dict[str, dict[str, int | float]]:
+        return {
+            event.value: histogram.to_dict()
+            for event, histogram in self.histograms.items()
+        }
+
+    def _pump(self) -> None:
+        self._after_id = None
+        self.pump()
+        if self._running:
+            self.start()
@@ -0,0 +1,124 @@
+from dataclasses import dataclass
+from threading import Condition, Thread
+from time import monotonic
+from typing import Callable
+
+RATE_WINDOW = 1.0  # seconds
+
+
+@dataclass(frozen=True)
+class PresenceTrackerStats:
+    reads: int
+    reads_per_second: float
+    expirations: int
+    tracked_tags: int
+
+
+class PresenceTracker:
+    """
+    Tracks a monotonic "last seen" deadline per tag on a single long-lived thread.
+
+    touch() only records the new deadline; the worker sleeps until the latest
+    deadline and re-arms itself if it was pushed back in the meantime, so a tag
+    that is read continuously costs no thread or timer churn. on_expired fires
+    once every tracked tag has gone unseen for `timeout` seconds.
+    """
+
+    def __init__(
+        self,
+        timeout: float,
+        on_expired: Callable[[], None],
+        name: str = "PresenceTracker",
+    ) -> None:
+        self._timeout = timeout
+        self._on_expired = on_expired
+        self._name = name
+
+        self._cond = Condition()
+        self._deadlines: dict[str, float] = {}
+        self._latest_deadline = 0.0
+        self._running = False
+        self._thread: Thread | None = None
+
+        self._reads = 0
+        self._expirations = 0
+        self._window_started_at = monotonic()
+        self._window_reads = 0
+        self._reads_per_second = 0.0
+
+    def start(self) -> None:
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+
+        self._thread = Thread(target=self._run, name=self._name, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        with self._cond:
+            self._running = False
+            self._deadlines.clear()
+            self._cond.notify()
+
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join(timeout=1.0)
+        self._thread = None
+
+    def touch(self, tag: str) -> None:
+        now = monotonic()
+        deadline = now + self._timeout
+
+        with self._cond:
+            was_idle = not self._deadlines
+            self._deadlines[tag] = deadline
+            if deadline > self._latest_deadline:
+                self._latest_deadline = deadline
+
+            self._reads += 1
+            self._window_reads += 1
+            self._roll_rate_window(now)
+
+            # The worker only needs waking when it is parked without a deadline.
+            if was_idle:
+                self._cond.notify()
+
+    def last_seen_deadline(self, tag: str) -> float | None:
+        with self._cond:
+            return self._deadlines.get(tag)
+
+    @property
+    def stats(self) -> PresenceTrackerStats:
+        with self._cond:
+            self._roll_rate_window(monotonic())
+            return PresenceTrackerStats(
+                reads=self._reads,
+                reads_per_second=self._reads_per_second,
+                expirations=self._expirations,
+                tracked_tags=len(self._deadlines),
+            )
+
+    def _roll_rate_window(self, now: float) -> None:
+        elapsed = now - self._window_started_at
+        if elapsed >= RATE_WINDOW:
+            self._reads_per_second = self._window_reads / elapsed
+            self._window_started_at = now
+            self._window_reads = 0
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while self._running and not self._deadlines:
+                    self._cond.wait()
+                if not self._running:
+                    return
+
+                remaining = self._latest_deadline - monotonic()
+                if remaining > 0:
+                    self._cond.wait(remaining)
+                    continue
+
+                self._deadlines.clear()
+                self._expirations += 1
+
+            self._on_expired()
@@ -0,0 +1,304 @@
+"""
+Synthetic animals that drive a HeadlessTheater.
+
+An agent turns a behaviour model into the two inputs a session has: what the
+RFID reader sees (HeadlessTheater.detect) and touches on the targets a scene
+binds (HeadlessTheater.on_touch_target / root.touch). Everything is scheduled
+with root.after(), so agents follow whatever clock the root runs on: virtual
+time under HeadlessTk, or the monotonic Tk timer on a real display.
+"""
+
+from dataclasses import dataclass, field
+from math import exp, log
+from random import Random
+from typing import TYPE_CHECKING, Callable
+
+from mxbi.utils import clock
+
+if TYPE_CHECKING:
+    from mxbi.headless.theater import HeadlessTheater
+    from mxbi.headless.virtual_tk import TouchTarget
+
+# How long after a sound starts an animal still counts it as heard.
+HEARD_WINDOW_S = 2.0
+
+
+@dataclass(frozen=True)
+class Visit:
+    """`animal` stands at the reader from `enter_s` to `leave_s` (virtual seconds)."""
+
+    animal: str
+    enter_s: float
+    leave_s: float | None = None
+
+
+class ScriptedAnimal:
+    """
+    Replays a fixed list of visits and touches whatever a scene offers.
+
+    Each time a stage binds a press handler, the target is touched with
+    probability `p_touch` after a latency drawn uniformly from `latency_ms`,
+    as long as it is still touchable by then. The scene background is never
+    touched on purpose.
+    """
+
+    def __init__(
+        self,
+        visits: list[Visit],
+        *,
+        p_touch: float = 1.0,
+        latency_ms: tuple[int, int] = (300, 1500),
+        seed: int = 0,
+    ) -> None:
+        self._visits = visits
+        self._p_touch = p_touch
+        self._latency_ms = latency_ms
+        self._rng = Random(seed)
+        self._theater: "HeadlessTheater | None" = None
+        self.touches = 0
+
+    def attach(self, theater: "HeadlessTheater") -> None:
+        self._theater = theater
+        for visit in self._visits:
+            theater.root.after(
+                int(visit.enter_s * 1000), theater.detect, visit.animal
+            )
+            if visit.leave_s is not None:
+                theater.root.after(int(visit.leave_s * 1000), theater.detect, None)
+        theater.on_touch_target(self._on_target)
+
+    def _on_target(self, target: "TouchTarget") -> None:
+        assert self._theater is not None
+        if target is self._theater.scene_layer.background:
+            return
+        if self._rng.random() >= self._p_touch:
+            return
+        self._theater.root.after(
+            self._rng.randint(*self._latency_ms), self._touch, target
+        )
+
+    def _touch(self, target: "TouchTarget") -> None:
+        assert self._theater is not None
+        if target in self._theater.root.touchable():
+            self._theater.root.touch(target)
+            self.touches += 1
+
+
+@dataclass(frozen=True)
+class Psychometric:
+    """
+    P(touch | stimulus strength x) as a logistic with guess and lapse rates.
+
+    `guess` is the touch rate without any stimulus (false alarms on no-go
+    trials), `1 - lapse` the ceiling for a clearly perceived one.
+    """
+
+    threshold: float = 0.5
+    slope: float = 10.0
+    guess: float = 0.3
+    lapse: float = 0.05
+
+    def __call__(self, x: float) -> float:
+        z = max(-50.0, min(50.0, self.slope * (x - self.threshold)))
+        return self.guess + (1 - self.guess - self.lapse) / (1 + exp(-z))
+
+
+@dataclass(frozen=True)
+class AnimalProfile:
+    """How one animal uses the box: when it comes, how long it stays, how it responds."""
+
+    name: str
+    visit_interval_s: float = 600.0
+    dwell_s: float = 300.0
+    dwell_sigma: float = 0.5
+    response: Psychometric = field(default_factory=Psychometric)
+    latency_ms: tuple[int, int] = (300, 1500)
+
+
+def heard_stimulus(theater: "HeadlessTheater") -> float:
+    """1.0 if a sound started within the last HEARD_WINDOW_S, else 0.0."""
+    onset = theater.aplayer.last_onset
+    if onset is None:
+        return 0.0
+    return 1.0 if clock.now() - onset <= HEARD_WINDOW_S else 0.0
+
+
+@dataclass
+class AnimalCounters:
+    visits: int = 0
+    swaps_in: int = 0
+    touches: int = 0
+    withheld: int = 0
+
+
+class Colony:
+    """
+    Several animals sharing one reader, with the reader's imperfections.
+
+    Arrivals per animal are a Poisson process (`visit_interval_s` mean gap)
+    and dwell times are log-normal around `dwell_s`. An animal that arrives
+    while another one is at the reader displaces it with probability
+    `swap_p` (the reader reports a change) and otherwise comes back later.
+    While an animal is present its tag is re-read every `read_interval_s`.
+    The reader misses the tag for `dropout_s` seconds `dropouts_per_hour`
+    times an hour, and fails outright for `error_s` seconds
+    `errors_per_hour` times an hour.
+
+    Touches follow each animal's psychometric curve, evaluated on
+    `stimulus(theater)` once the response latency has passed.
+    """
+
+    def __init__(
+        self,
+        profiles: list[AnimalProfile],
+        *,
+        swap_p: float = 0.2,
+        read_interval_s: float | None = 1.0,
+        dropouts_per_hour: float = 0.0,
+        dropout_s: tuple[float, float] = (0.5, 3.0),
+        errors_per_hour: float = 0.0,
+        error_s: float = 5.0,
+        stimulus: Callable[["HeadlessTheater"], float] = heard_stimulus,
+        seed: int = 0,
+    ) -> None:
+        self._profiles = profiles
+        self._swap_p = swap_p
+        self._read_interval_s = read_interval_s
+        self._dropouts_per_hour = dropouts_per_hour
+        self._dropout_s = dropout_s
+        self._errors_per_hour = errors_per_hour
+        self._error_s = error_s
+        self._stimulus = stimulus
+        self._rng = Random(seed)
+
+        self._theater: "HeadlessTheater | None" = None
+        self._present: AnimalProfile | None = None
+        self._leave_id: str | None = None
+        self._blind = False
+
+        self.counters = {profile.name: AnimalCounters() for profile in profiles}
+        self.dropouts = 0
+        self.errors = 0
+
+    def attach(self, theater: "HeadlessTheater") -> None:
+        self._theater = theater
+        for profile in self._profiles:
+            self._schedule_arrival(profile)
+        if self._read_interval_s:
+            self._after(self._read_interval_s, self._read)
+        if self._dropouts_per_hour > 0:
+            self._after(self._next_in(self._dropouts_per_hour), self._dropout)
+        if self._errors_per_hour > 0:
+            self._after(self._next_in(self._errors_per_hour), self._error)
+        theater.on_touch_target(self._on_target)
+
+    @property
+    def present(self) -> str | None:
+        return self._present.name if self._present is not None else None
+
+    # region presence
+    def _arrive(self, profile: AnimalProfile) -> None:
+        current = self._present
+        if current is None:
+            self._enter(profile)
+        elif current is not profile and self._rng.random() < self._swap_p:
+            self._cancel_leave()
+            self._schedule_arrival(current)
+            self.counters[profile.name].swaps_in += 1
+            self._enter(profile)
+        elif current is not profile:
+            self._schedule_arrival(profile)
+
+    def _enter(self, profile: AnimalProfile) -> None:
+        self._present = profile
+        self.counters[profile.name].visits += 1
+        mu = log(profile.dwell_s) - profile.dwell_sigma**2 / 2
+        self._leave_id = self._after(
+            self._rng.lognormvariate(mu, profile.dwell_sigma), self._leave, profile
+        )
+        self._report()
+
+    def _leave(self, profile: AnimalProfile) -> None:
+        self._leave_id = None
+        if self._present is not profile:
+            return
+        self._present = None
+        self._schedule_arrival(profile)
+        self._report()
+
+    def _cancel_leave(self) -> None:
+        if self._leave_id is not None:
+            assert self._theater is not None
+            self._theater.root.after_cancel(self._leave_id)
+            self._leave_id = None
+
+    def _schedule_arrival(self, profile: AnimalProfile) -> None:
+        self._after(self._rng.expovariate(1 / profile.visit_interval_s), self._arrive, profile)
+
+    def _read(self) -> None:
+        assert self._read_interval_s
+        if self._present is not None:
+            self._report()
+        self._after(self._read_interval_s, self._read)
+
+    def _dropout(self) -> None:
+        if not self._blind:
+            self.dropouts += 1
+            self._blind = True
+            assert self._theater is not None
+            self._theater.detect(None)
+            self._after(self._rng.uniform(*self._dropout_s), self._recover)
+        self._after(self._next_in(self._dropouts_per_hour), self._dropout)
+
+    def _error(self) -> None:
+        if not self._blind:
+            self.errors += 1
+            self._blind = True
+            assert self._theater is not None
+            self._theater.detect(None, error=True)
+            self._after(self._error_s, self._recover)
+        self._after(self._next_in(self._errors_per_hour), self._error)
+
+    def _recover(self) -> None:
+        self._blind = False
+        self._report()
+
+    def _report(self) -> None:
+        """Tell the reader who is there, unless it is currently blind."""
+        if self._blind:
+            return
+        assert self._theater is not None
+        self._theater.detect(self.present)
+
+    # endregion
+
+    # region touches
+    def _on_target(self, target: "TouchTarget") -> None:
+        assert self._theater is not None
+        profile = self._present
+        if profile is None or target is self._theater.scene_layer.background:
+            return
+        self._theater.root.after(
+            self._rng.randint(*profile.latency_ms), self._respond, target, profile
+        )
+
+    def _respond(self, target: "TouchTarget", profile: AnimalProfile) -> None:
+        assert self._theater is not None
+        if self._present is not profile or target not in self._theater.root.touchable():
+            return
+
+        counters = self.counters[profile.name]
+        if self._rng.random() < profile.response(self._stimulus(self._theater)):
+            self._theater.root.touch(target)
+            counters.touches += 1
+        else:
+            counters.withheld += 1
+
+    # endregion
+
+    def _after(self, delay_s: float, callback: Callable, *args) -> str:
+        assert self._theater is not None
+        return self._theater.root.after(int(delay_s * 1000), callback, *args)
+
+    def _next_in(self, per_hour: float) -> float:
+        return self._rng.expovariate(per_hour / 3600)
@@ -0,0 +1,197 @@
+import gc
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from random import Random
+
+from pydantic import BaseModel
+
+from mxbi.data_logger import DataLogger, jsonl_writer
+from mxbi.headless.agents import AnimalProfile, Colony, Psychometric
+from mxbi.headless.theater import HeadlessRunStats, HeadlessTheater
+from mxbi.models.animal import AnimalConfig
+from mxbi.models.session import SessionConfig
+from mxbi.models.task import TaskEnum
+
+DEFAULT_DWELL_S = 300.0
+
+
+@dataclass(frozen=True)
+class MemorySample:
+    virtual_s: float
+    trials: int
+    traced_bytes: int
+    animal_states_bytes: int
+    persistent_data_bytes: int
+    data_loggers: int
+    open_files: int
+
+
+@dataclass(frozen=True)
+class LoadTestReport:
+    run: HeadlessRunStats
+    samples: list[MemorySample]
+    latency: dict[str, dict[str, int | float]]
+    visits: int
+    swaps: int
+    touches: int
+    dropouts: int
+    errors: int
+
+    @property
+    def trials_per_hour(self) -> float:
+        hours = self.run.virtual_s / 3600
+        return self.run.trials / hours if hours else 0.0
+
+    def growth(self, metric: str) -> int:
+        """
+        Change of one MemorySample field over the second half of the run.
+
+        The first half covers every animal's first visit and stage loading,
+        which allocate once; what still grows after that is a leak.
+        """
+        if len(self.samples) < 3:
+            return 0
+        middle = self.samples[len(self.samples) // 2]
+        return getattr(self.samples[-1], metric) - getattr(middle, metric)
+
+
+class MemoryProbe:
+    """Samples the scheduler's long-lived state every `interval_s` of session time."""
+
+    def __init__(self, theater: HeadlessTheater, interval_s: float) -> None:
+        self._theater = theater
+        self._interval_ms = int(interval_s * 1000)
+        self.samples: list[MemorySample] = []
+
+    def start(self) -> None:
+        self._theater.root.after(0, self._sample)
+
+    def _sample(self) -> None:
+        scheduler = self._theater.scheduler
+        states = scheduler._animal_states
+        self.samples.append(
+            MemorySample(
+                virtual_s=self._theater.tcl.now_ms / 1000,
+                trials=sum(state.trial_id for state in states.values()),
+                traced_bytes=(
+                    tracemalloc.get_traced_memory()[0]
+                    if tracemalloc.is_tracing()
+                    else 0
+                ),
+                animal_states_bytes=_deep_sizeof(states),
+                persistent_data_bytes=sum(
+                    _deep_sizeof(data) for data in _persistent_data_tables()
+                ),
+                data_loggers=sum(isinstance(o, DataLogger) for o in gc.get_objects()),
+                open_files=len(jsonl_writer._handles),
+            )
+        )
+        self._theater.root.after(self._interval_ms, self._sample)
+
+
+def random_profiles(
+    count: int, rng: Random, dwell_s: float = DEFAULT_DWELL_S
+) -> list[AnimalProfile]:
+    """`count` animals with varied thresholds, keeping the reader about half busy."""
+    return [
+        AnimalProfile(
+            name=f"sim_{i:03d}",
+            visit_interval_s=2 * count * dwell_s,
+            dwell_s=dwell_s * rng.uniform(0.5, 1.5),
+            response=Psychometric(
+                threshold=rng.uniform(0.3, 0.7),
+                slope=rng.uniform(5.0, 15.0),
+                guess=rng.uniform(0.1, 0.4),
+                lapse=rng.uniform(0.0, 0.1),
+            ),
+            latency_ms=(rng.randint(200, 500), rng.randint(1000, 2500)),
+        )
+        for i in range(count)
+    ]
+
+
+def run_load_test(
+    animals: int,
+    hours: float,
+    *,
+    task: TaskEnum = TaskEnum.GNGSiD_DETECT_STAGE,
+    level: int = 0,
+    dropouts_per_hour: float = 2.0,
+    errors_per_hour: float = 0.5,
+    sample_every_s: float = 600.0,
+    trace_memory: bool = True,
+    seed: int = 0,
+    data_dir: Path | None = None,
+) -> LoadTestReport:
+    """Run `animals` synthetic animals on one box for `hours` of virtual time."""
+    rng = Random(seed)
+    profiles = random_profiles(animals, rng)
+    config = SessionConfig(
+        animals={
+            profile.name: AnimalConfig(name=profile.name, task=task, level=level)
+            for profile in profiles
+        }
+    )
+    colony = Colony(
+        profiles,
+        dropouts_per_hour=dropouts_per_hour,
+        errors_per_hour=errors_per_hour,
+        seed=rng.randrange(2**32),
+    )
+    theater = HeadlessTheater(colony, config=config, strict=False, data_dir=data_dir)
+    probe = MemoryProbe(theater, sample_every_s)
+    theater.register_event_start(probe.start)
+
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    try:
+        run = theater.run(hours * 3600)
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+
+    counters = colony.counters.values()
+    return LoadTestReport(
+        run=run,
+        samples=probe.samples,
+        latency=theater.scheduler.event_bus.summary(),
+        visits=sum(c.visits for c in counters),
+        swaps=sum(c.swaps_in for c in counters),
+        touches=sum(c.touches for c in counters),
+        dropouts=colony.dropouts,
+        errors=colony.errors,
+    )
+
+
+def _persistent_data_tables() -> list[dict]:
+    """The module-level `_presistent_data` tables of every stage loaded so far."""
+    return [
+        module._presistent_data
+        for name, module in list(sys.modules.items())
+        if name.startswith("mxbi.tasks.") and hasattr(module, "_presistent_data")
+    ]
+
+
+def _deep_sizeof(obj: object, seen: set[int] | None = None) -> int:
+    if seen is None:
+        seen = set()
+    if id(obj) in seen or isinstance(obj, Enum):
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(
+            _deep_sizeof(k, seen) + _deep_sizeof(v, seen) for k, v in obj.items()
+        )
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(_deep_sizeof(item, seen) for item in obj)
+    elif isinstance(obj, BaseModel):
+        size += _deep_sizeof(obj.__dict__, seen)
+    elif hasattr(obj, "__dict__") and not isinstance(obj, type):
+        size += _deep_sizeof(vars(obj), seen)
+    return size
@@ -0,0 +1,467 @@
+"""
+Replay a recorded session through the current Scheduler and stages.
+
+The recording is a session directory as written by DataLogger:
+session_data.json, scheduler/scheduler.jsonl and one JSONL file per animal
+and stage. The replay runs a HeadlessTheater on a virtual clock that starts
+at the recorded start time and
+
+- re-issues the reader transitions found in the scheduler history, plus the
+  animal changes implied by the trial records (older logs have no
+  timestamps in the history, so there the trials alone drive presence);
+- lets the Scheduler create real stage objects, but swaps each stage's scene
+  for a ReplayedTrial that ends when the recorded trial ended and returns
+  the recorded outcome.
+
+Levels and tasks then evolve according to the code under test, and the
+resulting task_switch / level_change sequence is compared with the recorded
+one.
+"""
+
+import random
+from bisect import bisect_right
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+from mxbi.headless.theater import HeadlessRunStats, HeadlessTheater
+from mxbi.models.animal import AnimalConfig
+from mxbi.models.session import SessionConfig, SessionState
+from mxbi.models.task import TaskEnum
+from mxbi.scheduler import Scheduler, SchedulerEvent, SchedulerHistoryRecord
+from mxbi.utils import clock
+from mxbi.utils.jsonl import read_jsonl
+
+SESSION_DATA_FILENAME = "session_data.json"
+SCHEDULER_LOG_PATH = Path("scheduler") / "scheduler.jsonl"
+
+# A replayed trial takes the next recorded trial of its animal if that one
+# started within this many seconds of now.
+MATCH_TOLERANCE_S = 1.0
+# Inferred reader changes are issued this long before the trial they explain.
+INFERRED_LEAD_S = 0.001
+
+# The `reason` of the scheduler's state_change records, as written by its
+# detector handlers (not DetectorEvent values: "animal_returned" is spelled
+# correctly there).
+_PRESENT_REASONS = frozenset(
+    {"animal_entered", "animal_returned", "animal_changed", "animal_stayed"}
+)
+_RETURNED_REASON = "animal_returned"
+_LEFT_REASON = "animal_left"
+_ERROR_REASON = "error_detected"
+_TRAJECTORY_EVENTS = frozenset(
+    {SchedulerEvent.TASK_SWITCH.value, SchedulerEvent.LEVEL_CHANGE.value}
+)
+
+
+class ReplayError(ValueError):
+    """The directory is not a session the replay can read."""
+
+
+@dataclass(frozen=True)
+class RecordedTrial:
+    animal: str
+    start: float
+    end: float
+    record: dict[str, Any]
+
+
+@dataclass(frozen=True)
+class Detection:
+    time: float
+    animal: str | None
+    error: bool = False
+
+
+@dataclass(frozen=True)
+class TrajectoryStep:
+    event: str
+    task: str | None
+    level: int | None
+    trial_id: int | None
+
+    @classmethod
+    def from_record(cls, record: SchedulerHistoryRecord) -> "TrajectoryStep":
+        return cls(record.event, record.task, record.level, record.trial_id)
+
+    def __str__(self) -> str:
+        return f"{self.event} -> {self.task} L{self.level} @ trial {self.trial_id}"
+
+
+@dataclass(frozen=True)
+class AnimalTrajectoryDiff:
+    animal: str
+    recorded: list[TrajectoryStep]
+    replayed: list[TrajectoryStep]
+
+    @property
+    def first_divergence(self) -> int | None:
+        """Index of the first step that differs, None if both are identical."""
+        for i, (recorded, replayed) in enumerate(zip(self.recorded, self.replayed)):
+            if recorded != replayed:
+                return i
+        if len(self.recorded) != len(self.replayed):
+            return min(len(self.recorded), len(self.replayed))
+        return None
+
+    @property
+    def matches(self) -> bool:
+        return self.first_divergence is None
+
+
+@dataclass
+class ReplayCounters:
+    matched: int = 0
+    unmatched: int = 0
+    skipped: int = 0
+    detections: int = 0
+    inferred: int = 0
+
+
+@dataclass(frozen=True)
+class ReplayReport:
+    session_dir: Path
+    run: HeadlessRunStats
+    diffs: list[AnimalTrajectoryDiff]
+    counters: ReplayCounters
+    timestamped: bool
+
+    @property
+    def matches(self) -> bool:
+        return all(diff.matches for diff in self.diffs)
+
+
+@dataclass
+class RecordedSession:
+    """What a session directory says happened, ready to be replayed."""
+
+    session_dir: Path
+    state: SessionState
+    history: list[SchedulerHistoryRecord]
+    trials: list[RecordedTrial]
+    end_time: float
+    initial: dict[str, AnimalConfig] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, session_dir: Path) -> "RecordedSession":
+        session_path = session_dir / SESSION_DATA_FILENAME
+        if not session_path.is_file():
+            raise ReplayError(f"{session_dir} has no {SESSION_DATA_FILENAME}")
+        state = SessionState.model_validate_json(session_path.read_text("utf-8"))
+
+        history: list[SchedulerHistoryRecord] = []
+        scheduler_log = session_dir / SCHEDULER_LOG_PATH
+        if scheduler_log.is_file():
+            history = [
+                SchedulerHistoryRecord.model_validate(record)
+                for record in read_jsonl(scheduler_log)
+            ]
+
+        trials: list[RecordedTrial] = []
+        for animal in state.session_config.animals:
+            animal_dir = session_dir / animal
+            if not animal_dir.is_dir():
+                continue
+            for path in sorted(animal_dir.glob("*.jsonl")):
+                for record in read_jsonl(path):
+                    start = record.get("trial_start_time")
+                    if "result" not in record or not isinstance(start, (int, float)):
+                        continue
+                    trials.append(
+                        RecordedTrial(
+                            animal=record.get("animal") or animal,
+                            start=start,
+                            end=record.get("trial_end_time") or 0.0,
+                            record=record,
+                        )
+                    )
+        trials.sort(key=lambda trial: trial.start)
+
+        end_time = state.end_time
+        if end_time <= state.start_time:
+            # The session did not end cleanly; stop after the last thing we know of.
+            times = [trial.start for trial in trials] + [
+                record.time for record in history if record.time is not None
+            ]
+            end_time = max(times, default=state.start_time) + MATCH_TOLERANCE_S
+
+        session = cls(session_dir, state, history, trials, end_time)
+        session.initial = session._initial_animals()
+        return session
+
+    @property
+    def timestamped(self) -> bool:
+        return any(record.time is not None for record in self.history)
+
+    def config(self) -> SessionConfig:
+        """The recorded configuration with every animal at its starting task and level."""
+        return self.state.session_config.model_copy(
+            update={"animals": dict(self.initial)}, deep=True
+        )
+
+    def trajectories(self) -> dict[str, list[TrajectoryStep]]:
+        return _trajectories(self.history)
+
+    def detections(self) -> tuple[list[Detection], int]:
+        """Reader transitions to replay, and how many of them were inferred."""
+        logged: list[Detection] = []
+        inferred = 0
+        after_error = False
+        for record in self.history:
+            detection = _detection(record)
+            if detection is None:
+                continue
+            if after_error and record.reason == _RETURNED_REASON:
+                # A return after an error means the reader first recovered
+                # to "nobody", which changes no state and is not logged.
+                logged.append(Detection(detection.time - INFERRED_LEAD_S, None))
+                inferred += 1
+            after_error = detection.error
+            logged.append(detection)
+
+        script: list[Detection] = []
+        present: str | None = None
+        i = 0
+        for trial in self.trials:
+            while i < len(logged) and logged[i].time <= trial.start:
+                present = logged[i].animal
+                script.append(logged[i])
+                i += 1
+            if present != trial.animal:
+                script.append(Detection(trial.start - INFERRED_LEAD_S, trial.animal))
+                present = trial.animal
+                inferred += 1
+        script.extend(logged[i:])
+        return script, inferred
+
+    def _initial_animals(self) -> dict[str, AnimalConfig]:
+        """Each animal's task and level when the session started."""
+        configured = self.state.session_config.animals
+        initial: dict[str, AnimalConfig] = {}
+        for name, config in configured.items():
+            first = next(
+                (r for r in self.history if r.animal_name == name and r.task is not None),
+                None,
+            )
+            task, level = config.task, config.level
+            level_trial_id = config.level_trial_id
+            if first is not None:
+                match first.event:
+                    case SchedulerEvent.SESSION_START | SchedulerEvent.STATE_CHANGE:
+                        task, level = TaskEnum[first.task], first.level or 0
+                        level_trial_id = first.current_level_trial_id or None
+                    case SchedulerEvent.LEVEL_CHANGE:
+                        task = TaskEnum[first.task]
+                        level = first.previous_level or 0
+                    case SchedulerEvent.TASK_SWITCH if first.previous_task:
+                        # The level before a switch is not logged; the last
+                        # one reached is the best guess.
+                        task = TaskEnum[first.previous_task]
+                        level = config.level if config.task == task else 0
+            initial[name] = AnimalConfig(
+                name=name, task=task, level=level, level_trial_id=level_trial_id
+            )
+        return initial
+
+
+class ReplayedTrial:
+    """
+    Stands in for a stage's scene and plays back the recorded trial.
+
+    The stage has already built its own scene, but scenes only start in
+    start(), so that scene never runs. Only the recorded end, a cancel or the
+    end of the session end the trial.
+    """
+
+    def __init__(self, replay: "ReplayTheater", animal: str) -> None:
+        self._replay = replay
+        self._animal = animal
+        self._timer: int | None = None
+        self._on_end: Callable[[_RecordedTrialData], None] | None = None
+        self._data: _RecordedTrialData | None = None
+
+    def start(self, on_end: "Callable[[_RecordedTrialData], None]") -> None:
+        self._on_end = on_end
+        now = clock.now()
+        trial = self._replay.claim(self._animal, now)
+        if trial is not None:
+            self._data = _RecordedTrialData(trial.record)
+        else:
+            self._data = _RecordedTrialData(
+                {"animal": self._animal, "trial_start_time": now, "result": "cancel"}
+            )
+
+        end = self._replay.trial_end(trial) if trial else self._replay.next_start(self._animal)
+        if end is not None:
+            # Exact virtual time rather than after()'s whole milliseconds, so
+            # a trial cut short by the animal leaving still ends after the
+            # recorded leave.
+            tcl = self._replay.tcl
+            self._timer = tcl.call_at((end - tcl.epoch) * 1000, self._finish)
+
+    def cancle(self) -> None:
+        self._cancel_timer()
+        self._finish()
+
+    def _finish(self) -> None:
+        self._timer = None
+        if self._on_end is None:
+            return
+        on_end, self._on_end = self._on_end, None
+        assert self._data is not None
+        on_end(self._data)
+
+    def _cancel_timer(self) -> None:
+        if self._timer is not None:
+            self._replay.tcl.cancel(self._timer)
+            self._timer = None
+
+
+class _RecordedTrialData:
+    """The parts of a scene's TrialData a stage uses: result and model_dump()."""
+
+    def __init__(self, record: dict[str, Any]) -> None:
+        self._record = record
+        self.result = record["result"]
+
+    def model_dump(self) -> dict[str, Any]:
+        return dict(self._record)
+
+    def __repr__(self) -> str:
+        return f"RecordedTrial({self._record.get('trial_id')}, {self.result})"
+
+
+class ReplayScheduler(Scheduler):
+    """Scheduler whose stages play recorded trials and whose history is kept in memory."""
+
+    def __init__(self, replay: "ReplayTheater") -> None:
+        super().__init__(replay, detector=replay._detector, event_pump_interval_ms=None)
+        self._replay = replay
+        self.history: list[SchedulerHistoryRecord] = []
+
+    def _create_task(self, animal_state):
+        task = super()._create_task(animal_state)
+        if not hasattr(task, "_task"):
+            raise ReplayError(f"{type(task).__name__} trials cannot be replayed")
+        task._task = ReplayedTrial(self._replay, animal_state.name)
+        return task
+
+    def _save_history_record(self, record: SchedulerHistoryRecord) -> None:
+        self.history.append(record)
+        super()._save_history_record(record)
+
+
+class ReplayTheater(HeadlessTheater):
+    def __init__(self, session: RecordedSession, data_dir: Path | None = None) -> None:
+        super().__init__(
+            config=session.config(),
+            epoch=session.state.start_time,
+            strict=True,
+            data_dir=data_dir,
+        )
+        self._session = session
+        self._pending = {
+            name: deque(t for t in session.trials if t.animal == name)
+            for name in session.state.session_config.animals
+        }
+        self._starts = [trial.start for trial in session.trials]
+        self.counters = ReplayCounters()
+        self.register_event_start(self._schedule_detections)
+
+    def _create_scheduler(self) -> ReplayScheduler:
+        return ReplayScheduler(self)
+
+    def replay(self) -> ReplayReport:
+        # Stages draw trial parameters at random; keep repeated replays identical.
+        random.seed(self._session.state.session_id)
+        run = self.run(self._session.end_time - self._session.state.start_time)
+
+        replayed = _trajectories(self.scheduler.history)
+        recorded = self._session.trajectories()
+        diffs = [
+            AnimalTrajectoryDiff(name, recorded.get(name, []), replayed.get(name, []))
+            for name in self._session.state.session_config.animals
+        ]
+        self.counters.skipped += sum(len(pending) for pending in self._pending.values())
+        return ReplayReport(
+            self._session.session_dir,
+            run,
+            diffs,
+            self.counters,
+            self._session.timestamped,
+        )
+
+    def claim(self, animal: str, now: float) -> RecordedTrial | None:
+        """The recorded trial the trial starting now corresponds to, if any."""
+        pending = self._pending.get(animal)
+        if pending is None:
+            self.counters.unmatched += 1
+            return None
+        while pending and pending[0].start < now - MATCH_TOLERANCE_S:
+            pending.popleft()
+            self.counters.skipped += 1
+        if pending and pending[0].start <= now + MATCH_TOLERANCE_S:
+            self.counters.matched += 1
+            return pending.popleft()
+        self.counters.unmatched += 1
+        return None
+
+    def trial_end(self, trial: RecordedTrial) -> float:
+        if trial.end > trial.start:
+            return trial.end
+        # Some scenes never set trial_end_time; the next trial marks the end.
+        i = bisect_right(self._starts, trial.start)
+        return self._starts[i] if i < len(self._starts) else self._session.end_time
+
+    def next_start(self, animal: str) -> float | None:
+        pending = self._pending.get(animal)
+        return pending[0].start if pending else None
+
+    def _schedule_detections(self) -> None:
+        detections, inferred = self._session.detections()
+        self.counters.detections = len(detections)
+        self.counters.inferred = inferred
+        for detection in detections:
+            self.tcl.call_at(
+                (detection.time - self.tcl.epoch) * 1000,
+                self.detect,
+                detection.animal,
+                detection.error,
+            )
+
+
+def replay_session(session_dir: Path, data_dir: Path | None = None) -> ReplayReport:
+    return ReplayTheater(RecordedSession.load(session_dir), data_dir).replay()
+
+
+def find_sessions(path: Path) -> list[Path]:
+    """`path` itself if it is a session directory, else every session below it."""
+    if (path / SESSION_DATA_FILENAME).is_file():
+        return [path]
+    return sorted(p.parent for p in path.rglob(SESSION_DATA_FILENAME))
+
+
+def _detection(record: SchedulerHistoryRecord) -> Detection | None:
+    if record.event != SchedulerEvent.STATE_CHANGE or record.time is None:
+        return None
+    if record.reason in _PRESENT_REASONS:
+        return Detection(record.time, record.animal_name)
+    if record.reason == _LEFT_REASON:
+        return Detection(record.time, None)
+    if record.reason == _ERROR_REASON:
+        return Detection(record.time, None, error=True)
+    return None
+
+
+def _trajectories(
+    history: list[SchedulerHistoryRecord],
+) -> dict[str, list[TrajectoryStep]]:
+    trajectories: dict[str, list[TrajectoryStep]] = {}
+    for record in history:
+        if record.event in _TRAJECTORY_EVENTS and record.animal_name is not None:
+            trajectories.setdefault(record.animal_name, []).append(
+                TrajectoryStep.from_record(record)
+            )
+    return trajectories
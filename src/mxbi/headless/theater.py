@@ -0,0 +1,257 @@
+from collections.abc import Callable
+from contextlib import ExitStack
+from dataclasses import dataclass
+from pathlib import Path
+from tempfile import mkdtemp
+from time import perf_counter
+from typing import Protocol
+
+from mxbi.config import session_config
+from mxbi.data_logger import DataLogger, DataLoggerType, jsonl_writer, set_data_dir
+from mxbi.data_logger import data_dir as current_data_dir
+from mxbi.detector.detector import DetectionResult, Detector
+from mxbi.headless.virtual_aplayer import VirtualAPlayer
+from mxbi.headless.virtual_tk import CanvasItem, HeadlessTk, TouchTarget, VirtualTcl
+from mxbi.models.session import SessionConfig, SessionState
+from mxbi.models.task import TaskEnum
+from mxbi.peripheral.audio_player.controller.mock_controller import MockController
+from mxbi.scheduler import Scheduler
+from mxbi.theater import Theater
+from mxbi.utils import clock
+from mxbi.utils.logger import logger
+from mxbi.utils.tkinter.scene_layer import SceneLayer
+
+
+class SyntheticAnimal(Protocol):
+    """Drives a HeadlessTheater: presence through detect(), input through the root."""
+
+    def attach(self, theater: "HeadlessTheater") -> None: ...
+
+
+class VirtualDetector(Detector):
+    """A detector fed only through HeadlessTheater.detect()."""
+
+    def _start_detection(self) -> None:
+        pass
+
+    def _stop_detection(self) -> None:
+        pass
+
+
+class VirtualPump:
+    """Counts rewards instead of driving a pump."""
+
+    def __init__(self) -> None:
+        self.rewards = 0
+        self.reward_ms = 0
+
+    def give_reward(self, duration: int) -> None:
+        self.rewards += 1
+        self.reward_ms += duration
+
+    def stop_reward(self, all: bool) -> None:
+        pass
+
+    def reverse(self) -> None:
+        pass
+
+
+class VirtualController(MockController):
+    """MockController that remembers the volumes instead of logging them."""
+
+    def __init__(self) -> None:
+        self.master_volume: int | None = None
+        self.digital_volume: int | None = None
+
+    def set_master_volume(self, volume: int) -> None:
+        self.master_volume = volume
+
+    def set_digital_volume(self, volume: int) -> None:
+        self.digital_volume = volume
+
+
+@dataclass(frozen=True)
+class AnimalOutcome:
+    trials: int
+    task: TaskEnum
+    level: int
+
+
+@dataclass(frozen=True)
+class HeadlessRunStats:
+    virtual_s: float
+    wall_s: float
+    events: int
+    rewards: int
+    animals: dict[str, AnimalOutcome]
+
+    @property
+    def trials(self) -> int:
+        return sum(outcome.trials for outcome in self.animals.values())
+
+    @property
+    def trials_per_wall_s(self) -> float:
+        return self.trials / self.wall_s if self.wall_s else 0.0
+
+    @property
+    def speedup(self) -> float:
+        return self.virtual_s / self.wall_s if self.wall_s else 0.0
+
+
+class HeadlessTheater(Theater):
+    """
+    A Theater without display, audio, pump or RFID reader, on virtual time.
+
+    The real Scheduler, stages and scenes run against a HeadlessTk root, a
+    VirtualAPlayer and a counting pump. Presence and touches come from a
+    SyntheticAnimal, and mainloop() skips from one timer to the next, so an
+    hour-long session runs in well under a second. The session configuration
+    is a copy that is never written back. Trial data is logged as in a real
+    session, but under `data_dir` (a fresh temp dir by default) instead of
+    the synced data directory. Run each theater before constructing the next.
+    """
+
+    def __init__(
+        self,
+        animal: SyntheticAnimal | None = None,
+        *,
+        config: SessionConfig | None = None,
+        epoch: float | None = None,
+        strict: bool = True,
+        data_dir: Path | None = None,
+    ) -> None:
+        # Theater.__init__ opens the peripherals and runs the scheduler until
+        # the session ends; set up the same state here and start from run().
+        # The copy is what the scheduler mutates, so session_data.json must
+        # record it rather than `config`. Both are undone when run() returns.
+        self._context = ExitStack()
+        self._config = self._context.enter_context(session_config.in_memory(config))
+        self._context.callback(set_data_dir, current_data_dir())
+        self._data_dir = data_dir or Path(mkdtemp(prefix="mxbi-headless-"))
+        set_data_dir(self._data_dir)
+        self._animal = animal
+
+        self._tcl = VirtualTcl(epoch)
+        self._root = HeadlessTk(self._tcl, strict=strict)
+        self._scene_layer = SceneLayer(self._root, self._config.screen_type)
+
+        self._session_state = SessionState(
+            session_id=DataLogger.init_session_id(),
+            start_time=self._tcl.time(),
+            session_config=self._config,
+        )
+        self._session_logger = DataLogger(
+            self._session_state, "", "session_data", DataLoggerType.JSON
+        )
+        self._on_quit: list[Callable[[], None]] = []
+        self._on_start: list[Callable[[], None]] = []
+
+        self._rewarder = VirtualPump()
+        self._acontroller = VirtualController()
+        self._aplayer = VirtualAPlayer(self, self._tcl)
+        self._detector = VirtualDetector(self)
+        self._startup_timeline = []
+
+        self._final_trials: dict[str, int] = {}
+
+    def run(self, duration_s: float) -> HeadlessRunStats:
+        """Run the session for `duration_s` virtual seconds, then end it like <Escape>."""
+        started = perf_counter()
+        with self._context as stack:
+            clock.set_source(self._tcl.time)
+            stack.callback(clock.set_source, None)
+
+            self._scheduler = self._create_scheduler()
+            if self._animal is not None:
+                self._animal.attach(self)
+            for callback in self._on_start:
+                callback()
+            self._root.after(int(duration_s * 1000), self.stop)
+
+            self._scheduler.start()
+            self._root.mainloop()
+
+            animals = {
+                name: AnimalOutcome(
+                    trials=self._final_trials.get(name, 0),
+                    task=state.task,
+                    level=state.level,
+                )
+                for name, state in self._scheduler._animal_states.items()
+            }
+
+        stats = HeadlessRunStats(
+            virtual_s=self._tcl.now_ms / 1000,
+            wall_s=perf_counter() - started,
+            events=self._tcl.events_run,
+            rewards=self._rewarder.rewards,
+            animals=animals,
+        )
+        logger.info(
+            f"Headless session {self._session_state.session_id}: {stats.trials} trials "
+            f"in {stats.virtual_s:.0f} virtual s, {stats.wall_s:.2f} s wall "
+            f"({stats.speedup:.0f}x)"
+        )
+        return stats
+
+    def _create_scheduler(self) -> Scheduler:
+        return Scheduler(self, detector=self._detector, event_pump_interval_ms=None)
+
+    def register_event_start(self, callback: Callable[[], None]) -> None:
+        """Call `callback` in run() once the scheduler exists, before the loop starts."""
+        self._on_start.append(callback)
+
+    def stop(self) -> None:
+        # Scheduler.quit() resets the trial counters, so take them first.
+        self._final_trials = {
+            name: state.trial_id
+            for name, state in self._scheduler._animal_states.items()
+        }
+        self._session_state.end_time = clock.now()
+        self._session_logger.save(self._session_state.model_dump())
+        for callback in self._on_quit:
+            callback()
+
+        # Keep the shared writer open for later sessions in this process, but
+        # let go of this session's files so repeated runs do not pile them up.
+        jsonl_writer.release(self._session_logger.path.parent)
+        self._root.destroy()
+
+    def detect(self, animal_name: str | None, error: bool = False) -> None:
+        """Report what the RFID reader sees now: an animal, nobody, or an error."""
+        self._detector.process_detection(DetectionResult(animal_name, error))
+
+    def on_touch_target(self, callback: Callable[[TouchTarget], None]) -> None:
+        """Call `callback(target)` whenever a scene makes a widget or canvas item touchable."""
+
+        def notify(path: str, tag: str | None) -> None:
+            for target in self._root.touchable():
+                if isinstance(target, CanvasItem):
+                    found = target.canvas._w == path and target.tag == tag
+                else:
+                    found = target._w == path and tag is None
+                if found:
+                    callback(target)
+                    return
+
+        self._tcl.on_touchable = notify
+
+    @property
+    def root(self) -> HeadlessTk:
+        return self._root
+
+    @property
+    def tcl(self) -> VirtualTcl:
+        return self._tcl
+
+    @property
+    def scheduler(self) -> Scheduler:
+        return self._scheduler
+
+    @property
+    def pump(self) -> VirtualPump:
+        return self._rewarder
+
+    @property
+    def data_dir(self) -> Path:
+        return self._data_dir
@@ -0,0 +1,127 @@
+import wave
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+from numpy.typing import NDArray
+
+from mxbi.utils.aplayer import (
+    SAMPLE_RATE,
+    APlayer,
+    CompiledStimulus,
+    StimulusSequenceUnit,
+)
+
+if TYPE_CHECKING:
+    from mxbi.headless.virtual_tk import VirtualTcl
+    from mxbi.theater import Theater
+
+
+@dataclass
+class _Playback:
+    future: "Future[bool]"
+    timers: list[int] = field(default_factory=list)
+
+
+class VirtualAPlayer(APlayer):
+    """
+    APlayer without audio output, timed on the virtual clock.
+
+    Stimuli are still generated and compiled by APlayer, but playing one only
+    schedules its volume cues and its completion `duration` virtual ms later,
+    queued behind whatever is already playing. Futures resolve and their
+    callbacks run on the loop thread, so a headless run stays deterministic.
+    """
+
+    def __init__(self, theater: "Theater", tcl: "VirtualTcl") -> None:
+        # No PyAudio, output engine or playback thread.
+        self._theater = theater
+        self._tcl = tcl
+        self._playing: list[_Playback] = []
+        self._busy_until_ms = 0.0
+        self._last_onset_ms: float | None = None
+        self.played = 0
+
+    def play_file(self, path: str | Path) -> "Future[bool]":
+        try:
+            with wave.open(str(path), "rb") as wf:
+                samples = int(wf.getnframes() * SAMPLE_RATE / wf.getframerate())
+        except (OSError, EOFError, wave.Error) as e:
+            print(f"[APlayer] Error playing WAV file {path}: {e}")
+            future: Future[bool] = Future()
+            future.set_result(False)
+            return future
+        return self._schedule(samples)
+
+    def play_stimulus(self, stimulus: NDArray[np.int16]) -> "Future[bool]":
+        return self._schedule(len(stimulus))
+
+    def play_stimulus_sequence(self, tones: list[StimulusSequenceUnit]) -> "Future[bool]":
+        cues: list[tuple[int, int, int]] = []
+        offset = 0
+        for tone in tones:
+            if tone.master_volume is not None and tone.digital_volume is not None:
+                cues.append((offset, tone.master_volume, tone.digital_volume))
+            if tone.stimulus is not None:
+                offset += len(tone.stimulus)
+        return self._schedule(offset, cues)
+
+    def play_compiled_stimulus(self, stimulus: CompiledStimulus) -> "Future[bool]":
+        cues = [(c.offset, c.master_volume, c.digital_volume) for c in stimulus.cues]
+        return self._schedule(len(stimulus.buffer), cues)
+
+    @property
+    def last_onset(self) -> float | None:
+        onset_ms = self._last_onset_ms
+        if onset_ms is None or onset_ms > self._tcl.now_ms:
+            return None
+        return self._tcl.epoch + onset_ms / 1000
+
+    def stop(self) -> None:
+        """End whatever is playing or queued; its futures resolve to False."""
+        playing, self._playing = self._playing, []
+        for playback in playing:
+            for timer in playback.timers:
+                self._tcl.cancel(timer)
+            if not playback.future.done():
+                playback.future.set_result(False)
+        self._busy_until_ms = self._tcl.now_ms
+
+    def __del__(self) -> None:
+        pass
+
+    def _schedule(
+        self, samples: int, cues: list[tuple[int, int, int]] | tuple = ()
+    ) -> "Future[bool]":
+        future: Future[bool] = Future()
+        future.set_running_or_notify_cancel()
+        playback = _Playback(future)
+
+        start_ms = max(self._tcl.now_ms, self._busy_until_ms)
+        end_ms = start_ms + samples * 1000 / SAMPLE_RATE
+        self._busy_until_ms = end_ms
+        self._last_onset_ms = start_ms
+
+        for offset, master_volume, digital_volume in cues:
+            playback.timers.append(
+                self._tcl.call_at(
+                    start_ms + offset * 1000 / SAMPLE_RATE,
+                    self._apply_volume,
+                    master_volume,
+                    digital_volume,
+                )
+            )
+        playback.timers.append(self._tcl.call_at(end_ms, self._finish, playback))
+        self._playing.append(playback)
+        return future
+
+    def _apply_volume(self, master_volume: int, digital_volume: int) -> None:
+        self._theater.acontroller.set_master_volume(master_volume)
+        self._theater.acontroller.set_digital_volume(digital_volume)
+
+    def _finish(self, playback: _Playback) -> None:
+        self._playing.remove(playback)
+        self.played += 1
+        playback.future.set_result(True)
@@ -0,0 +1,585 @@
+"""
+A Tk root that needs no display and runs on virtual time.
+
+tkinter widgets are thin wrappers that turn every method into a call on the
+root's Tcl interpreter (`widget.tk.call(...)`). VirtualTcl stands in for that
+interpreter: it keeps the widget tree, bindings, focus and variables in plain
+Python, answers drawing commands with dummies, and runs `after` timers from a
+heap in virtual milliseconds. The stock Canvas, Frame, Label, PhotoImage, ...
+classes therefore work unchanged on a HeadlessTk root, and mainloop() jumps
+straight from one timer to the next instead of sleeping.
+
+Input is injected with HeadlessTk.touch() and press_key(), which run the
+handlers bound to a widget, or to a canvas item tag, the way Tk would for a
+real event.
+"""
+
+import heapq
+import re
+import tkinter
+from dataclasses import dataclass
+from itertools import count
+from threading import RLock
+from time import time
+from tkinter import Misc, TclError, Tk
+from typing import Any, Callable
+
+from mxbi.utils.logger import logger
+
+# Tcl commands handled by VirtualTcl itself; any other first word followed by
+# a window path creates a widget, and a window path as first word is a widget
+# command.
+_BUILTINS = frozenset(
+    {
+        "after",
+        "bell",
+        "bind",
+        "bindtags",
+        "clipboard",
+        "destroy",
+        "event",
+        "focus",
+        "font",
+        "grab",
+        "grid",
+        "image",
+        "info",
+        "lower",
+        "option",
+        "pack",
+        "place",
+        "raise",
+        "selection",
+        "tk",
+        "tkwait",
+        "update",
+        "winfo",
+        "wm",
+    }
+)
+
+# Event types as reported by %T.
+_KEY_PRESS = "2"
+_BUTTON_PRESS = "4"
+
+_PRESS_SEQUENCES = frozenset(
+    {"<ButtonPress>", "<Button>", "<ButtonPress-1>", "<Button-1>", "<1>"}
+)
+
+_FUNCID = re.compile(r'\[(\S+) ')
+_NUMBER = re.compile(r"^-?[\d.]+$")
+
+
+class VirtualTimeStalled(RuntimeError):
+    """mainloop() has nothing scheduled, so nothing could ever happen again."""
+
+
+@dataclass(frozen=True)
+class CanvasItem:
+    """The items of `canvas` tagged `tag`; touchable once a press is bound to the tag."""
+
+    canvas: Misc
+    tag: str
+
+
+# What HeadlessTk.touch() presses: a whole widget or the items of one tag.
+TouchTarget = Misc | CanvasItem
+
+
+@dataclass
+class _Item:
+    id: str
+    tags: tuple[str, ...]
+    hidden: bool = False
+    # The item's first coordinate pair: an image's or text's anchor point.
+    x: int = 0
+    y: int = 0
+
+
+class VirtualTcl:
+    """The subset of a tkapp object tkinter uses, on a virtual clock."""
+
+    def __init__(self, epoch: float | None = None) -> None:
+        self.epoch = time() if epoch is None else epoch
+        self._now_ms = 0.0
+
+        self._lock = RLock()
+        self._timers: list[tuple[float, int]] = []
+        self._callbacks: dict[int, tuple[Callable[..., Any], tuple[Any, ...]]] = {}
+        self._seq = count()
+
+        self._commands: dict[str, Callable[..., Any]] = {}
+        self._vars: dict[str, Any] = {}
+        self._windows: set[str] = {"."}
+        # Keyed by window path and, for canvas item bindings, the item tag.
+        self._bindings: dict[tuple[str, str | None], dict[str, str]] = {}
+        self._items: dict[str, dict[int, _Item]] = {}
+        self._item_ids = count(1)
+        self._focus = "."
+
+        self._quit = False
+        self._destroyed = False
+        self.events_run = 0
+
+        # Called with the window path, and the tag for a canvas item, whenever
+        # a press handler is bound.
+        self.on_touchable: Callable[[str, str | None], None] | None = None
+
+    # region clock
+    @property
+    def now_ms(self) -> float:
+        return self._now_ms
+
+    def time(self) -> float:
+        """Virtual seconds since the epoch; a drop-in for time.time()."""
+        return self.epoch + self._now_ms / 1000
+
+    def call_at(self, due_ms: float, callback: Callable[..., Any], *args: Any) -> int:
+        """Run `callback(*args)` on the loop at virtual `due_ms`; returns a timer id."""
+        with self._lock:
+            timer_id = next(self._seq)
+            self._callbacks[timer_id] = (callback, args)
+            heapq.heappush(self._timers, (max(due_ms, self._now_ms), timer_id))
+            return timer_id
+
+    def call_later(self, delay_ms: float, callback: Callable[..., Any], *args: Any) -> int:
+        return self.call_at(self._now_ms + delay_ms, callback, *args)
+
+    def cancel(self, timer_id: int) -> None:
+        with self._lock:
+            self._callbacks.pop(timer_id, None)
+
+    def run_next(self, until_ms: float | None = None) -> bool:
+        """Advance to the next timer and run it; False if there is none (before `until_ms`)."""
+        with self._lock:
+            while self._timers:
+                due_ms, timer_id = self._timers[0]
+                if until_ms is not None and due_ms > until_ms:
+                    return False
+                heapq.heappop(self._timers)
+                entry = self._callbacks.pop(timer_id, None)
+                if entry is not None:
+                    break
+            else:
+                return False
+            self._now_ms = due_ms
+
+        callback, args = entry
+        self.events_run += 1
+        callback(*args)
+        return True
+
+    # endregion
+
+    # region tkapp interface
+    def mainloop(self, threshold: int = 0) -> None:
+        self._quit = False
+        while not self._quit and not self._destroyed:
+            if not self.run_next():
+                raise VirtualTimeStalled(
+                    f"Nothing scheduled at {self._now_ms / 1000:.3f} s of virtual time"
+                )
+        self._quit = False
+
+    def quit(self) -> None:
+        self._quit = True
+
+    def call(self, *args: Any) -> Any:
+        if len(args) == 1 and isinstance(args[0], tuple):
+            args = args[0]
+        if not args:
+            return ""
+        command = str(args[0])
+
+        if command in _BUILTINS:
+            handler = getattr(self, f"_cmd_{command}", None)
+            return handler(*args[1:]) if handler is not None else ""
+        if command.startswith("."):
+            return self._widget_command(command, *args[1:])
+        if len(args) > 1 and str(args[1]).startswith("."):
+            self._windows.add(str(args[1]))
+            return str(args[1])
+        if command in self._commands:
+            return self._commands[command](*args[1:])
+        # Image commands (pyimageN put/blank/...) and anything else draw nothing.
+        return ""
+
+    def createcommand(self, name: str, func: Callable[..., Any]) -> None:
+        self._commands[name] = func
+
+    def deletecommand(self, name: str) -> None:
+        if self._commands.pop(name, None) is None:
+            raise TclError(f'can\'t delete Tcl command "{name}"')
+
+    def getboolean(self, value: Any) -> bool:
+        if isinstance(value, (bool, int)):
+            return bool(value)
+        text = str(value).strip().lower()
+        if text in ("1", "true", "yes", "on"):
+            return True
+        if text in ("0", "false", "no", "off"):
+            return False
+        raise TclError(f'expected boolean value but got "{value}"')
+
+    def getint(self, value: Any) -> int:
+        if isinstance(value, int):
+            return value
+        try:
+            return int(str(value), 0)
+        except ValueError:
+            raise TclError(f'expected integer but got "{value}"') from None
+
+    def getdouble(self, value: Any) -> float:
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            raise TclError(f'expected floating-point number but got "{value}"') from None
+
+    def splitlist(self, value: Any) -> tuple[Any, ...]:
+        if isinstance(value, tuple):
+            return value
+        if isinstance(value, list):
+            return tuple(value)
+        text = str(value)
+        return tuple(text.split()) if text else ()
+
+    def globalsetvar(self, name: str, value: Any) -> None:
+        self._vars[str(name)] = value
+
+    setvar = globalsetvar
+
+    def globalgetvar(self, name: str) -> Any:
+        try:
+            return self._vars[str(name)]
+        except KeyError:
+            raise TclError(f'can\'t read "{name}": no such variable') from None
+
+    getvar = globalgetvar
+
+    def globalunsetvar(self, name: str) -> None:
+        self._vars.pop(str(name), None)
+
+    unsetvar = globalunsetvar
+
+    def wantobjects(self) -> bool:
+        return True
+
+    # endregion
+
+    # region input
+    def fire(
+        self,
+        path: str,
+        event_type: str,
+        detail: str,
+        x: int | None = None,
+        y: int | None = None,
+        tag: str | None = None,
+    ) -> bool:
+        """
+        Run the bindings of `path` and its toplevel for one event; True if any ran.
+
+        With `tag` the event hits the topmost visible item of the canvas `path`
+        carrying it, and that item's bindings run first, as on a real canvas.
+        Unless given, the event lands on the item's first coordinate pair, or
+        on the widget's origin.
+        """
+        if path not in self._windows:
+            return False
+
+        targets: list[tuple[str, str | None]] = []
+        if tag is not None:
+            item = self._topmost(path, tag)
+            if item is None:
+                return False
+            targets += [(path, t) for t in ("all", *item.tags, item.id)]
+            x = item.x if x is None else x
+            y = item.y if y is None else y
+        x = 0 if x is None else x
+        y = 0 if y is None else y
+        # Widget first, then its toplevel (here always the root), as Tk's
+        # default bindtags do.
+        targets += [(path, None)] if path == "." else [(path, None), (".", None)]
+
+        if event_type == _BUTTON_PRESS:
+            sequences = _PRESS_SEQUENCES
+        else:
+            sequences = {f"<{detail}>", f"<Key-{detail}>", f"<KeyPress-{detail}>", detail}
+
+        values = (
+            "0", "1", "1", "0", "0", "0", "0", "0", str(x), str(y),
+            detail if event_type == _KEY_PRESS else "??", "0",
+            detail if event_type == _KEY_PRESS else "??", "0",
+            path, event_type, str(x), str(y), "0",
+        )  # fmt: skip
+
+        fired = False
+        for target in targets:
+            for sequence, script in list(self._bindings.get(target, {}).items()):
+                if sequence not in sequences:
+                    continue
+                for funcid in _FUNCID.findall(script):
+                    command = self._commands.get(funcid)
+                    if command is None:
+                        continue
+                    fired = True
+                    if command(*values) == "break":
+                        return fired
+        return fired
+
+    def touchable(self) -> list[tuple[str, str | None]]:
+        """
+        Window paths, and canvas item tags with a visible item, that have a
+        ButtonPress binding, oldest first.
+        """
+        return [
+            (path, tag)
+            for (path, tag), bindings in self._bindings.items()
+            if path in self._windows
+            and not _PRESS_SEQUENCES.isdisjoint(bindings)
+            and (tag is None or self._topmost(path, tag) is not None)
+        ]
+
+    def _topmost(self, path: str, tag: str) -> "_Item | None":
+        visible = [item for item in self._matching(path, tag) if not item.hidden]
+        return visible[-1] if visible else None
+
+    def _matching(self, path: str, tag_or_id: Any) -> list[_Item]:
+        tag = str(tag_or_id)
+        items = self._items.get(path, {})
+        if tag == "all":
+            return list(items.values())
+        return [item for item in items.values() if tag in item.tags or tag == item.id]
+
+    @property
+    def focus(self) -> str:
+        return self._focus
+
+    # endregion
+
+    # region commands
+    def _cmd_after(self, *args: Any) -> Any:
+        first = str(args[0]) if args else ""
+        if first == "info":
+            if len(args) < 2:
+                return tuple(f"after#{i}" for i in self._callbacks)
+            timer_id = self._parse_after_id(args[1])
+            entry = self._callbacks.get(timer_id) if timer_id is not None else None
+            if entry is None or not entry[1]:
+                raise TclError(f'event "{args[1]}" doesn\'t exist')
+            return (entry[1][0], "timer")
+        if first == "cancel":
+            timer_id = self._parse_after_id(args[1]) if len(args) > 1 else None
+            if timer_id is not None:
+                self.cancel(timer_id)
+            return ""
+        if first == "idle":
+            return f"after#{self.call_later(0, self._run_script, *args[1:])}"
+
+        delay_ms = self.getint(args[0])
+        if len(args) == 1:
+            # A blocking sleep: time passes, nothing runs.
+            self._now_ms += delay_ms
+            return ""
+        return f"after#{self.call_later(delay_ms, self._run_script, *args[1:])}"
+
+    def _run_script(self, name: str, *args: Any) -> None:
+        command = self._commands.get(str(name))
+        if command is not None:
+            command(*args)
+
+    @staticmethod
+    def _parse_after_id(value: Any) -> int | None:
+        text = str(value)
+        if text.startswith("after#") and text[6:].isdigit():
+            return int(text[6:])
+        return None
+
+    def _cmd_bind(
+        self, path: Any, sequence: Any = None, script: Any = None, tag: str | None = None
+    ) -> Any:
+        bindings = self._bindings.setdefault((str(path), tag), {})
+        if sequence is None:
+            return tuple(bindings)
+        sequence = str(sequence)
+        if script is None:
+            return bindings.get(sequence, "")
+
+        script = str(script)
+        if not script:
+            bindings.pop(sequence, None)
+        elif script.startswith("+"):
+            previous = bindings.get(sequence, "")
+            bindings[sequence] = previous + ("\n" if previous else "") + script[1:]
+        else:
+            bindings[sequence] = script
+
+        if script and sequence in _PRESS_SEQUENCES and self.on_touchable is not None:
+            # Tell the listener once the current handler (which usually
+            # still sets up the trial) has returned.
+            self.call_later(0, self.on_touchable, str(path), tag)
+        return ""
+
+    def _cmd_destroy(self, *paths: Any) -> str:
+        for path in map(str, paths):
+            if path == ".":
+                self._destroyed = True
+                doomed = set(self._windows)
+            else:
+                doomed = {
+                    w for w in self._windows if w == path or w.startswith(path + ".")
+                }
+            self._windows -= doomed
+            for window in doomed:
+                self._items.pop(window, None)
+            self._bindings = {
+                key: bindings
+                for key, bindings in self._bindings.items()
+                if key[0] not in doomed
+            }
+            if self._focus in doomed:
+                self._focus = "."
+        return ""
+
+    def _cmd_focus(self, *args: Any) -> str:
+        if not args:
+            return self._focus
+        path = str(args[-1])
+        if path in self._windows:
+            self._focus = path
+        return ""
+
+    def _cmd_image(self, *args: Any) -> Any:
+        if args and str(args[0]) == "create":
+            return str(args[2]) if len(args) > 2 else f"image{next(self._item_ids)}"
+        return ""
+
+    def _cmd_info(self, *args: Any) -> Any:
+        if len(args) >= 2 and str(args[0]) == "exists":
+            return str(args[1]) in self._vars
+        return ""
+
+    def _cmd_update(self, *args: Any) -> str:
+        if args and str(args[0]) == "idletasks":
+            return ""
+        while self.run_next(until_ms=self._now_ms):
+            pass
+        return ""
+
+    def _cmd_winfo(self, *args: Any) -> Any:
+        what = str(args[0]) if args else ""
+        if what == "children":
+            parent = str(args[1])
+            prefix = "." if parent == "." else parent + "."
+            return tuple(
+                w
+                for w in sorted(self._windows)
+                if w != "." and w.startswith(prefix) and "." not in w[len(prefix) :]
+            )
+        if what == "exists":
+            return int(str(args[1]) in self._windows)
+        return 0
+
+    def _widget_command(self, path: str, *args: Any) -> Any:
+        command = str(args[0]) if args else ""
+        if command == "create":
+            # create <type> <coords...> ?-option value ...?
+            options = self._options(args[2:])
+            item_id = next(self._item_ids)
+            item = _Item(
+                id=str(item_id),
+                tags=self.splitlist(options.get("-tags", "")),
+                hidden=str(options.get("-state", "")) == "hidden",
+            )
+            self._move(item, args[2:])
+            self._items.setdefault(path, {})[item_id] = item
+            return item_id
+        if command == "coords" and len(args) > 2:
+            for item in self._matching(path, args[1]):
+                self._move(item, args[2:])
+            return ""
+        if command in ("itemconfigure", "itemconfig") and len(args) > 2:
+            state = self._options(args[2:]).get("-state")
+            if state is not None:
+                for item in self._matching(path, args[1]):
+                    item.hidden = str(state) == "hidden"
+            return ""
+        if command == "delete":
+            items = self._items.get(path, {})
+            for tag in args[1:]:
+                for item in self._matching(path, tag):
+                    items.pop(int(item.id), None)
+            return ""
+        if command == "bind" and len(args) > 1:
+            return self._cmd_bind(path, *args[2:], tag=str(args[1]))
+        return ""
+
+    @staticmethod
+    def _move(item: _Item, coords: tuple[Any, ...]) -> None:
+        numbers = [arg for arg in coords[:2] if _NUMBER.match(str(arg))]
+        if len(numbers) == 2:
+            item.x, item.y = (round(float(n)) for n in numbers)
+
+    @staticmethod
+    def _options(args: tuple[Any, ...]) -> dict[str, Any]:
+        """The `-option value` pairs that follow an item's coordinates."""
+        for i, arg in enumerate(args):
+            if isinstance(arg, str) and arg.startswith("-") and not _NUMBER.match(arg):
+                return dict(zip(args[i::2], args[i + 1 :: 2]))
+        return {}
+
+    # endregion
+
+
+class HeadlessTk(Tk):
+    """
+    A Tk root backed by VirtualTcl instead of a display.
+
+    With `strict` an exception in a callback propagates out of mainloop();
+    otherwise it is logged and the loop carries on, as under real Tk.
+    """
+
+    def __init__(self, tcl: VirtualTcl | None = None, *, strict: bool = True) -> None:
+        # Tk.__init__ would connect to a display; set up the same state it
+        # leaves behind on a virtual interpreter instead.
+        self.master = None
+        self.children = {}
+        self._tkloaded = True
+        self._strict = strict
+        self.tk = tcl or VirtualTcl()
+
+        if tkinter._support_default_root and tkinter._default_root is None:
+            tkinter._default_root = self
+        self.protocol("WM_DELETE_WINDOW", self.destroy)
+
+    @property
+    def tcl(self) -> VirtualTcl:
+        return self.tk
+
+    def report_callback_exception(self, exc, val, tb) -> None:
+        if self._strict:
+            raise val.with_traceback(tb)
+        logger.opt(exception=(exc, val, tb)).error("Exception in headless Tk callback")
+
+    def touch(
+        self, target: TouchTarget, x: int | None = None, y: int | None = None
+    ) -> bool:
+        """Press on `target`, by default on its anchor; True if it had a handler."""
+        if isinstance(target, CanvasItem):
+            return self.tk.fire(target.canvas._w, _BUTTON_PRESS, "1", x, y, target.tag)
+        return self.tk.fire(target._w, _BUTTON_PRESS, "1", x, y)
+
+    def press_key(self, keysym: str) -> bool:
+        """Type `keysym` into the focused widget; True if anything handled it."""
+        return self.tk.fire(self.tk.focus, _KEY_PRESS, keysym)
+
+    def touchable(self) -> list[TouchTarget]:
+        """Widgets and canvas items currently bound to a press, oldest first."""
+        targets: list[TouchTarget] = []
+        for path, tag in self.tk.touchable():
+            try:
+                widget = self.nametowidget(path)
+            except KeyError:
+                continue
+            targets.append(widget if tag is None else CanvasItem(widget, tag))
+        return targets
@@ -49,6 +49,8 @@ class SessionState(BaseModel):
     start_time: float = Field(default=0.0, frozen=True)
     end_time: float = 0.0
     session_config: SessionConfig = Field(default_factory=SessionConfig, frozen=True)
+    # Peripherals replaced by their mock at startup, with the reason.
+    startup_fallbacks: dict[str, str] = Field(default_factory=dict)
 
 
 class SessionOptions(BaseModel):
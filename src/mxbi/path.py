@@ -17,6 +17,13 @@ CROSS_MODAL_CONFIG_FILENAME = "config_cross_modal.json"
 CROSS_MODAL_CONFIG_PATH = CONFIG_DIR_PATH / CROSS_MODAL_CONFIG_FILENAME
 
 DATA_DIR_PATH = ROOT_DIR_PATH / "data"
+CACHE_DIR_NAME = ".cache"
+CACHE_DIR_PATH = DATA_DIR_PATH / CACHE_DIR_NAME
+STATE_DIR_NAME = ".state"
+STATE_DIR_PATH = DATA_DIR_PATH / STATE_DIR_NAME
+TRIAL_CURSOR_LOG_PATH = STATE_DIR_PATH / "trial_cursors.log"
+SESSION_INDEX_FILENAME = "session_index.sqlite3"
+COLUMNAR_DIR_NAME = ".columnar"
 
 LOG_PATH = ROOT_DIR_PATH / "log"
 
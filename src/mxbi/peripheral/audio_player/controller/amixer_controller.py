@@ -1,14 +1,192 @@
 import subprocess
+from collections.abc import Callable
+from dataclasses import dataclass
+from threading import Lock, Thread
+from time import perf_counter
+from typing import TextIO
 
 from mxbi.peripheral.audio_player.controller.config import digital_values, master_values
+from mxbi.utils.logger import logger
+
+MASTER_SESSION = ("amixer", "-q", "-s")
+DIGITAL_SESSION = ("amixer", "-q", "-c", "0", "-s")
+
+
+@dataclass(frozen=True)
+class MixerLatencyStats:
+    """
+    How long handing a change to amixer took; amixer applies it on its own time.
+
+    `failed` counts changes that could not be written plus error lines amixer
+    reported afterwards.
+    """
+
+    changes: int
+    skipped: int
+    failed: int
+    mean_ms: float
+    max_ms: float
+
+
+class _AmixerSession:
+    """
+    A long-running `amixer -q -s` process fed one command per line on stdin.
+
+    send() never waits for amixer. Whatever amixer writes to stderr is read
+    on a background thread, logged and passed to `on_error`.
+    """
+
+    def __init__(self, args: tuple[str, ...], on_error: Callable[[str], None]) -> None:
+        self._args = args
+        self._on_error = on_error
+        self._process: subprocess.Popen[str] | None = None
+
+    def send(self, command: str) -> bool:
+        """Hand `command` to amixer; False if it could not be written."""
+        for attempt in range(2):
+            process = self._ensure_process()
+            if process is None:
+                return False
+            try:
+                assert process.stdin is not None
+                process.stdin.write(command + "\n")
+                process.stdin.flush()
+                return True
+            except OSError as e:
+                logger.warning(f"amixer session {self._args} died: {e}")
+                self.close()
+                if attempt:
+                    return False
+        return False
+
+    def close(self) -> None:
+        if self._process is None:
+            return
+        try:
+            if self._process.stdin is not None:
+                self._process.stdin.close()
+            self._process.wait(timeout=1.0)
+        except Exception:
+            self._process.kill()
+        self._process = None
+
+    def _ensure_process(self) -> subprocess.Popen[str] | None:
+        if self._process is not None and self._process.poll() is None:
+            return self._process
+
+        try:
+            self._process = subprocess.Popen(
+                self._args,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                text=True,
+                bufsize=1,
+            )
+        except FileNotFoundError:
+            logger.error("amixer not found; volume changes are ignored")
+            self._process = None
+            return None
+
+        Thread(
+            target=self._read_errors, args=(self._process.stderr,), daemon=True
+        ).start()
+        return self._process
+
+    def _read_errors(self, stream: TextIO) -> None:
+        for line in stream:
+            line = line.strip()
+            if line:
+                logger.warning(f"amixer session {self._args}: {line}")
+                self._on_error(line)
 
 
 class AmixerController:
+    """
+    Volume control through persistent `amixer -s` sessions.
+
+    Each change is a single line written to an already running amixer, so the
+    playback thread never waits for a fork/exec, and writes that would not
+    change the current value are skipped. When amixer reports an error the
+    cached value of that control is forgotten, so the next request is sent
+    again even if it asks for the same volume.
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._master = _AmixerSession(MASTER_SESSION, self._forget_master)
+        self._digital = _AmixerSession(DIGITAL_SESSION, self._forget_digital)
+        self._master_volume: int | None = None
+        self._digital_volume: int | None = None
+
+        self._changes = 0
+        self._skipped = 0
+        self._failed = 0
+        self._total_latency = 0.0
+        self._max_latency = 0.0
+
     def set_master_volume(self, volume: int) -> None:
-        subprocess.run(["amixer", "sset", "Master", f"{volume}%"])
+        with self._lock:
+            if volume == self._master_volume:
+                self._skipped += 1
+                return
+            sent = self._send(self._master, f"sset Master {volume}%")
+            self._master_volume = volume if sent else None
 
     def set_digital_volume(self, volume: int) -> None:
-        subprocess.run(["amixer", "-c", "0", "sset", "Digital", f"{volume}"])
+        with self._lock:
+            if volume == self._digital_volume:
+                self._skipped += 1
+                return
+            sent = self._send(self._digital, f"sset Digital {volume}")
+            self._digital_volume = volume if sent else None
 
     def get_amp_value(self, freqency: int, amplitude: float) -> tuple[int, int]:
         return master_values[freqency], digital_values[amplitude]
+
+    @property
+    def latency_stats(self) -> MixerLatencyStats:
+        with self._lock:
+            return MixerLatencyStats(
+                changes=self._changes,
+                skipped=self._skipped,
+                failed=self._failed,
+                mean_ms=(self._total_latency / self._changes * 1000)
+                if self._changes
+                else 0.0,
+                max_ms=self._max_latency * 1000,
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._master.close()
+            self._digital.close()
+
+    def __del__(self) -> None:
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    def _forget_master(self, _error: str) -> None:
+        with self._lock:
+            self._master_volume = None
+            self._failed += 1
+
+    def _forget_digital(self, _error: str) -> None:
+        with self._lock:
+            self._digital_volume = None
+            self._failed += 1
+
+    def _send(self, session: _AmixerSession, command: str) -> bool:
+        started = perf_counter()
+        sent = session.send(command)
+        latency = perf_counter() - started
+
+        if not sent:
+            self._failed += 1
+            return False
+        self._changes += 1
+        self._total_latency += latency
+        self._max_latency = max(self._max_latency, latency)
+        return True
@@ -181,6 +181,88 @@ class _LID665v42FrameParser:
         return bytes(result)
 
 
+class _LID665v42FrameScanner:
+    """
+    Bulk counterpart of _LID665v42FrameParser. Incoming chunks are appended to a
+    reusable buffer and frames are located with bytes.find, so only DLE bytes are
+    visited from Python; decoding is delegated to the byte parser so both paths
+    yield identical results.
+    """
+
+    def __init__(self, parser: _LID665v42FrameParser) -> None:
+        self._parser = parser
+        self._buffer = bytearray()
+        self._frame_start = -1
+        self._scan_pos = 0
+        self._frame_started_at = 0.0
+
+    def reset(self) -> None:
+        self._buffer.clear()
+        self._frame_start = -1
+        self._scan_pos = 0
+        self._frame_started_at = 0.0
+
+    def feed(self, chunk: bytes, received_at: float) -> list[Result]:
+        """Consume a chunk of raw bytes and return every frame completed by it"""
+        buf = self._buffer
+        buf += chunk
+        size = len(buf)
+
+        results: list[Result] = []
+        start = self._frame_start
+        pos = self._scan_pos
+
+        while True:
+            if start < 0:
+                start = buf.find(START, pos)
+                if start < 0:
+                    if pos < size:
+                        self._parser.record_error(
+                            f"Expected {START!r} but received {bytes(buf[size - 1 :])!r}"
+                        )
+                    pos = size
+                    break
+                self._frame_started_at = received_at
+                pos = start + 1
+
+            dle = buf.find(DLE, pos)
+            if dle < 0:
+                pos = size
+                break
+            if dle + 1 >= size:
+                pos = dle
+                break
+
+            if buf[dle + 1] != STOP[0]:
+                # Escaped byte (including a doubled DLE) stays part of the frame.
+                pos = dle + 2
+                continue
+
+            if dle + 2 >= size:
+                pos = dle
+                break
+
+            end = dle + 3
+            with memoryview(buf) as view:
+                frame = DLE + view[start:end].tobytes()
+            try:
+                results.append(
+                    self._parser._parse_frame(frame, self._frame_started_at)
+                )
+                self._parser.record_error("")
+            except ValueError as e:
+                self._parser.record_error(str(e))
+
+            start = -1
+            pos = end
+
+        keep_from = start if start >= 0 else pos
+        del buf[:keep_from]
+        self._frame_start = start - keep_from if start >= 0 else -1
+        self._scan_pos = pos - keep_from
+        return results
+
+
 class DorsetLID665v42:
     def __init__(
         self,
@@ -188,6 +270,7 @@ class DorsetLID665v42:
         baudrate: int,
         unit: str = "01",
         host: str = "FE",
+        bulk: bool = True,
     ) -> None:
         self._serial = Serial(
             port,
@@ -200,6 +283,8 @@ class DorsetLID665v42:
         self._unit = unit
         self._host = host
         self._protocol = _LID665v42FrameParser()
+        self._scanner = _LID665v42FrameScanner(self._protocol)
+        self._bulk = bulk
         self._rx_queue: Deque[Result] = deque()
         self._callbacks: list[Callable[[Result], None]] = []
         self._callback_lock = Lock()
@@ -218,6 +303,29 @@ class DorsetLID665v42:
 
     def read(self) -> None:
         """Continuously read from the serial port and store parsed frames."""
+        if self._bulk:
+            self._read_bulk()
+        else:
+            self._read_bytewise()
+
+    def _read_bulk(self) -> None:
+        self._scanner.reset()
+        while self._serial.is_open:
+            try:
+                # Block for the first byte, then drain whatever else is pending.
+                chunk = self._serial.read(max(1, self._serial.in_waiting))
+            except (SerialException, OSError, TypeError) as exc:
+                self._protocol.record_error(f"Serial read aborted: {exc}")
+                self._scanner.reset()
+                break
+            if not chunk:
+                continue
+
+            for frame in self._scanner.feed(chunk, datetime.now().timestamp()):
+                self._rx_queue.append(frame)
+                self._notify_subscribers(frame)
+
+    def _read_bytewise(self) -> None:
         while self._serial.is_open:
             try:
                 byte = self._serial.read(1)
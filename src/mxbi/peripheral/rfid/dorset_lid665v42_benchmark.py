@@ -0,0 +1,89 @@
+"""
+Throughput benchmark for the Dorset LID665v42 frame parsers.
+
+Feeds a recorded byte stream through the per-byte state machine and the bulk
+scanner and reports frames/s and MB/s for each. Record a stream on the box with
+e.g. `cat /dev/ttyUSB0 > lid665v42.bin`; without a recording a synthetic stream
+of tag frames (with escaped payload bytes and line noise) is used.
+
+    uv run python -m mxbi.peripheral.rfid.dorset_lid665v42_benchmark [stream.bin]
+"""
+
+import random
+import sys
+from pathlib import Path
+from time import perf_counter
+
+from mxbi.peripheral.rfid.dorset_lid665v42 import (
+    DLE,
+    START,
+    STOP,
+    Result,
+    _LID665v42FrameParser,
+    _LID665v42FrameScanner,
+)
+
+CHUNK_SIZE = 64
+REPEAT = 5
+
+
+def synthesize_stream(frame_count: int = 20_000, seed: int = 0) -> bytes:
+    rng = random.Random(seed)
+    stream = bytearray()
+    for _ in range(frame_count):
+        payload = bytes([0xFE, 0x01, 0x30]) + rng.randbytes(8)
+        # Escape DLE bytes the same way the reader does on the wire.
+        escaped = payload.replace(DLE, DLE + DLE)
+        stream += DLE + START + escaped + DLE + STOP + rng.randbytes(1)
+        if rng.random() < 0.05:
+            stream += rng.randbytes(rng.randint(1, 4)).replace(START, b"")
+    return bytes(stream)
+
+
+def run_bytewise(stream: bytes) -> list[Result]:
+    parser = _LID665v42FrameParser()
+    results: list[Result] = []
+    for i in range(len(stream)):
+        frame = parser.feed(stream[i : i + 1])
+        if frame is not None:
+            results.append(frame)
+    return results
+
+
+def run_bulk(stream: bytes, chunk_size: int = CHUNK_SIZE) -> list[Result]:
+    scanner = _LID665v42FrameScanner(_LID665v42FrameParser())
+    results: list[Result] = []
+    for offset in range(0, len(stream), chunk_size):
+        results.extend(scanner.feed(stream[offset : offset + chunk_size], 0.0))
+    return results
+
+
+def _measure(name: str, fn, stream: bytes) -> list[Result]:
+    best = float("inf")
+    results: list[Result] = []
+    for _ in range(REPEAT):
+        started = perf_counter()
+        results = fn(stream)
+        best = min(best, perf_counter() - started)
+
+    print(
+        f"{name:>9}: {len(results):>7} frames in {best * 1000:8.1f} ms "
+        f"({len(results) / best:>10.0f} frames/s, {len(stream) / best / 1e6:6.2f} MB/s)"
+    )
+    return results
+
+
+def main(path: Path | None = None) -> None:
+    stream = path.read_bytes() if path is not None else synthesize_stream()
+    source = str(path) if path is not None else "synthetic"
+    print(f"stream: {source}, {len(stream)} bytes, chunk size {CHUNK_SIZE}")
+
+    bytewise = _measure("bytewise", run_bytewise, stream)
+    bulk = _measure("bulk", run_bulk, stream)
+
+    if [r.animal_id for r in bytewise] != [r.animal_id for r in bulk]:
+        print("WARNING: parsers disagree on the decoded animal IDs")
+
+
+if __name__ == "__main__":
+    main(Path(sys.argv[1]) if len(sys.argv) > 1 else None)
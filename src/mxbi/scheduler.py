@@ -2,18 +2,19 @@ from enum import StrEnum
 from typing import TYPE_CHECKING
 
 from pydantic import BaseModel
-from datetime import datetime
 
 from mxbi.config import session_config
 from mxbi.data_logger import DataLogger, DataLoggerType
 from mxbi.detector.detector import Detector, DetectorEvent
 from mxbi.detector.detector_factory import DetectorFactory, DorsetLID665v42Config
+from mxbi.detector.event_bus import PUMP_INTERVAL_MS, DetectorEventBus
 from mxbi.models.animal import AnimalState
 from mxbi.models.scheduler import SchedulerState, ScheduleRunningStateEnum
 from mxbi.models.task import TaskEnum
-from mxbi.tasks.default.idle_task.idle_scene import IDLEScene
+from mxbi.peripheral.audio_player.controller.amixer_controller import AmixerController
 from mxbi.tasks.task_protocol import Task
 from mxbi.tasks.task_table import task_table
+from mxbi.utils import clock
 from mxbi.utils.logger import logger
 
 if TYPE_CHECKING:
@@ -22,6 +23,7 @@ if TYPE_CHECKING:
 
 
 class SchedulerEvent(StrEnum):
+    SESSION_START = "session_start"
     TASK_SWITCH = "task_switch"
     LEVEL_CHANGE = "level_change"
     STATE_CHANGE = "state_change"
@@ -29,6 +31,7 @@ class SchedulerEvent(StrEnum):
 
 class SchedulerHistoryRecord(BaseModel):
     event: str
+    time: float | None = None
     scheduler_state: str
     running: bool
     animal_name: str | None = None
@@ -46,9 +49,16 @@ class SchedulerHistoryRecord(BaseModel):
 
 
 class Scheduler:
-    def __init__(self, theater: "Theater") -> None:
+    def __init__(
+        self,
+        theater: "Theater",
+        *,
+        detector: Detector | None = None,
+        event_pump_interval_ms: int | None = PUMP_INTERVAL_MS,
+    ) -> None:
         self._theater = theater
-        self._detector: Detector = self._init_detector()
+        self._detector: Detector = detector or self._init_detector()
+        self._event_bus = DetectorEventBus(self._theater.root, event_pump_interval_ms)
 
         self._animal_states = {
             animal.name: AnimalState(
@@ -59,6 +69,13 @@ class Scheduler:
             )
             for animal in session_config.value.animals.values()
         }
+        task_table.preload(
+            [
+                TaskEnum.IDEL,
+                TaskEnum.ERROR,
+                *(state.task for state in self._animal_states.values()),
+            ]
+        )
 
         self._scheduler_state = SchedulerState(
             running=False,
@@ -66,6 +83,10 @@ class Scheduler:
             animal_state=None,
         )
         self._scheduler_state.current_task = None
+        # The task whose end has not been reported yet and the animal it runs
+        # for; the Tk loop runs one task at a time and moves on when it calls
+        # back.
+        self._running: tuple[Task, AnimalState | None] | None = None
 
         self._scheduler_logger = DataLogger(
             self._theater._session_state, "scheduler", "scheduler", DataLoggerType.JSONL
@@ -90,10 +111,25 @@ class Scheduler:
 
         return DetectorFactory.create(None, self._theater)
 
+    @property
+    def detector(self) -> Detector:
+        return self._detector
+
+    @property
+    def event_bus(self) -> DetectorEventBus:
+        return self._event_bus
+
     def start(self) -> None:
+        """Start the first task; each later one starts when the previous one ends."""
+        for animal_state in self._animal_states.values():
+            self._save_history_record(
+                self._build_history_record(SchedulerEvent.SESSION_START, animal_state)
+            )
+
+        self._event_bus.start()
         self._detector.start()
         self._scheduler_state.running = True
-        self._scheduler_loop()
+        self._run_next_task()
 
     def quit(self) -> None:
         for animal_state in self._animal_states.values():
@@ -104,6 +140,13 @@ class Scheduler:
 
         self._scheduler_state.running = False
         self._detector.quit()
+        self._event_bus.stop()
+        logger.info(
+            f"Detector event latency: {self._event_bus.summary()}, "
+            f"coalesced: {self._event_bus.coalesced}"
+        )
+        if isinstance(self._theater.acontroller, AmixerController):
+            logger.info(f"Mixer changes: {self._theater.acontroller.latency_stats}")
         if self._scheduler_state.current_task is not None:
             self._scheduler_state.current_task.quit()
 
@@ -112,22 +155,19 @@ class Scheduler:
         self._theater.root.bind("<n>", self._on_manual_next_task)
         self._theater.root.bind("<m>", self._on_manual_next_level)
 
-        self._detector.register_event(
-            DetectorEvent.ANIMAL_ENTERED, self._on_animal_entered
-        )
-        self._detector.register_event(
-            DetectorEvent.ANIMAL_RETUREND, self._on_animal_returned
-        )
-        self._detector.register_event(DetectorEvent.ANIMAL_LEFT, self._on_animal_left)
-        self._detector.register_event(
-            DetectorEvent.ANIMAL_CHANGED, self._on_animal_changed
-        )
-        self._detector.register_event(
-            DetectorEvent.ERROR_DETECTED, self._on_detect_error
-        )
-        self._detector.register_event(
-            DetectorEvent.ANIMAL_STAYED, self._on_animal_stayed
-        )
+        # Detector callbacks run on reader threads; only enqueue there and let
+        # the bus run the handlers on the Tk thread.
+        handlers = {
+            DetectorEvent.ANIMAL_ENTERED: self._on_animal_entered,
+            DetectorEvent.ANIMAL_RETUREND: self._on_animal_returned,
+            DetectorEvent.ANIMAL_LEFT: self._on_animal_left,
+            DetectorEvent.ANIMAL_CHANGED: self._on_animal_changed,
+            DetectorEvent.ERROR_DETECTED: self._on_detect_error,
+            DetectorEvent.ANIMAL_STAYED: self._on_animal_stayed,
+        }
+        for event, handler in handlers.items():
+            self._event_bus.subscribe(event, handler)
+            self._detector.register_event(event, self._event_bus.publisher(event))
 
     def _on_manual_next_task(self, _) -> None:
         if not self._scheduler_state.running:
@@ -162,7 +202,7 @@ class Scheduler:
                 self._scheduler_state.animal_state.name
             ].task = self._scheduler_state.animal_state.task
 
-            session_config.save()
+            session_config.save_later()
             self._log_task_switch(self._scheduler_state.animal_state, previous_task)
             if previous_level != self._scheduler_state.animal_state.level:
                 self._log_level_change(
@@ -204,25 +244,27 @@ class Scheduler:
             )
             return
 
-    def _scheduler_loop(self) -> None:
-        while self._scheduler_state.running:
-            match self._scheduler_state.state:
-                case ScheduleRunningStateEnum.IDLE:
-                    self._run_idle_state()
+    def _run_next_task(self) -> None:
+        """Start the task for the current state; it reports back to _on_task_done()."""
+        if not self._scheduler_state.running:
+            return
 
-                case ScheduleRunningStateEnum.SCHEDULE:
-                    self._run_schedule_state()
+        match self._scheduler_state.state:
+            case ScheduleRunningStateEnum.IDLE:
+                self._run_idle_state()
 
-                case ScheduleRunningStateEnum.ERROR:
-                    self._run_error_state()
+            case ScheduleRunningStateEnum.SCHEDULE:
+                self._run_schedule_state()
 
-                case _:
-                    logger.error(f"Unknown scheduler state: {self._state.state}")
-                    self._state.running = False
+            case ScheduleRunningStateEnum.ERROR:
+                self._run_error_state()
+
+            case _:
+                logger.error(f"Unknown scheduler state: {self._scheduler_state.state}")
+                self._scheduler_state.running = False
 
     def _run_idle_state(self) -> None:
         self._start_system_task(TaskEnum.IDEL)
-        self._scheduler_state.current_task = None
 
     def _run_schedule_state(self) -> None:
         animal_state = self._scheduler_state.animal_state
@@ -230,31 +272,54 @@ class Scheduler:
             self._transition_to_state(
                 ScheduleRunningStateEnum.IDLE, reason="no_animal_selected"
             )
+            self._run_next_task()
             return
 
         animal_state.current_animal_session_trial_id += 1
-
-        self._scheduler_state.current_task = self._create_task(animal_state)
-        feedback = self._scheduler_state.current_task.start()
-        logger.debug(
-            f"Task completed: {self._scheduler_state.current_task.__class__.__name__}, "
-            f"feedback: {feedback}"
-        )
-
-        self._handle_task_feedback(animal_state, feedback)
-        self._scheduler_state.current_task = None
+        self._start_task(self._create_task(animal_state), animal_state)
 
     def _run_error_state(self) -> None:
         self._start_system_task(TaskEnum.ERROR)
-        self._scheduler_state.current_task = None
 
     def _start_system_task(self, task_enum: TaskEnum) -> None:
-        self._scheduler_state.current_task = task_table[task_enum](
+        task = task_table[task_enum](
             self._theater,
             self._theater._session_state,
             AnimalState(),
         )
-        self._scheduler_state.current_task.start()
+        self._start_task(task, None)
+
+    def _start_task(self, task: Task, animal_state: AnimalState | None) -> None:
+        self._scheduler_state.current_task = task
+        self._running = (task, animal_state)
+        task.start(self._on_task_done)
+
+    def _on_task_done(self, feedback: "Feedback") -> None:
+        if self._running is None:
+            return
+        task, animal_state = self._running
+        self._running = None
+
+        # Tasks usually end from inside a detector handler or a quit() that is
+        # still switching state; carry on once that has returned, as the
+        # nested mainloop used to.
+        self._theater.root.after(
+            0, self._finish_task, task, animal_state, feedback
+        )
+
+    def _finish_task(
+        self, task: Task, animal_state: AnimalState | None, feedback: "Feedback"
+    ) -> None:
+        logger.debug(
+            f"Task completed: {task.__class__.__name__}, feedback: {feedback}"
+        )
+
+        if self._scheduler_state.current_task is task:
+            if animal_state is not None:
+                self._handle_task_feedback(animal_state, feedback)
+            self._scheduler_state.current_task = None
+
+        self._run_next_task()
 
     def _create_task(self, animal_state: AnimalState) -> Task:
         task = task_table[animal_state.task](
@@ -336,7 +401,7 @@ class Scheduler:
                 "Unable to find animal config during difficulty increase: %s",
                 state.name,
             )
-        session_config.save()
+        session_config.save_later()
         if state.task != previous_task:
             self._log_task_switch(state, previous_task)
         elif state.level != previous_level:
@@ -355,13 +420,13 @@ class Scheduler:
                     "Unable to find animal config during difficulty decrease: %s",
                     state.name,
                 )
-            session_config.save()
+            session_config.save_later()
             self._log_level_change(state, previous_level)
 
     def _on_animal_entered(self, animal_name: str) -> None:
         self._scheduler_state.animal_state = self._get_animal_state(animal_name)
 
-        self._scheduler_state.animal_state.animal_session_start_time = datetime.now().timestamp()
+        self._scheduler_state.animal_state.animal_session_start_time = clock.now()
 
         self._transition_to_state(
             ScheduleRunningStateEnum.SCHEDULE, reason="animal_entered"
@@ -372,7 +437,7 @@ class Scheduler:
 
     def _on_animal_returned(self, _: str) -> None:
         if self._scheduler_state.animal_state is not None:
-            self._scheduler_state.animal_state.animal_session_start_time = datetime.now().timestamp()
+            self._scheduler_state.animal_state.animal_session_start_time = clock.now()
 
         self._transition_to_state(
             ScheduleRunningStateEnum.SCHEDULE, reason="animal_returned"
@@ -391,7 +456,7 @@ class Scheduler:
 
     def _on_animal_changed(self, animal_name: str) -> None:
         self._scheduler_state.animal_state = self._get_animal_state(animal_name)
-        self._scheduler_state.animal_state.animal_session_start_time = datetime.now().timestamp()
+        self._scheduler_state.animal_state.animal_session_start_time = clock.now()
         self._transition_to_state(
             ScheduleRunningStateEnum.SCHEDULE, reason="animal_changed"
         )
@@ -412,7 +477,7 @@ class Scheduler:
         if self._scheduler_state.animal_state.task == TaskEnum.IDEL:
             return
 
-        if isinstance(self._scheduler_state.current_task, IDLEScene):
+        if isinstance(self._scheduler_state.current_task, task_table[TaskEnum.IDEL]):
             self._scheduler_state.current_task.quit()
 
     def _on_detect_error(self, _: str) -> None:
@@ -473,6 +538,7 @@ class Scheduler:
     ) -> SchedulerHistoryRecord:
         return SchedulerHistoryRecord(
             event=event.value,
+            time=clock.now(),
             scheduler_state=self._scheduler_state.state.name,
             running=self._scheduler_state.running,
             animal_name=animal_state.name if animal_state else None,
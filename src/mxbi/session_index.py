@@ -0,0 +1,378 @@
+import json
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from threading import Lock
+from typing import Any, Iterator
+
+from mxbi.utils.jsonl import read_jsonl
+from mxbi.utils.logger import logger
+
+SCHEMA_VERSION = 1
+BUSY_TIMEOUT_S = 5.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    date TEXT NOT NULL,
+    session_id INTEGER NOT NULL,
+    start_time REAL,
+    UNIQUE (date, session_id)
+);
+CREATE INDEX IF NOT EXISTS sessions_start_time ON sessions (start_time);
+
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    session INTEGER NOT NULL REFERENCES sessions (id),
+    animal TEXT NOT NULL,
+    name TEXT NOT NULL COLLATE NOCASE,
+    path TEXT NOT NULL UNIQUE
+);
+CREATE INDEX IF NOT EXISTS files_animal_name ON files (animal, name);
+CREATE INDEX IF NOT EXISTS files_name ON files (name);
+
+CREATE TABLE IF NOT EXISTS session_counters (
+    date TEXT PRIMARY KEY,
+    next_id INTEGER NOT NULL
+);
+"""
+
+
+@dataclass(frozen=True)
+class IndexedSession:
+    date: str
+    session_id: int
+    start_time: float | None
+    path: Path
+
+
+@dataclass(frozen=True)
+class IndexedFile:
+    date: str
+    session_id: int
+    start_time: float | None
+    animal: str
+    name: str
+    path: Path
+
+    def records(self) -> Iterator[dict[str, Any]]:
+        """The JSONL records in this file; a torn last line is skipped."""
+        return read_jsonl(self.path)
+
+
+class SessionIndex:
+    """
+    Sessions and the files their DataLoggers write, in an SQLite database.
+
+    The data tree stays the source of truth; the index only saves walking it.
+    Session IDs come from a per-date counter that is read and bumped in one
+    write transaction, so allocation is atomic across processes and costs a
+    primary key lookup. A date the index has never seen is seeded from its
+    directory once, so existing trees and a lost index need no migration.
+    Paths are stored relative to `root`, so the index survives moving the
+    tree together with its state directory. The state directory is not
+    synced; a backup copy has no index until rebuild() is run on it.
+
+    The database runs in WAL mode, so analysis can query it while a session
+    is writing. Failures are logged and never stop a session: allocation
+    falls back to scanning the date directory.
+    """
+
+    def __init__(self, root: Path, path: Path) -> None:
+        self._root = root
+        self._path = path
+        self._lock = Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._sessions: dict[tuple[str, int], int] = {}
+        self._files: set[Path] = set()
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def allocate_session_id(self, date: str) -> int:
+        """The next free session ID for `date` (YYYYMMDD), reserved for the caller."""
+        with self._lock:
+            try:
+                conn = self._connect()
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    row = conn.execute(
+                        "SELECT next_id FROM session_counters WHERE date = ?", (date,)
+                    ).fetchone()
+                    session_id = row[0] if row else self._seed(conn, date)
+                    # Someone wrote this directory without the index (an older
+                    # version, or an index restored from backup).
+                    while (self._root / date / str(session_id)).exists():
+                        session_id += 1
+                    conn.execute(
+                        "INSERT INTO session_counters (date, next_id) VALUES (?, ?) "
+                        "ON CONFLICT (date) DO UPDATE SET next_id = excluded.next_id",
+                        (date, session_id + 1),
+                    )
+                    conn.execute(
+                        "INSERT OR IGNORE INTO sessions (date, session_id) VALUES (?, ?)",
+                        (date, session_id),
+                    )
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+                conn.execute("COMMIT")
+                return session_id
+            except sqlite3.Error as e:
+                logger.error(f"Session index {self._path} unavailable: {e}")
+                return _scan_next_session_id(self._root / date)
+
+    def register_file(
+        self,
+        date: str,
+        session_id: int,
+        start_time: float | None,
+        animal: str,
+        name: str,
+        path: Path,
+    ) -> None:
+        """Record that `path` holds `name` data of `animal` in session `date`/`session_id`."""
+        with self._lock:
+            if path in self._files:
+                return
+            try:
+                conn = self._connect()
+                # The connection autocommits, so `with conn` would not make
+                # the session and file rows one transaction.
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    session = self._session_row(conn, date, session_id, start_time)
+                    conn.execute(
+                        "INSERT OR IGNORE INTO files (session, animal, name, path) "
+                        "VALUES (?, ?, ?, ?)",
+                        (session, animal, name, self._relative(path)),
+                    )
+                    conn.execute("COMMIT")
+                except BaseException:
+                    if conn.in_transaction:
+                        conn.execute("ROLLBACK")
+                    raise
+            except sqlite3.Error as e:
+                # Nothing is cached, so the next call for `path` retries.
+                logger.error(f"Failed to index {path}: {e}")
+                return
+            # Only what has been committed may be cached: a rolled back
+            # session row ID could be reused by a different session.
+            self._sessions[(date, session_id)] = session
+            self._files.add(path)
+
+    def sessions(
+        self,
+        *,
+        animal: str | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> list[IndexedSession]:
+        """Sessions started in [since, until), oldest first, optionally only those with `animal`."""
+        where, params = _time_filter(since, until)
+        if animal is not None:
+            where.append(
+                "EXISTS (SELECT 1 FROM files f WHERE f.session = s.id AND f.animal = ?)"
+            )
+            params.append(animal)
+        rows = self._query(
+            "SELECT s.date, s.session_id, s.start_time FROM sessions s"
+            + _where(where)
+            + " ORDER BY s.start_time, s.date, s.session_id",
+            params,
+        )
+        return [
+            IndexedSession(date, session_id, start_time, self._root / date / str(session_id))
+            for date, session_id, start_time in rows
+        ]
+
+    def files(
+        self,
+        *,
+        animal: str | None = None,
+        name: str | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> list[IndexedFile]:
+        """
+        Files of sessions started in [since, until), oldest first.
+
+        `name` is the DataLogger file name, i.e. a stage's STAGE_NAME,
+        "scheduler" or "session_data", matched case-insensitively. It is not
+        a TaskEnum value: HABITUATION, for one, logs as
+        DEFAULT_INITIAL_HABITUATION_TRAINING_STAGE.
+        """
+        where, params = _time_filter(since, until)
+        if animal is not None:
+            where.append("f.animal = ?")
+            params.append(animal)
+        if name is not None:
+            where.append("f.name = ?")
+            params.append(str(name))
+        rows = self._query(
+            "SELECT s.date, s.session_id, s.start_time, f.animal, f.name, f.path "
+            "FROM files f JOIN sessions s ON s.id = f.session"
+            + _where(where)
+            + " ORDER BY s.start_time, s.date, s.session_id, f.id",
+            params,
+        )
+        return [
+            IndexedFile(date, session_id, start_time, animal, name, self._root / path)
+            for date, session_id, start_time, animal, name, path in rows
+        ]
+
+    def rebuild(self) -> int:
+        """Index every session directory under root; returns how many were found."""
+        found = 0
+        for date_dir in sorted(self._root.iterdir()):
+            if not (date_dir.is_dir() and date_dir.name.isdigit()):
+                continue
+            for session_dir in sorted(date_dir.iterdir()):
+                if not (session_dir.is_dir() and session_dir.name.isdigit()):
+                    continue
+                self._index_session_dir(date_dir.name, int(session_dir.name), session_dir)
+                found += 1
+
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT INTO session_counters (date, next_id) "
+                    "SELECT date, MAX(session_id) + 1 FROM sessions WHERE true GROUP BY date "
+                    "ON CONFLICT (date) DO UPDATE "
+                    "SET next_id = MAX(next_id, excluded.next_id)"
+                )
+        return found
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is None:
+                return
+            try:
+                # Fold the WAL back in so the database is a single file again.
+                self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                self._conn.close()
+            except sqlite3.Error as e:
+                logger.error(f"Failed to close session index {self._path}: {e}")
+            self._conn = None
+            self._sessions.clear()
+            self._files.clear()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is not None:
+            return self._conn
+
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(
+            self._path,
+            timeout=BUSY_TIMEOUT_S,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        try:
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+                conn.executescript(_SCHEMA)
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        except sqlite3.Error:
+            conn.close()
+            raise
+        self._conn = conn
+        return conn
+
+    def _seed(self, conn: sqlite3.Connection, date: str) -> int:
+        (indexed,) = conn.execute(
+            "SELECT MAX(session_id) FROM sessions WHERE date = ?", (date,)
+        ).fetchone()
+        scanned = _scan_next_session_id(self._root / date)
+        return max(scanned, 0 if indexed is None else indexed + 1)
+
+    def _session_row(
+        self,
+        conn: sqlite3.Connection,
+        date: str,
+        session_id: int,
+        start_time: float | None,
+    ) -> int:
+        key = (date, session_id)
+        row_id = self._sessions.get(key)
+        if row_id is not None:
+            return row_id
+
+        (row_id,) = conn.execute(
+            "INSERT INTO sessions (date, session_id, start_time) VALUES (?, ?, ?) "
+            "ON CONFLICT (date, session_id) DO UPDATE "
+            "SET start_time = coalesce(start_time, excluded.start_time) "
+            "RETURNING id",
+            (date, session_id, start_time),
+        ).fetchone()
+        return row_id
+
+    def _index_session_dir(self, date: str, session_id: int, session_dir: Path) -> None:
+        start_time: float | None = None
+        try:
+            state = json.loads((session_dir / "session_data.json").read_text("utf-8"))
+            start_time = float(state["start_time"])
+        except (OSError, ValueError, KeyError, TypeError):
+            logger.warning(f"No readable session_data.json in {session_dir}")
+
+        for path in sorted(session_dir.iterdir()):
+            if path.is_file():
+                self.register_file(date, session_id, start_time, "", path.stem, path)
+            elif path.is_dir():
+                for child in sorted(path.iterdir()):
+                    if child.is_file():
+                        self.register_file(
+                            date, session_id, start_time, path.name, child.stem, child
+                        )
+
+    def _relative(self, path: Path) -> str:
+        try:
+            return path.relative_to(self._root).as_posix()
+        except ValueError:
+            return str(path)
+
+    def _query(self, sql: str, params: list[Any]) -> list[tuple]:
+        with self._lock:
+            return self._connect().execute(sql, params).fetchall()
+
+
+def _scan_next_session_id(date_dir: Path) -> int:
+    if not date_dir.exists():
+        return 0
+
+    latest_session_id = max(
+        (
+            int(child.name)
+            for child in date_dir.iterdir()
+            if child.is_dir() and child.name.isdigit()
+        ),
+        default=-1,
+    )
+
+    return latest_session_id + 1
+
+
+def _time_filter(
+    since: datetime | None, until: datetime | None
+) -> tuple[list[str], list[Any]]:
+    where: list[str] = []
+    params: list[Any] = []
+    if since is not None:
+        where.append("s.start_time >= ?")
+        params.append(since.timestamp())
+    if until is not None:
+        where.append("s.start_time < ?")
+        params.append(until.timestamp())
+    return where, params
+
+
+def _where(clauses: list[str]) -> str:
+    return " WHERE " + " AND ".join(clauses) if clauses else ""
@@ -1,3 +1,4 @@
+from functools import cache
 from pathlib import Path
 
 from pydantic import BaseModel, ConfigDict, RootModel
@@ -56,11 +57,10 @@ class DetectStageConfigs(RootModel):
     root: dict[MonkeyName, DetectStageConfig]
 
 
+@cache
 def load_config() -> DetectStageConfigs:
     configs = Configure(CONFIG_PATH, DetectStageConfigs).value
     for config in configs.root.values():
         config.condition.level_count = len(config.levels_table)
     return configs
 
-
-config = load_config()
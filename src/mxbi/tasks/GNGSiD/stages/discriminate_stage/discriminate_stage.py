@@ -6,9 +6,12 @@ from mxbi.models.animal import ScheduleCondition
 from mxbi.tasks.GNGSiD.models import PersistentData, Result
 from mxbi.tasks.GNGSiD.stages.discriminate_stage.discriminate_stage_models import (
     DiscriminateStageConfig,
-    config,
+    load_config,
+)
+from mxbi.tasks.GNGSiD.tasks.discriminate.discriminate_models import (
+    TrialConfig,
+    TrialData,
 )
-from mxbi.tasks.GNGSiD.tasks.discriminate.discriminate_models import TrialConfig
 from mxbi.tasks.GNGSiD.tasks.discriminate.discriminate_scene import (
     GNGSiDDiscriminateScene,
 )
@@ -18,6 +21,7 @@ if TYPE_CHECKING:
     from mxbi.models.animal import AnimalState
     from mxbi.models.session import SessionState
     from mxbi.models.task import Feedback
+    from mxbi.tasks.task_protocol import TaskDone
     from mxbi.theater import Theater
 
 _presistent_data: dict[str, PersistentData] = {}
@@ -114,8 +118,11 @@ class GNGSiDDiscriminateStage:
             DataLoggerType.JSONL,
         )
 
-    def start(self) -> "Feedback":
-        trial_data = self._task.start()
+    def start(self, on_done: "TaskDone") -> None:
+        self._on_done = on_done
+        self._task.start(self._on_trial_end)
+
+    def _on_trial_end(self, trial_data: TrialData) -> None:
         self._data_logger.save(trial_data.model_dump())
 
         feedback = self._handle_result(trial_data.result)
@@ -129,10 +136,11 @@ class GNGSiDDiscriminateStage:
             f"feedback={feedback}"
         )
 
-        return feedback
+        self._on_done(feedback)
 
     def _load_stage_config(self, monkey: str) -> DiscriminateStageConfig:
-        stage_config = config.root.get(monkey) or config.root.get("default")
+        configs = load_config()
+        stage_config = configs.root.get(monkey) or configs.root.get("default")
         if stage_config is None:
             raise ValueError("No default stage config found")
         return stage_config
@@ -1,3 +1,4 @@
+from functools import cache
 from pathlib import Path
 from typing import Dict, List
 
@@ -71,11 +72,10 @@ class DiscriminateStageConfigs(RootModel):
     root: Dict[MonkeyName, DiscriminateStageConfig]
 
 
+@cache
 def load_config() -> DiscriminateStageConfigs:
     configs = Configure(CONFIG_PATH, DiscriminateStageConfigs).value
     for config in configs.root.values():
         config.condition.level_count = len(config.levels_table)
     return configs
 
-
-config = load_config()
@@ -6,9 +6,9 @@ from mxbi.models.animal import ScheduleCondition
 from mxbi.tasks.GNGSiD.models import PersistentData, Result
 from mxbi.tasks.GNGSiD.stages.size_reduction_stage.size_reduction_models import (
     SizeReductionStageConfig,
-    config,
+    load_config,
 )
-from mxbi.tasks.GNGSiD.tasks.touch.touch_models import TrialConfig
+from mxbi.tasks.GNGSiD.tasks.touch.touch_models import TrialConfig, TrialData
 from mxbi.tasks.GNGSiD.tasks.touch.touch_scene import GNGSiDTouchScene
 from mxbi.utils.logger import logger
 
@@ -16,6 +16,7 @@ if TYPE_CHECKING:
     from mxbi.models.animal import AnimalState
     from mxbi.models.session import SessionState
     from mxbi.models.task import Feedback
+    from mxbi.tasks.task_protocol import TaskDone
     from mxbi.theater import Theater
 
 
@@ -86,8 +87,11 @@ class SizeReductionStage:
             self._presistent_data,
         )
 
-    def start(self) -> "Feedback":
-        trial_data = self._task.start()
+    def start(self, on_done: "TaskDone") -> None:
+        self._on_done = on_done
+        self._task.start(self._on_trial_end)
+
+    def _on_trial_end(self, trial_data: TrialData) -> None:
         self._data_logger.save(trial_data.model_dump())
 
         feedback = self._handle_result(trial_data.result)
@@ -101,10 +105,11 @@ class SizeReductionStage:
             f"feedback={feedback}"
         )
 
-        return feedback
+        self._on_done(feedback)
 
     def _load_stage_config(self, monkey: str) -> SizeReductionStageConfig:
-        stage_config = config.root.get(monkey) or config.root.get("default")
+        configs = load_config()
+        stage_config = configs.root.get(monkey) or configs.root.get("default")
         if stage_config is None:
             raise ValueError("No default stage config found")
         return stage_config
@@ -1,14 +1,13 @@
-from datetime import datetime
+from collections.abc import Callable
 from math import ceil
-from tkinter import CENTER, Canvas, Event
+from tkinter import Event
 from typing import TYPE_CHECKING, Final
 
 from mxbi.tasks.GNGSiD.models import Result, TouchEvent
 from mxbi.tasks.GNGSiD.tasks.detect.models import DataToShow, TrialConfig, TrialData
-from mxbi.tasks.GNGSiD.tasks.utils.targets import DetectTarget
+from mxbi.tasks.GNGSiD.tasks.utils.targets import detect_target
+from mxbi.utils import clock
 from mxbi.utils.aplayer import ToneConfig
-from mxbi.utils.tkinter.components.canvas_with_border import CanvasWithInnerBorder
-from mxbi.utils.tkinter.components.showdata_widget import ShowDataWidget
 
 if TYPE_CHECKING:
     from concurrent.futures import Future
@@ -45,14 +44,16 @@ class GNGSiDDetectScene:
 
         self._set_stimulus_intensity()
 
-        self._on_trial_start()
+        self._on_end: Callable[[TrialData], None] | None = None
 
     # region public api
-    def start(self) -> TrialData:
-        self._theater.mainloop()
-        return self._data
+    def start(self, on_end: Callable[[TrialData], None]) -> None:
+        self._on_end = on_end
+        self._on_trial_start()
 
     def cancle(self) -> None:
+        if self._on_end is None:
+            return
         self._data.result = Result.CANCEL
         self._theater.aplayer.stop()
         self._on_trial_end()
@@ -71,8 +72,17 @@ class GNGSiDDetectScene:
         )
 
     def _on_trial_end(self) -> None:
-        self._background.destroy()
-        self._theater.root.quit()
+        if self._on_end is None:
+            return
+        on_end, self._on_end = self._on_end, None
+
+        onset = self._theater.aplayer.last_onset
+        # An onset from before the trial belongs to an earlier trial's stimulus
+        if onset is not None and onset >= self._data.trial_start_time:
+            self._data.audio_onset_time = onset
+
+        self._theater.scene_layer.release(self)
+        on_end(self._data)
 
     # endregion
 
@@ -83,18 +93,10 @@ class GNGSiDDetectScene:
         self._create_target()
 
     def _create_background(self) -> None:
-        self._background = CanvasWithInnerBorder(
-            master=self._theater.root,
-            bg="black",
-            width=self._screen_type.width,
-            height=self._screen_type.height,
-            border_width=40,
-        )
-        self._background.place(relx=0.5, rely=0.5, anchor="center")
+        self._background = self._theater.scene_layer.acquire(self)
 
     def _create_show_data_view(self) -> None:
-        self._show_data_widget = ShowDataWidget(self._background)
-        self._show_data_widget.place(relx=0, rely=1, anchor="sw")
+        self._show_data_widget = self._theater.scene_layer.overlay
         data = DataToShow(
             name=self._animal_state.name,
             id=self._animal_state.trial_id,
@@ -113,19 +115,15 @@ class GNGSiDDetectScene:
         xcenter = self._screen_type.width * 0.5 + xshift
         ycenter = self._screen_type.height * 0.5
 
-        self._trigger_canvas = DetectTarget(
-            self._background, self._trial_config.stimulation_size
+        size = self._trial_config.stimulation_size
+        self._target_origin = (round(xcenter - size / 2), round(ycenter - size / 2))
+        self._theater.scene_layer.image(
+            "target", detect_target(self._background, size), xcenter, ycenter
         )
-        self._trigger_canvas.place(x=xcenter, y=ycenter, anchor="center")
 
     def _create_wrong_view(self) -> None:
-        self._trigger_canvas = Canvas(
-            self._background,
-            bg="grey",
-            width=self._screen_type.width,
-            height=self._screen_type.height,
-        )
-        self._trigger_canvas.place(relx=0.5, rely=0.5, anchor=CENTER)
+        self._theater.scene_layer.remove("target")
+        self._theater.scene_layer.rectangle("wrong", "grey")
 
     # endregion
 
@@ -133,23 +131,29 @@ class GNGSiDDetectScene:
     def _bind_first_stage(self) -> None:
         self._background.focus_set()
         self._background.bind("<r>", lambda e: self._give_standard_stimulus())
-        self._trigger_canvas.bind("<ButtonPress>", self._on_first_touched)
-        self._trigger_canvas.after(self._trial_config.time_out, self._on_timeout)
+        self._theater.scene_layer.bind_item(
+            "target", "<ButtonPress>", self._on_first_touched
+        )
+        self._theater.scene_layer.after(
+            "target", self._trial_config.time_out, self._on_timeout
+        )
 
     def _bind_second_stage(self) -> None:
-        self._trigger_canvas.bind("<ButtonPress>", self._on_second_touched)
+        self._theater.scene_layer.bind_item(
+            "target", "<ButtonPress>", self._on_second_touched
+        )
 
         # TODO: Confirm the waiting time
         if not self._trial_config.go:
-            self._trigger_canvas.after(
-                self._trial_config.stimulus_duration, self._on_incorrect
+            self._theater.scene_layer.after(
+                "target", self._trial_config.stimulus_duration, self._on_incorrect
             )
 
     # endregion
 
     # region event handlers
     def _on_first_touched(self, event: Event) -> None:
-        self._trigger_canvas.destroy()
+        self._theater.scene_layer.remove("target")
         self._record_touch(event)
 
         if self._trial_config.go:
@@ -162,7 +166,7 @@ class GNGSiDDetectScene:
         )
 
     def _on_second_touched(self, event: Event) -> None:
-        self._trigger_canvas.destroy()
+        self._theater.scene_layer.remove("target")
         self._record_touch(event)
 
         if self._trial_config.go:
@@ -174,15 +178,17 @@ class GNGSiDDetectScene:
         self._background.after(2000, self._create_target)
 
     def _record_touch(self, event: Event) -> None:
+        # Touches are kept relative to the target, as its own canvas reported them
+        x, y = self._target_origin
         self._data.touch_events.append(
-            TouchEvent(time=datetime.now().timestamp(), x=event.x, y=event.y)
+            TouchEvent(time=clock.now(), x=event.x - x, y=event.y - y)
         )
 
     # endregion
 
     # region result handlers
     def _on_correct(self) -> None:
-        self._trigger_canvas.destroy()
+        self._theater.scene_layer.remove("target")
 
         self._give_reward()
         self._data.result = Result.CORRECT
@@ -193,7 +199,7 @@ class GNGSiDDetectScene:
 
     def _on_incorrect(self) -> None:
         self._theater._aplayer.stop()
-        self._trigger_canvas.destroy()
+        self._theater.scene_layer.remove("target")
 
         self._data.result = Result.INCORRECT
         self._data.correct_rate = self._animal_state.correct_trial / (
@@ -262,7 +268,7 @@ class GNGSiDDetectScene:
             trial_id=self._animal_state.trial_id,
             current_level_trial_id=self._animal_state.current_level_trial_id,
             trial_config=self._trial_config,
-            trial_start_time=datetime.now().timestamp(),
+            trial_start_time=clock.now(),
             trial_end_time=0,
             result=Result.TIMEOUT,
             correct_rate=0,
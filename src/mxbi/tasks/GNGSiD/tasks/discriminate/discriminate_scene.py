@@ -1,6 +1,6 @@
+from collections.abc import Callable
 from concurrent.futures import Future
-from datetime import datetime
-from tkinter import CENTER, Canvas, Event
+from tkinter import Event
 from typing import TYPE_CHECKING, Final
 
 from mxbi.tasks.GNGSiD.models import Result, TouchEvent
@@ -9,10 +9,9 @@ from mxbi.tasks.GNGSiD.tasks.discriminate.discriminate_models import (
     TrialConfig,
     TrialData,
 )
-from mxbi.tasks.GNGSiD.tasks.utils.targets import DiscriminateTarget
-from mxbi.utils.aplayer import StimulusSequenceUnit
-from mxbi.utils.tkinter.components.canvas_with_border import CanvasWithInnerBorder
-from mxbi.utils.tkinter.components.showdata_widget import ShowDataWidget
+from mxbi.tasks.GNGSiD.tasks.utils.targets import discriminate_target
+from mxbi.utils import clock
+from mxbi.utils.aplayer import CompiledStimulus, StimulusSequenceUnit
 
 if TYPE_CHECKING:
     from mxbi.models.animal import AnimalState
@@ -84,14 +83,16 @@ class GNGSiDDiscriminateScene:
             self._trial_config.stimulus_duration
         )
 
-        self._on_trial_start()
+        self._on_end: Callable[[TrialData], None] | None = None
 
     # region public api
-    def start(self) -> TrialData:
-        self._theater.mainloop()
-        return self._data
+    def start(self, on_end: Callable[[TrialData], None]) -> None:
+        self._on_end = on_end
+        self._on_trial_start()
 
     def cancle(self) -> None:
+        if self._on_end is None:
+            return
         self._data.result = Result.CANCEL
         self._theater.aplayer.stop()
         self._on_trial_end()
@@ -110,8 +111,17 @@ class GNGSiDDiscriminateScene:
         )
 
     def _on_trial_end(self) -> None:
-        self._background.destroy()
-        self._theater.root.quit()
+        if self._on_end is None:
+            return
+        on_end, self._on_end = self._on_end, None
+
+        onset = self._theater.aplayer.last_onset
+        # An onset from before the trial belongs to an earlier trial's stimulus
+        if onset is not None and onset >= self._data.trial_start_time:
+            self._data.audio_onset_time = onset
+
+        self._theater.scene_layer.release(self)
+        on_end(self._data)
 
     # endregion
 
@@ -122,19 +132,10 @@ class GNGSiDDiscriminateScene:
         self._create_target()
 
     def _create_background(self) -> None:
-        self._background = CanvasWithInnerBorder(
-            master=self._theater.root,
-            bg="black",
-            width=self._screen_type.width,
-            height=self._screen_type.height,
-            border_width=40,
-        )
-
-        self._background.place(relx=0.5, rely=0.5, anchor="center")
+        self._background = self._theater.scene_layer.acquire(self)
 
     def _create_show_data_view(self) -> None:
-        self._show_data_widget = ShowDataWidget(self._background)
-        self._show_data_widget.place(relx=0, rely=1, anchor="sw")
+        self._show_data_widget = self._theater.scene_layer.overlay
         data = DataToShow(
             name=self._animal_state.name,
             id=self._animal_state.trial_id,
@@ -153,19 +154,15 @@ class GNGSiDDiscriminateScene:
         x_center = self._screen_type.width * 0.5 + x_shift
         y_center = self._screen_type.height * 0.5
 
-        self._trigger_canvas = DiscriminateTarget(
-            self._background, self._trial_config.stimulation_size
+        size = self._trial_config.stimulation_size
+        self._target_origin = (round(x_center - size / 2), round(y_center - size / 2))
+        self._theater.scene_layer.image(
+            "target", discriminate_target(self._background, size), x_center, y_center
         )
-        self._trigger_canvas.place(x=x_center, y=y_center, anchor="center")
 
     def _create_wrong_view(self) -> None:
-        self._trigger_canvas = Canvas(
-            self._background,
-            bg="grey",
-            width=self._screen_type.width,
-            height=self._screen_type.height,
-        )
-        self._trigger_canvas.place(relx=0.5, rely=0.5, anchor=CENTER)
+        self._theater.scene_layer.remove("target")
+        self._theater.scene_layer.rectangle("wrong", "grey")
 
     # endregion
 
@@ -173,25 +170,33 @@ class GNGSiDDiscriminateScene:
     def _bind_first_stage(self) -> None:
         self._background.focus_set()
         self._background.bind("<r>", lambda e: self._give_standard_stimulus())
-        self._trigger_canvas.bind("<ButtonPress>", self._on_first_touched)
-        self._trigger_canvas.after(self._trial_config.time_out, self._on_timeout)
+        self._theater.scene_layer.bind_item(
+            "target", "<ButtonPress>", self._on_first_touched
+        )
+        self._theater.scene_layer.after(
+            "target", self._trial_config.time_out, self._on_timeout
+        )
 
     def _bind_second_stage(self) -> None:
         self._reward_duration = self._trial_config.reward_duration
-        self._trigger_canvas.bind("<ButtonPress>", self._on_second_touched)
+        self._theater.scene_layer.bind_item(
+            "target", "<ButtonPress>", self._on_second_touched
+        )
         if self._trial_config.is_stimulus_trial:
-            self._trigger_canvas.after(self._response_duration, self._on_incorrect)
+            self._theater.scene_layer.after(
+                "target", self._response_duration, self._on_incorrect
+            )
             self._schedule_reward_adjustments()
         else:
-            self._trigger_canvas.after(
-                self._trial_config.stimulus_duration, self._on_correct
+            self._theater.scene_layer.after(
+                "target", self._trial_config.stimulus_duration, self._on_correct
             )
 
     # endregion
 
     # region event handlers
     def _on_first_touched(self, event: Event) -> None:
-        self._trigger_canvas.destroy()
+        self._theater.scene_layer.remove("target")
         self._record_touch(event)
         future = self._give_stimulus(self._attention_stimulus)
         future.add_done_callback(self._start_stimulus_stage)
@@ -207,7 +212,7 @@ class GNGSiDDiscriminateScene:
         self._bind_second_stage()
 
     def _on_second_touched(self, event: Event) -> None:
-        self._trigger_canvas.destroy()
+        self._theater.scene_layer.remove("target")
         self._record_touch(event)
 
         if self._trial_config.is_stimulus_trial:
@@ -216,8 +221,10 @@ class GNGSiDDiscriminateScene:
             self._on_incorrect()
 
     def _record_touch(self, event: Event) -> None:
+        # Touches are kept relative to the target, as its own canvas reported them
+        x, y = self._target_origin
         self._data.touch_events.append(
-            TouchEvent(time=datetime.now().timestamp(), x=event.x, y=event.y)
+            TouchEvent(time=clock.now(), x=event.x - x, y=event.y - y)
         )
 
     # endregion
@@ -225,7 +232,7 @@ class GNGSiDDiscriminateScene:
     # region result handlers
     def _on_correct(self) -> None:
         self._theater.aplayer.stop()
-        self._trigger_canvas.destroy()
+        self._theater.scene_layer.remove("target")
 
         self._background.after(self._trial_config.reward_delay, self._give_reward)
         self._data.result = Result.CORRECT
@@ -236,7 +243,7 @@ class GNGSiDDiscriminateScene:
 
     def _on_incorrect(self) -> None:
         self._theater.aplayer.stop()
-        self._trigger_canvas.destroy()
+        self._theater.scene_layer.remove("target")
 
         self._data.result = Result.INCORRECT
         self._data.correct_rate = self._animal_state.correct_trial / (
@@ -285,15 +292,13 @@ class GNGSiDDiscriminateScene:
 
     def _prepare_stimulus(
         self, stimulus_units: list[StimulusSequenceUnit], total_duration: int
-    ) -> list[StimulusSequenceUnit]:
-        return self._theater.aplayer.generate_stimulus_sequence(
+    ) -> CompiledStimulus:
+        return self._theater.aplayer.compile_stimulus_sequence(
             stimulus_units, total_duration
         )
 
-    def _give_stimulus(
-        self, stimulus_units: list[StimulusSequenceUnit]
-    ) -> "Future[bool]":
-        return self._theater.aplayer.play_stimulus_sequence(stimulus_units)
+    def _give_stimulus(self, stimulus: CompiledStimulus) -> "Future[bool]":
+        return self._theater.aplayer.play_compiled_stimulus(stimulus)
 
     def _give_reward(self) -> None:
         self._persistent_data.rewards += 1
@@ -326,7 +331,7 @@ class GNGSiDDiscriminateScene:
             trial_id=self._animal_state.trial_id,
             current_level_trial_id=self._animal_state.current_level_trial_id,
             trial_config=self._trial_config,
-            trial_start_time=datetime.now().timestamp(),
+            trial_start_time=clock.now(),
             trial_end_time=0,
             result=Result.TIMEOUT,
             correct_rate=0,
@@ -1,14 +1,13 @@
-from datetime import datetime
+from collections.abc import Callable
 from math import ceil
-from tkinter import CENTER, Canvas, Event
+from tkinter import Event
 from typing import TYPE_CHECKING, Final
 
 from mxbi.tasks.GNGSiD.models import Result, TouchEvent
 from mxbi.tasks.GNGSiD.tasks.touch.touch_models import DataToShow, TrialData
-from mxbi.tasks.GNGSiD.tasks.utils.targets import DetectTarget
+from mxbi.tasks.GNGSiD.tasks.utils.targets import detect_target
+from mxbi.utils import clock
 from mxbi.utils.aplayer import ToneConfig
-from mxbi.utils.tkinter.components.canvas_with_border import CanvasWithInnerBorder
-from mxbi.utils.tkinter.components.showdata_widget import ShowDataWidget
 
 if TYPE_CHECKING:
     from concurrent.futures import Future
@@ -46,15 +45,16 @@ class GNGSiDTouchScene:
 
         self._set_stimulus_intensity()
 
-        self._on_trial_start()
+        self._on_end: Callable[[TrialData], None] | None = None
 
     # region public api
-    def start(self) -> TrialData:
-        self._theater.mainloop()
-
-        return self._data
+    def start(self, on_end: Callable[[TrialData], None]) -> None:
+        self._on_end = on_end
+        self._on_trial_start()
 
     def cancle(self) -> None:
+        if self._on_end is None:
+            return
         self._data.result = Result.CANCEL
         self._theater.aplayer.stop()
         self._on_trial_end()
@@ -73,8 +73,17 @@ class GNGSiDTouchScene:
         )
 
     def _on_trial_end(self) -> None:
-        self._background.destroy()
-        self._theater.root.quit()
+        if self._on_end is None:
+            return
+        on_end, self._on_end = self._on_end, None
+
+        onset = self._theater.aplayer.last_onset
+        # An onset from before the trial belongs to an earlier trial's stimulus
+        if onset is not None and onset >= self._data.trial_start_time:
+            self._data.audio_onset_time = onset
+
+        self._theater.scene_layer.release(self)
+        on_end(self._data)
 
     # endregion
 
@@ -85,19 +94,10 @@ class GNGSiDTouchScene:
         self._create_target()
 
     def _create_background(self) -> None:
-        self._background = CanvasWithInnerBorder(
-            master=self._theater.root,
-            bg="black",
-            width=self._screen_type.width,
-            height=self._screen_type.height,
-            border_width=40,
-        )
-
-        self._background.place(relx=0.5, rely=0.5, anchor="center")
+        self._background = self._theater.scene_layer.acquire(self)
 
     def _create_show_data_widget(self) -> None:
-        self._show_data_widget = ShowDataWidget(self._background)
-        self._show_data_widget.place(relx=0, rely=1, anchor="sw")
+        self._show_data_widget = self._theater.scene_layer.overlay
         data = DataToShow(
             name=self._animal_state.name,
             id=self._animal_state.trial_id,
@@ -115,19 +115,15 @@ class GNGSiDTouchScene:
         xcenter = self._screen_type.width * 0.5 + xshift
         ycenter = self._screen_type.height * 0.5
 
-        self._trigger_canvas = DetectTarget(
-            self._background, self._trial_config.stimulation_size
+        size = self._trial_config.stimulation_size
+        self._target_origin = (round(xcenter - size / 2), round(ycenter - size / 2))
+        self._theater.scene_layer.image(
+            "target", detect_target(self._background, size), xcenter, ycenter
         )
-        self._trigger_canvas.place(x=xcenter, y=ycenter, anchor="center")
 
     def _create_wrong_view(self) -> None:
-        self._trigger_canvas = Canvas(
-            self._background,
-            bg="grey",
-            width=self._screen_type.width,
-            height=self._screen_type.height,
-        )
-        self._trigger_canvas.place(relx=0.5, rely=0.5, anchor=CENTER)
+        self._theater.scene_layer.remove("target")
+        self._theater.scene_layer.rectangle("wrong", "grey")
 
     # endregion
 
@@ -139,30 +135,35 @@ class GNGSiDTouchScene:
 
         # Trigger event
         self._background.bind("<ButtonPress>", self._on_background_touched)
-        self._trigger_canvas.bind("<ButtonPress>", self._on_touched)
+        self._theater.scene_layer.bind_item("target", "<ButtonPress>", self._on_touched)
 
         # Timeout event
-        self._trigger_canvas.after(self._trial_config.time_out, self._on_timeout)
+        self._theater.scene_layer.after(
+            "target", self._trial_config.time_out, self._on_timeout
+        )
 
     # endregion
 
     # region event handlers
     def _on_touched(self, event: Event) -> None:
+        # Tk runs the item's bindings before the canvas's own, so dropping the
+        # background binding here keeps this touch from also counting as wrong
+        self._theater.scene_layer.unbind("<ButtonPress>")
+        x, y = self._target_origin
         self._data.touch_events.append(
-            TouchEvent(time=datetime.now().timestamp(), x=event.x, y=event.y)
+            TouchEvent(time=clock.now(), x=event.x - x, y=event.y - y)
         )
-        self._background.unbind("<ButtonPress>")
-        self._trigger_canvas.destroy()
+        self._theater.scene_layer.remove("target")
 
         future = self._give_stimulus()
         future.add_done_callback(self._on_stimulus_complete)
 
     def _on_background_touched(self, event: Event) -> None:
         self._data.touch_events.append(
-            TouchEvent(time=datetime.now().timestamp(), x=event.x, y=event.y)
+            TouchEvent(time=clock.now(), x=event.x, y=event.y)
         )
-        self._background.unbind("<ButtonPress>")
-        self._trigger_canvas.destroy()
+        self._theater.scene_layer.unbind("<ButtonPress>")
+        self._theater.scene_layer.remove("target")
 
         self._on_incorrect()
 
@@ -218,7 +219,7 @@ class GNGSiDTouchScene:
 
     def _on_stimulus_complete(self, future: "Future[bool]") -> None:
         if future.result():
-            self._trigger_canvas.after(
+            self._background.after(
                 self._trial_config.reward_delay,
                 lambda: (self._on_correct()),
             )
@@ -247,7 +248,7 @@ class GNGSiDTouchScene:
             trial_id=self._animal_state.trial_id,
             current_level_trial_id=self._animal_state.current_level_trial_id,
             trial_config=self._trial_config,
-            trial_start_time=datetime.now().timestamp(),
+            trial_start_time=clock.now(),
             trial_end_time=0,
             result=Result.TIMEOUT,
             correct_rate=0,
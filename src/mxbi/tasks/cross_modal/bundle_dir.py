@@ -1,10 +1,26 @@
 import json
+import os
+import stat
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from threading import Lock
 from typing import Any
 
 from pydantic import BaseModel, ConfigDict, Field, ValidationError
 
+from mxbi.tasks.cross_modal.bundle_index import INDEX_DIR_NAME, CompiledBundleIndex
 from mxbi.tasks.cross_modal.trial_schema import Trial
+from mxbi.utils.logger import logger
+
+BundleSignature = tuple[tuple[str, int, int], ...]
+
+VALIDATION_STAMP_NAME = ".mxbi_validated"
+VALIDATION_STAMP_VERSION = 1
+MEDIA_CHECK_WORKERS = 16
+
+_BUNDLE_CACHE: dict[Path, tuple[BundleSignature, "CrossModalBundleDir"]] = {}
+_BUNDLE_CACHE_LOCK = Lock()
 
 
 class BundleValidationError(RuntimeError):
@@ -70,7 +86,76 @@ class Manifest(BaseModel):
     identities: list[ManifestIdentity]
 
 
+class ValidationStamp:
+    """
+    Size and mtime of every media file that passed validation, kept in the
+    bundle root. A file whose stat still matches is trusted without resolving
+    it again.
+    """
+
+    def __init__(self, path: Path, files: dict[str, tuple[int, int]]) -> None:
+        self._path = path
+        self._files = files
+        self._lock = Lock()
+        self._dirty = False
+
+    @classmethod
+    def load(cls, root_dir: Path) -> "ValidationStamp":
+        path = root_dir / VALIDATION_STAMP_NAME
+        try:
+            raw = json.loads(path.read_text(encoding="utf-8"))
+            if raw.get("version") == VALIDATION_STAMP_VERSION:
+                files = {
+                    rel: (int(size), int(mtime_ns))
+                    for rel, (size, mtime_ns) in raw["files"].items()
+                }
+                return cls(path, files)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable validation stamp {path}: {e}")
+        return cls(path, {})
+
+    def matches(self, internal_path: str, st: os.stat_result) -> bool:
+        return self._files.get(internal_path) == (st.st_size, st.st_mtime_ns)
+
+    def record(self, internal_path: str, st: os.stat_result) -> None:
+        entry = (st.st_size, st.st_mtime_ns)
+        with self._lock:
+            if self._files.get(internal_path) != entry:
+                self._files[internal_path] = entry
+                self._dirty = True
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {
+                "version": VALIDATION_STAMP_VERSION,
+                "files": {rel: list(entry) for rel, entry in sorted(self._files.items())},
+            }
+            self._dirty = False
+
+        tmp_path = self._path.with_name(f"{self._path.name}.{os.getpid()}.tmp")
+        try:
+            tmp_path.write_text(json.dumps(data), encoding="utf-8")
+            os.replace(tmp_path, self._path)
+        except OSError as e:
+            logger.warning(f"Failed to write validation stamp {self._path}: {e}")
+
+
 class CrossModalBundleDir:
+    """
+    A validated cross-modal dataset bundle.
+
+    In lazy mode only the root documents, the file index and the manifest
+    media are checked up front; each subject's trials.json is parsed and its
+    media checked on first use, and the outcome (trials or errors) is kept.
+
+    Subjects covered by a current compiled index (see bundle_index) are read
+    from it instead of trials.json; only their media files are checked.
+    """
+
     def __init__(
         self,
         root_dir: Path,
@@ -79,7 +164,9 @@ class CrossModalBundleDir:
         manifest: Manifest,
         file_index: dict[str, Path],
         lower_to_actual: dict[str, str],
-        trials_by_subject: dict[str, list[Trial]],
+        trials_by_subject: dict[str, Sequence[Trial]],
+        stamp: ValidationStamp,
+        index: CompiledBundleIndex | None,
     ) -> None:
         self._root_dir = root_dir
         self._dataset_meta = dataset_meta
@@ -87,6 +174,10 @@ class CrossModalBundleDir:
         self._file_index = file_index
         self._lower_to_actual = lower_to_actual
         self._trials_by_subject = trials_by_subject
+        self._subject_errors: dict[str, list[str]] = {}
+        self._subjects_lock = Lock()
+        self._stamp = stamp
+        self._index = index
 
     @property
     def root_dir(self) -> Path:
@@ -104,7 +195,9 @@ class CrossModalBundleDir:
         return list(self._dataset_meta.subjects)
 
     @classmethod
-    def from_dir_path(cls, root_dir: Path) -> "CrossModalBundleDir":
+    def from_dir_path(
+        cls, root_dir: Path, *, lazy: bool = False, use_index: bool = True
+    ) -> "CrossModalBundleDir":
         root_dir = root_dir.expanduser().resolve()
         errors: list[str] = []
 
@@ -115,6 +208,8 @@ class CrossModalBundleDir:
 
         file_index, lower_to_actual, index_errors = cls._build_file_index(root_dir)
         errors.extend(index_errors)
+        stamp = ValidationStamp.load(root_dir)
+        index = CompiledBundleIndex.open(root_dir) if use_index else None
 
         dataset_meta = cls._read_json_model(
             root_dir,
@@ -167,15 +262,17 @@ class CrossModalBundleDir:
                 f"Expected: {expected_sorted} but found: {actual_subject_dirs}"
             )
 
-        trials_by_subject: dict[str, list[Trial]] = {}
-        for subject_id in expected_subjects:
-            subject_errors = cls._validate_subject(
+        trials_by_subject: dict[str, Sequence[Trial]] = {}
+        for subject_id in [] if lazy else expected_subjects:
+            subject_errors = cls._load_subject(
                 root_dir,
                 file_index=file_index,
                 lower_to_actual=lower_to_actual,
                 manifest=manifest,
                 subject_id=subject_id,
                 trials_by_subject=trials_by_subject,
+                stamp=stamp,
+                index=index,
             )
             errors.extend(subject_errors)
 
@@ -184,8 +281,10 @@ class CrossModalBundleDir:
             file_index=file_index,
             lower_to_actual=lower_to_actual,
             manifest=manifest,
+            stamp=stamp,
         )
         errors.extend(manifest_errors)
+        stamp.save()
 
         if errors:
             raise BundleValidationError(errors)
@@ -197,6 +296,8 @@ class CrossModalBundleDir:
             file_index=file_index,
             lower_to_actual=lower_to_actual,
             trials_by_subject=trials_by_subject,
+            stamp=stamp,
+            index=index,
         )
 
     def validate_selected_subjects(self, subject_ids: list[str]) -> None:
@@ -205,23 +306,43 @@ class CrossModalBundleDir:
             if subject_id not in self._dataset_meta.subjects:
                 errors.append(f"Selected subject '{subject_id}' is not listed in dataset_meta.json subjects.")
                 continue
-            subject_errors = self._validate_subject(
+            errors.extend(self._ensure_subject(subject_id))
+        if errors:
+            raise BundleValidationError(errors)
+
+    def load_trials(self, subject_id: str) -> Sequence[Trial]:
+        if subject_id in self._dataset_meta.subjects:
+            errors = self._ensure_subject(subject_id)
+            if errors:
+                raise BundleValidationError(errors)
+        try:
+            return self._trials_by_subject[subject_id]
+        except KeyError as e:
+            raise ValueError(f"No trial set loaded for subject '{subject_id}'.") from e
+
+    def _ensure_subject(self, subject_id: str) -> list[str]:
+        """Validate and parse one subject's trial set once; return its errors."""
+        with self._subjects_lock:
+            if subject_id in self._trials_by_subject:
+                return []
+            cached = self._subject_errors.get(subject_id)
+            if cached is not None:
+                return cached
+
+            errors = self._load_subject(
                 self._root_dir,
                 file_index=self._file_index,
                 lower_to_actual=self._lower_to_actual,
                 manifest=self._manifest,
                 subject_id=subject_id,
                 trials_by_subject=self._trials_by_subject,
+                stamp=self._stamp,
+                index=self._index,
             )
-            errors.extend(subject_errors)
-        if errors:
-            raise BundleValidationError(errors)
-
-    def load_trials(self, subject_id: str) -> list[Trial]:
-        try:
-            return list(self._trials_by_subject[subject_id])
-        except KeyError as e:
-            raise ValueError(f"No trial set loaded for subject '{subject_id}'.") from e
+            self._stamp.save()
+            if errors:
+                self._subject_errors[subject_id] = errors
+            return errors
 
     def resolve_media_path(self, internal_path: str) -> Path:
         assert_safe_internal_path(internal_path)
@@ -265,6 +386,9 @@ class CrossModalBundleDir:
                 errors.append(f"Invalid file with empty relative path: {p}")
                 continue
 
+            if rel.startswith((VALIDATION_STAMP_NAME, f"{INDEX_DIR_NAME}/")):
+                continue
+
             if "\\" in rel:
                 errors.append(f"Invalid bundle file path contains backslash: '{rel}'")
                 continue
@@ -336,8 +460,10 @@ class CrossModalBundleDir:
         file_index: dict[str, Path],
         lower_to_actual: dict[str, str],
         manifest: Manifest,
+        stamp: ValidationStamp,
     ) -> list[str]:
         errors: list[str] = []
+        media_refs: dict[str, list[str]] = {}
         for identity in manifest.identities:
             for exemplar in identity.image_exemplars:
                 errors.extend(
@@ -348,6 +474,7 @@ class CrossModalBundleDir:
                         internal_path=exemplar.relative_path,
                         context=f"manifest.json identity '{identity.id}' image exemplar index={exemplar.index}",
                         expected_prefix="media/images/",
+                        media_refs=media_refs,
                     )
                 )
             for exemplar in identity.audio_exemplars:
@@ -359,8 +486,95 @@ class CrossModalBundleDir:
                         internal_path=exemplar.relative_path,
                         context=f"manifest.json identity '{identity.id}' audio exemplar index={exemplar.index}",
                         expected_prefix="media/audio/",
+                        media_refs=media_refs,
+                    )
+                )
+        errors.extend(
+            cls._check_media_files(
+                root_dir, file_index=file_index, media_refs=media_refs, stamp=stamp
+            )
+        )
+        return errors
+
+    @classmethod
+    def _load_subject(
+        cls,
+        root_dir: Path,
+        *,
+        file_index: dict[str, Path],
+        lower_to_actual: dict[str, str],
+        manifest: Manifest,
+        subject_id: str,
+        trials_by_subject: dict[str, Sequence[Trial]],
+        stamp: ValidationStamp,
+        index: CompiledBundleIndex | None,
+    ) -> list[str]:
+        trials_json_path = file_index.get(f"trial_sets/{subject_id}/trials.json")
+        if (
+            index is not None
+            and trials_json_path is not None
+            and index.is_current(subject_id, trials_json_path)
+        ):
+            return cls._validate_compiled_subject(
+                root_dir,
+                file_index=file_index,
+                lower_to_actual=lower_to_actual,
+                subject_id=subject_id,
+                trials_by_subject=trials_by_subject,
+                stamp=stamp,
+                index=index,
+            )
+        return cls._validate_subject(
+            root_dir,
+            file_index=file_index,
+            lower_to_actual=lower_to_actual,
+            manifest=manifest,
+            subject_id=subject_id,
+            trials_by_subject=trials_by_subject,
+            stamp=stamp,
+        )
+
+    @classmethod
+    def _validate_compiled_subject(
+        cls,
+        root_dir: Path,
+        *,
+        file_index: dict[str, Path],
+        lower_to_actual: dict[str, str],
+        subject_id: str,
+        trials_by_subject: dict[str, Sequence[Trial]],
+        stamp: ValidationStamp,
+        index: CompiledBundleIndex,
+    ) -> list[str]:
+        errors: list[str] = []
+        media_refs: dict[str, list[str]] = {}
+        prefixes = {
+            "audio_path": "media/audio/",
+            "left_image_path": "media/images/",
+            "right_image_path": "media/images/",
+        }
+        for field, paths in index.media_paths(subject_id).items():
+            for internal_path in paths:
+                errors.extend(
+                    cls._validate_media_reference(
+                        root_dir,
+                        file_index=file_index,
+                        lower_to_actual=lower_to_actual,
+                        internal_path=internal_path,
+                        context=f"[{subject_id}] compiled index {field}",
+                        expected_prefix=prefixes[field],
+                        media_refs=media_refs,
                     )
                 )
+        errors.extend(
+            cls._check_media_files(
+                root_dir, file_index=file_index, media_refs=media_refs, stamp=stamp
+            )
+        )
+        if errors:
+            return errors
+
+        trials_by_subject[subject_id] = index.trials(subject_id)
         return errors
 
     @classmethod
@@ -372,9 +586,11 @@ class CrossModalBundleDir:
         lower_to_actual: dict[str, str],
         manifest: Manifest,
         subject_id: str,
-        trials_by_subject: dict[str, list[Trial]],
+        trials_by_subject: dict[str, Sequence[Trial]],
+        stamp: ValidationStamp,
     ) -> list[str]:
         errors: list[str] = []
+        media_refs: dict[str, list[str]] = {}
 
         trials_json_internal_path = f"trial_sets/{subject_id}/trials.json"
         try:
@@ -444,6 +660,7 @@ class CrossModalBundleDir:
                     internal_path=trial.audio_path,
                     context=f"[{subject_id}] trial_id='{trial.trial_id}' audio",
                     expected_prefix="media/audio/",
+                    media_refs=media_refs,
                 )
             )
             errors.extend(
@@ -454,6 +671,7 @@ class CrossModalBundleDir:
                     internal_path=trial.left_image_path,
                     context=f"[{subject_id}] trial_id='{trial.trial_id}' left_image",
                     expected_prefix="media/images/",
+                    media_refs=media_refs,
                 )
             )
             errors.extend(
@@ -464,14 +682,23 @@ class CrossModalBundleDir:
                     internal_path=trial.right_image_path,
                     context=f"[{subject_id}] trial_id='{trial.trial_id}' right_image",
                     expected_prefix="media/images/",
+                    media_refs=media_refs,
                 )
             )
             parsed_trials.append(trial)
 
+        errors.extend(
+            cls._check_media_files(
+                root_dir, file_index=file_index, media_refs=media_refs, stamp=stamp
+            )
+        )
         if errors:
             return errors
 
-        trials_by_subject[subject_id] = sorted(parsed_trials, key=lambda t: t.trial_number)
+        # A tuple: load_bundle_dir() shares this bundle across every caller.
+        trials_by_subject[subject_id] = tuple(
+            sorted(parsed_trials, key=lambda t: t.trial_number)
+        )
         return errors
 
     @classmethod
@@ -484,7 +711,12 @@ class CrossModalBundleDir:
         internal_path: str,
         context: str,
         expected_prefix: str,
+        media_refs: dict[str, list[str]],
     ) -> list[str]:
+        """
+        Check a reference against the file index and queue the file itself in
+        media_refs (path -> contexts) for _check_media_files().
+        """
         errors: list[str] = []
         try:
             assert_safe_internal_path(internal_path)
@@ -509,14 +741,122 @@ class CrossModalBundleDir:
                 errors.append(f"{context}: missing media file '{internal_path}'")
             return errors
 
-        try:
-            resolved = exact.resolve()
-            root_resolved = root_dir.resolve()
-            if not resolved.is_file():
-                errors.append(f"{context}: media path is not a file: '{internal_path}'")
-            if not resolved.is_relative_to(root_resolved):
-                errors.append(f"{context}: media path escapes bundle root: '{internal_path}'")
-        except Exception as e:
-            errors.append(f"{context}: failed to resolve media path '{internal_path}': {e}")
+        media_refs.setdefault(internal_path, []).append(context)
+        return errors
+
+    @classmethod
+    def _check_media_files(
+        cls,
+        root_dir: Path,
+        *,
+        file_index: dict[str, Path],
+        media_refs: dict[str, list[str]],
+        stamp: ValidationStamp,
+    ) -> list[str]:
+        """Check each referenced file once, in parallel; stamped files only get a stat."""
+        root_resolved = root_dir.resolve()
 
+        def check(internal_path: str) -> list[str]:
+            path = file_index[internal_path]
+            try:
+                # Symlinks are always followed and checked, since their target
+                # can change without the link's own stat changing.
+                st = path.lstat()
+                is_link = stat.S_ISLNK(st.st_mode)
+                if is_link:
+                    st = path.stat()
+                elif stamp.matches(internal_path, st):
+                    return []
+
+                problems: list[str] = []
+                if not stat.S_ISREG(st.st_mode):
+                    problems.append(f"media path is not a file: '{internal_path}'")
+                if not path.resolve().is_relative_to(root_resolved):
+                    problems.append(f"media path escapes bundle root: '{internal_path}'")
+                if not problems and not is_link:
+                    stamp.record(internal_path, st)
+                return problems
+            except FileNotFoundError:
+                return [f"media path is not a file: '{internal_path}'"]
+            except Exception as e:
+                return [f"failed to resolve media path '{internal_path}': {e}"]
+
+        paths = list(media_refs)
+        if len(paths) > 1:
+            with ThreadPoolExecutor(MEDIA_CHECK_WORKERS) as pool:
+                results = list(pool.map(check, paths))
+        else:
+            results = [check(p) for p in paths]
+
+        errors: list[str] = []
+        for internal_path, problems in zip(paths, results):
+            for context in media_refs[internal_path]:
+                errors.extend(f"{context}: {problem}" for problem in problems)
         return errors
+
+
+def load_bundle_dir(root_dir: Path, *, lazy: bool = True) -> CrossModalBundleDir:
+    """
+    Return a validated bundle, reusing the cached index while the bundle is unchanged.
+
+    Bundles are opened lazily by default, so subjects are validated when first
+    selected or loaded rather than all at once.
+    """
+    root_dir = root_dir.expanduser().resolve()
+    signature = _bundle_signature(root_dir)
+
+    with _BUNDLE_CACHE_LOCK:
+        cached = _BUNDLE_CACHE.get(root_dir)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+    bundle = CrossModalBundleDir.from_dir_path(root_dir, lazy=lazy)
+
+    with _BUNDLE_CACHE_LOCK:
+        _BUNDLE_CACHE[root_dir] = (signature, bundle)
+    return bundle
+
+
+def invalidate_bundle_cache(root_dir: Path | None = None) -> None:
+    """Drop the cached index for one bundle, or for every bundle when no path is given."""
+    with _BUNDLE_CACHE_LOCK:
+        if root_dir is None:
+            _BUNDLE_CACHE.clear()
+        else:
+            _BUNDLE_CACHE.pop(root_dir.expanduser().resolve(), None)
+
+
+def _bundle_signature(root_dir: Path) -> BundleSignature:
+    # Directory mtimes catch added/removed/renamed files, the JSON stats catch
+    # in-place edits of the documents that drive validation. The root itself is
+    # left out because writing the validation stamp touches it.
+    candidates = [
+        "dataset_meta.json",
+        "manifest.json",
+        "media",
+        "media/images",
+        "media/audio",
+        "trial_sets",
+        f"{INDEX_DIR_NAME}/meta.json",
+    ]
+
+    trial_sets_dir = root_dir / "trial_sets"
+    try:
+        with os.scandir(trial_sets_dir) as entries:
+            subject_dirs = sorted(e.name for e in entries if e.is_dir())
+    except OSError:
+        subject_dirs = []
+
+    for subject_id in subject_dirs:
+        candidates.append(f"trial_sets/{subject_id}")
+        candidates.append(f"trial_sets/{subject_id}/trials.json")
+
+    signature: list[tuple[str, int, int]] = []
+    for rel in candidates:
+        try:
+            st = os.stat(root_dir / rel if rel else root_dir)
+        except OSError:
+            signature.append((rel, -1, -1))
+            continue
+        signature.append((rel, st.st_mtime_ns, st.st_size))
+    return tuple(signature)
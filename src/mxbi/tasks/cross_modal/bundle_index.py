@@ -0,0 +1,237 @@
+"""
+Compiled, memory-mapped trial index for cross-modal bundles.
+
+`.mxbi_index/` in the bundle root holds:
+
+- trials.npy: one TRIAL_DTYPE row per trial, grouped by subject and sorted by
+  trial number within each subject
+- strings.npy / string_offsets.npy: UTF-8 blob and offsets of the interned
+  string table that the string columns point into
+- meta.json: row range per subject and the stat of the trials.json it was
+  compiled from, written last
+
+A subject whose trials.json no longer matches its recorded stat is stale and
+read from JSON again.
+"""
+
+import json
+import os
+from collections.abc import Sequence
+from functools import lru_cache
+from pathlib import Path
+from typing import overload
+
+import numpy as np
+from numpy.typing import NDArray
+
+from mxbi.tasks.cross_modal.trial_schema import Trial
+from mxbi.utils.logger import logger
+
+INDEX_DIR_NAME = ".mxbi_index"
+INDEX_VERSION = 1
+
+SIDES = ("left", "right")
+
+STRING_FIELDS = (
+    "trial_id",
+    "subject_id",
+    "partner_id",
+    "call_identity_id",
+    "call_category",
+    "other_identity_id",
+    "other_category",
+    "audio_identity_id",
+    "audio_path",
+    "left_image_identity_id",
+    "left_image_path",
+    "right_image_identity_id",
+    "right_image_path",
+    "seed",
+)
+INT_FIELDS = ("trial_number", "audio_index", "left_image_index", "right_image_index")
+SIDE_FIELDS = ("partner_side", "correct_side")
+MEDIA_PATH_FIELDS = ("audio_path", "left_image_path", "right_image_path")
+
+TRIAL_DTYPE = np.dtype(
+    [(name, "<i8") for name in INT_FIELDS]
+    + [(name, "<u4") for name in STRING_FIELDS]
+    + [(name, "u1") for name in SIDE_FIELDS]
+    + [("is_partner_call", "?")]
+)
+
+TrialSource = tuple[int, int]  # trials.json (size, mtime_ns)
+
+
+def trials_json_source(path: Path) -> TrialSource:
+    st = path.stat()
+    return st.st_size, st.st_mtime_ns
+
+
+def compile_bundle_index(
+    root_dir: Path,
+    trials_by_subject: dict[str, Sequence[Trial]],
+    sources: dict[str, TrialSource],
+) -> Path:
+    """Write the index for already validated trials and return its directory."""
+    strings: dict[str, int] = {}
+
+    def intern(value: str) -> int:
+        return strings.setdefault(value, len(strings))
+
+    total = sum(len(trials) for trials in trials_by_subject.values())
+    rows = np.zeros(total, dtype=TRIAL_DTYPE)
+    subjects: dict[str, dict[str, int | list[int]]] = {}
+
+    start = 0
+    for subject_id, trials in trials_by_subject.items():
+        for i, trial in enumerate(sorted(trials, key=lambda t: t.trial_number)):
+            row = rows[start + i]
+            for name in INT_FIELDS:
+                row[name] = getattr(trial, name)
+            for name in STRING_FIELDS:
+                row[name] = intern(getattr(trial, name))
+            for name in SIDE_FIELDS:
+                row[name] = SIDES.index(getattr(trial, name))
+            row["is_partner_call"] = trial.is_partner_call
+        stop = start + len(trials)
+        subjects[subject_id] = {
+            "start": start,
+            "stop": stop,
+            "source": list(sources[subject_id]),
+        }
+        start = stop
+
+    encoded = [value.encode("utf-8") for value in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.uint64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    blob = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+    index_dir = root_dir / INDEX_DIR_NAME
+    index_dir.mkdir(exist_ok=True)
+    _save_npy(index_dir / "trials.npy", rows)
+    _save_npy(index_dir / "strings.npy", blob)
+    _save_npy(index_dir / "string_offsets.npy", offsets)
+
+    meta = {
+        "version": INDEX_VERSION,
+        "trial_count": total,
+        "string_count": len(encoded),
+        "subjects": subjects,
+    }
+    _atomic_write(index_dir / "meta.json", json.dumps(meta, indent=2).encode("utf-8"))
+    return index_dir
+
+
+class CompiledBundleIndex:
+    def __init__(
+        self,
+        rows: NDArray[np.void],
+        blob: NDArray[np.uint8],
+        offsets: NDArray[np.uint64],
+        subjects: dict[str, tuple[int, int, TrialSource]],
+    ) -> None:
+        self._rows = rows
+        self._blob = blob
+        self._offsets = offsets
+        self._subjects = subjects
+        self.string = lru_cache(maxsize=4096)(self._string)
+
+    @classmethod
+    def open(cls, root_dir: Path) -> "CompiledBundleIndex | None":
+        """Map the index read-only; None when there is none or it is unusable."""
+        index_dir = root_dir / INDEX_DIR_NAME
+        try:
+            meta = json.loads((index_dir / "meta.json").read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable bundle index {index_dir}: {e}")
+            return None
+
+        try:
+            if meta.get("version") != INDEX_VERSION:
+                raise ValueError(f"version {meta.get('version')} != {INDEX_VERSION}")
+
+            rows = np.load(index_dir / "trials.npy", mmap_mode="r")
+            blob = np.load(index_dir / "strings.npy", mmap_mode="r")
+            offsets = np.load(index_dir / "string_offsets.npy", mmap_mode="r")
+            if rows.dtype != TRIAL_DTYPE or len(rows) != meta["trial_count"]:
+                raise ValueError("trials.npy does not match meta.json")
+            if len(offsets) != meta["string_count"] + 1 or int(offsets[-1]) != len(blob):
+                raise ValueError("string table does not match meta.json")
+
+            subjects = {
+                subject_id: (int(s["start"]), int(s["stop"]), tuple(s["source"]))
+                for subject_id, s in meta["subjects"].items()
+            }
+        except Exception as e:
+            logger.warning(f"Ignoring unusable bundle index {index_dir}: {e}")
+            return None
+
+        return cls(rows, blob, offsets, subjects)
+
+    def is_current(self, subject_id: str, trials_json_path: Path) -> bool:
+        entry = self._subjects.get(subject_id)
+        if entry is None:
+            return False
+        try:
+            return trials_json_source(trials_json_path) == entry[2]
+        except OSError:
+            return False
+
+    def trials(self, subject_id: str) -> "CompiledTrials":
+        start, stop, _ = self._subjects[subject_id]
+        return CompiledTrials(self, self._rows[start:stop])
+
+    def media_paths(self, subject_id: str) -> dict[str, list[str]]:
+        """Unique media paths referenced by a subject, per column."""
+        start, stop, _ = self._subjects[subject_id]
+        rows = self._rows[start:stop]
+        return {
+            name: [self.string(int(i)) for i in np.unique(rows[name])]
+            for name in MEDIA_PATH_FIELDS
+        }
+
+    def _string(self, i: int) -> str:
+        start, stop = int(self._offsets[i]), int(self._offsets[i + 1])
+        return self._blob[start:stop].tobytes().decode("utf-8")
+
+
+class CompiledTrials(Sequence[Trial]):
+    """A subject's trials straight from the index; each Trial is built on access."""
+
+    def __init__(self, index: CompiledBundleIndex, rows: NDArray[np.void]) -> None:
+        self._index = index
+        self._rows = rows
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @overload
+    def __getitem__(self, i: int) -> Trial: ...
+    @overload
+    def __getitem__(self, i: slice) -> list[Trial]: ...
+    def __getitem__(self, i: int | slice) -> Trial | list[Trial]:
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+
+        row = self._rows[i]
+        fields: dict[str, object] = {name: int(row[name]) for name in INT_FIELDS}
+        fields.update({name: self._index.string(int(row[name])) for name in STRING_FIELDS})
+        fields.update({name: SIDES[int(row[name])] for name in SIDE_FIELDS})
+        fields["is_partner_call"] = bool(row["is_partner_call"])
+        # Rows were validated when the index was compiled.
+        return Trial.model_construct(**fields)
+
+
+def _save_npy(path: Path, array: NDArray) -> None:
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        np.save(f, array)
+    os.replace(tmp_path, path)
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
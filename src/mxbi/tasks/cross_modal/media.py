@@ -5,8 +5,14 @@ from typing import Literal
 import numpy as np
 from numpy.typing import NDArray
 
+from mxbi.tasks.cross_modal.resample import resample_polyphase, warm_filter_banks
 from mxbi.utils.aplayer import SAMPLE_RATE
 
+# Bumped whenever decoding output changes, so stored decodes are rebuilt.
+DECODER_VERSION = 2
+
+warm_filter_banks()
+
 
 def load_wav_as_int16(
     path: Path,
@@ -47,14 +53,4 @@ def load_wav_as_int16(
 def _resample_1d(
     signal: NDArray[np.float32], *, source_rate: int, target_rate: int
 ) -> NDArray[np.float32]:
-    if signal.size == 0:
-        return signal
-
-    target_length = int(round(signal.size * (target_rate / source_rate)))
-    if target_length <= 0:
-        return np.zeros(0, dtype=np.float32)
-
-    old_positions = np.linspace(0.0, 1.0, num=signal.size, endpoint=False)
-    new_positions = np.linspace(0.0, 1.0, num=target_length, endpoint=False)
-    resampled = np.interp(new_positions, old_positions, signal).astype(np.float32)
-    return resampled
+    return resample_polyphase(signal, source_rate=source_rate, target_rate=target_rate)
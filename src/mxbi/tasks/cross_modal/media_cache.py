@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock
+from typing import TYPE_CHECKING, Callable, Generic, Hashable, Literal, TypeVar
+
+import numpy as np
+from PIL import Image
+
+from mxbi.path import CACHE_DIR_PATH
+from mxbi.tasks.cross_modal.media import DECODER_VERSION, load_wav_as_int16
+from mxbi.utils.aplayer import SAMPLE_RATE
+from mxbi.utils.logger import logger
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+    from PIL.Image import Image as PILImage
+
+IMAGE_CACHE_DIR_PATH = CACHE_DIR_PATH / "cross_modal_images"
+IMAGE_CACHE_SIZE = 64
+
+AUDIO_CACHE_DIR_PATH = CACHE_DIR_PATH / "cross_modal_audio"
+AUDIO_CACHE_SIZE = 128  # mostly memory maps
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class _LoadingLRU(Generic[K, V]):
+    """Thread-safe LRU where concurrent misses on one key share a single load."""
+
+    def __init__(self, maxsize: int) -> None:
+        self._maxsize = maxsize
+        self._lock = Lock()
+        self._items: OrderedDict[K, V] = OrderedDict()
+        self._loading: dict[K, Future[V]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: K, load: Callable[[], V]) -> V:
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key]
+
+            pending = self._loading.get(key)
+            if pending is None:
+                self.misses += 1
+                pending = Future()
+                self._loading[key] = pending
+                owner = True
+            else:
+                self.hits += 1
+                owner = False
+
+        if not owner:
+            return pending.result()
+
+        try:
+            value = load()
+        except BaseException as e:
+            with self._lock:
+                del self._loading[key]
+            pending.set_exception(e)
+            raise
+
+        with self._lock:
+            del self._loading[key]
+            self._items[key] = value
+            if len(self._items) > self._maxsize:
+                self._items.popitem(last=False)
+        pending.set_result(value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+
+def _prepare_image(image_path: Path, image_size: int) -> "PILImage":
+    with Image.open(image_path) as img:
+        prepared = img.convert("RGB").rotate(90, expand=True)
+        return prepared.resize((image_size, image_size), Image.LANCZOS)
+
+
+class PreparedImageCache:
+    """
+    Rotated and resized stimulus images, cached in memory and on disk.
+
+    Entries are keyed by (path, size, mtime) so an edited image is prepared
+    again. The disk copy is raw RGB under the data dir's cache folder.
+    """
+
+    def __init__(
+        self, cache_dir: Path = IMAGE_CACHE_DIR_PATH, maxsize: int = IMAGE_CACHE_SIZE
+    ) -> None:
+        self._cache_dir = cache_dir
+        self._memory: _LoadingLRU[tuple[Path, int, int], PILImage] = _LoadingLRU(
+            maxsize
+        )
+        self.disk_hits = 0
+
+    def get(self, image_path: Path, image_size: int) -> "PILImage":
+        key = (image_path, image_size, image_path.stat().st_mtime_ns)
+        return self._memory.get(key, lambda: self._load(key))
+
+    @property
+    def hits(self) -> int:
+        return self._memory.hits
+
+    @property
+    def misses(self) -> int:
+        return self._memory.misses
+
+    def _load(self, key: tuple[Path, int, int]) -> "PILImage":
+        image_path, image_size, _ = key
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()
+        cached_path = self._cache_dir / f"{digest}_{image_size}.rgb"
+
+        try:
+            data = cached_path.read_bytes()
+            if len(data) == image_size * image_size * 3:
+                self.disk_hits += 1
+                return Image.frombytes("RGB", (image_size, image_size), data)
+        except FileNotFoundError:
+            pass
+
+        prepared = _prepare_image(image_path, image_size)
+        try:
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = cached_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_bytes(prepared.tobytes())
+            os.replace(tmp_path, cached_path)
+        except OSError as e:
+            logger.warning(f"Failed to write prepared image cache {cached_path}: {e}")
+        return prepared
+
+
+@dataclass(frozen=True)
+class AudioKey:
+    path: Path
+    mtime_ns: int
+    gain: float
+    rate_policy: Literal["resample", "error"]
+
+
+@dataclass(frozen=True)
+class AudioCacheStats:
+    memory_hits: int
+    disk_hits: int
+    misses: int
+
+
+class DecodedAudioStore:
+    """
+    Bundle WAVs decoded to the final SAMPLE_RATE int16 array, stored as .npy.
+
+    Files are named after the WAV's content hash plus gain and rate policy, so
+    they survive restarts and bundle moves. Stored arrays are memory-mapped
+    read-only and handed to the player as-is.
+    """
+
+    def __init__(
+        self, cache_dir: Path = AUDIO_CACHE_DIR_PATH, maxsize: int = AUDIO_CACHE_SIZE
+    ) -> None:
+        self._cache_dir = cache_dir
+        self._memory: _LoadingLRU[AudioKey, NDArray[np.int16]] = _LoadingLRU(maxsize)
+        self._disk_hits = 0
+        self._decoded = 0
+
+    def get(
+        self,
+        path: Path,
+        *,
+        rate_policy: Literal["resample", "error"] = "resample",
+        gain: float = 1.0,
+    ) -> "NDArray[np.int16]":
+        key = AudioKey(path, path.stat().st_mtime_ns, gain, rate_policy)
+        return self._memory.get(key, lambda: self._load(key))
+
+    @property
+    def stats(self) -> AudioCacheStats:
+        return AudioCacheStats(
+            memory_hits=self._memory.hits,
+            disk_hits=self._disk_hits,
+            misses=self._decoded,
+        )
+
+    def _load(self, key: AudioKey) -> "NDArray[np.int16]":
+        npy_path = self._cache_dir / (
+            f"{_content_hash(key.path)}_{SAMPLE_RATE}_{key.rate_policy}_{key.gain:g}"
+            f"_v{DECODER_VERSION}.npy"
+        )
+
+        try:
+            stored = np.load(npy_path, mmap_mode="r")
+            self._disk_hits += 1
+            return stored
+        except FileNotFoundError:
+            pass
+        except ValueError as e:
+            logger.warning(f"Ignoring unreadable decoded audio {npy_path}: {e}")
+
+        decoded = load_wav_as_int16(key.path, rate_policy=key.rate_policy, gain=key.gain)
+        self._decoded += 1
+
+        try:
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = npy_path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, "wb") as f:
+                np.save(f, decoded)
+            os.replace(tmp_path, npy_path)
+            return np.load(npy_path, mmap_mode="r")
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to store decoded audio {npy_path}: {e}")
+            return decoded
+
+
+def _content_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(1 << 20):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+prepared_images = PreparedImageCache()
+decoded_audio = DecodedAudioStore()
+
+_prefetch_executor = ThreadPoolExecutor(1, thread_name_prefix="cross_modal_prefetch")
+
+
+def prefetch_trial_media(
+    image_paths: list[Path],
+    image_size: int,
+    audio_path: Path,
+    *,
+    rate_policy: Literal["resample", "error"] = "resample",
+    gain: float = 1.0,
+) -> Future[None]:
+    """Warm both caches for an upcoming trial on a background thread."""
+
+    def _prefetch() -> None:
+        try:
+            for image_path in image_paths:
+                prepared_images.get(image_path, image_size)
+            decoded_audio.get(audio_path, rate_policy=rate_policy, gain=gain)
+        except Exception:
+            logger.exception("Failed to prefetch cross-modal trial media")
+
+    return _prefetch_executor.submit(_prefetch)
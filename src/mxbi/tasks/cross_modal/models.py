@@ -47,6 +47,7 @@ class CrossModalResultRecord(BaseModel):
     outcome: CrossModalOutcome
 
     trial_start_time: float | None
+    audio_onset_time: float | None = None
     choice_time: float | None
     latency_sec: float | None
 
@@ -0,0 +1,120 @@
+"""
+Linear interpolation vs the polyphase resampler for bundle audio.
+
+For each common source rate, times both on a long signal (and reports the peak
+memory they allocate on top of it) and checks spectral
+accuracy on two tones: one in the passband, which must come through with the
+right amplitude and little distortion, and one above the target Nyquist, which
+must be rejected instead of aliasing back into the audible band.
+
+    uv run python -m mxbi.tasks.cross_modal.resample_benchmark [seconds]
+"""
+
+import sys
+import tracemalloc
+from time import perf_counter
+
+import numpy as np
+from numpy.typing import NDArray
+
+from mxbi.tasks.cross_modal.resample import COMMON_RATES, resample_polyphase
+
+SECONDS = 60.0
+PASSBAND_HZ = 1000.0
+
+# Thresholds the polyphase path is held to.
+MIN_PASSBAND_SNR_DB = 60.0
+MIN_ALIAS_REJECTION_DB = 60.0
+
+
+def resample_linear(
+    signal: NDArray[np.float32], *, source_rate: int, target_rate: int
+) -> NDArray[np.float32]:
+    """The previous np.interp implementation, kept for comparison."""
+    target_length = int(round(signal.size * (target_rate / source_rate)))
+    old_positions = np.linspace(0.0, 1.0, num=signal.size, endpoint=False)
+    new_positions = np.linspace(0.0, 1.0, num=target_length, endpoint=False)
+    return np.interp(new_positions, old_positions, signal).astype(np.float32)
+
+
+def _tone(freq: float, rate: int, seconds: float) -> NDArray[np.float32]:
+    t = np.arange(int(rate * seconds)) / rate
+    return (0.5 * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+
+
+def _trim(signal: NDArray[np.float32], rate: int) -> NDArray[np.float32]:
+    # Skip the edges, where both methods see zero padding.
+    edge = rate // 20
+    return signal[edge:-edge]
+
+
+def passband_snr_db(fn, source_rate: int, target_rate: int) -> float:
+    out = fn(
+        _tone(PASSBAND_HZ, source_rate, 1.0),
+        source_rate=source_rate,
+        target_rate=target_rate,
+    )
+    ideal = _tone(PASSBAND_HZ, target_rate, 1.0)[: out.size]
+    error = _trim(out - ideal, target_rate)
+    signal = _trim(ideal, target_rate)
+    return 10 * np.log10(np.sum(signal**2) / max(np.sum(error**2), 1e-30))
+
+
+def alias_rejection_db(fn, source_rate: int, target_rate: int) -> float | None:
+    """Input tone power over output power for a tone the target cannot carry."""
+    nyquist = target_rate / 2
+    freq = 0.5 * (nyquist + source_rate / 2)
+    if freq <= nyquist:
+        return None  # upsampling
+
+    tone = _tone(freq, source_rate, 1.0)
+    out = fn(tone, source_rate=source_rate, target_rate=target_rate)
+    in_power = np.mean(_trim(tone, source_rate) ** 2)
+    out_power = np.mean(_trim(out, target_rate) ** 2)
+    return 10 * np.log10(in_power / max(out_power, 1e-30))
+
+
+def _measure(
+    fn, signal: NDArray[np.float32], source_rate: int, target_rate: int
+) -> tuple[float, int]:
+    tracemalloc.start()
+    started = perf_counter()
+    fn(signal, source_rate=source_rate, target_rate=target_rate)
+    elapsed = perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main(seconds: float = SECONDS) -> None:
+    failures = []
+    for source_rate, target_rate in COMMON_RATES:
+        signal = np.random.default_rng(0).uniform(
+            -0.5, 0.5, int(source_rate * seconds)
+        ).astype(np.float32)
+        print(f"{source_rate} -> {target_rate} Hz, {seconds:g} s")
+
+        for name, fn in (("linear", resample_linear), ("polyphase", resample_polyphase)):
+            elapsed, peak = _measure(fn, signal, source_rate, target_rate)
+            snr = passband_snr_db(fn, source_rate, target_rate)
+            rejection = alias_rejection_db(fn, source_rate, target_rate)
+            rejection_text = "n/a" if rejection is None else f"{rejection:6.1f} dB"
+            print(
+                f"  {name:>9}: {elapsed * 1e3:8.1f} ms, {peak / 2**20:6.1f} MiB peak, "
+                f"passband SNR {snr:6.1f} dB, alias rejection {rejection_text}"
+            )
+
+            if fn is resample_polyphase:
+                if snr < MIN_PASSBAND_SNR_DB:
+                    failures.append(f"{source_rate}: passband SNR {snr:.1f} dB")
+                if rejection is not None and rejection < MIN_ALIAS_REJECTION_DB:
+                    failures.append(f"{source_rate}: alias rejection {rejection:.1f} dB")
+
+    if failures:
+        print("FAILED: " + "; ".join(failures))
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else SECONDS)
@@ -1,8 +1,8 @@
 from __future__ import annotations
 
+from collections.abc import Callable
 from dataclasses import dataclass
-from time import time
-from tkinter import CENTER, Canvas, Event
+from tkinter import Event
 from typing import TYPE_CHECKING
 
 import numpy as np
@@ -10,8 +10,8 @@ from numpy.typing import NDArray
 from PIL import ImageTk
 
 from mxbi.tasks.cross_modal.config import CrossModalConfig
+from mxbi.utils import clock
 from mxbi.utils.logger import logger
-from mxbi.utils.tkinter.components.canvas_with_border import CanvasWithInnerBorder
 from mxbi.utils.tkinter.components.showdata_widget import ShowDataWidget
 
 if TYPE_CHECKING:
@@ -21,6 +21,7 @@ if TYPE_CHECKING:
     from mxbi.models.session import ScreenConfig, SessionState
     from mxbi.tasks.cross_modal.trial_schema import Trial
     from mxbi.theater import Theater
+    from mxbi.utils.tkinter.scene_layer import RetainedCanvas
 
 
 @dataclass
@@ -30,6 +31,7 @@ class CrossModalResult:
     feedback: bool
     cancelled: bool
     trial_start_time: float | None
+    audio_onset_time: float | None
     choice_time: float | None
     choice_x: int | None
     choice_y: int | None
@@ -59,9 +61,8 @@ class CrossModalScene:
         self._right_image_pil = right_image
         self._audio_stimulus = audio_stimulus
 
-        self._background: CanvasWithInnerBorder | None = None
-        self._left_canvas: Canvas | None = None
-        self._right_canvas: Canvas | None = None
+        self._background: RetainedCanvas | None = None
+        self._on_end: Callable[[CrossModalResult], None] | None = None
         self._left_image: ImageTk.PhotoImage | None = None
         self._right_image: ImageTk.PhotoImage | None = None
         self._show_data_widget: ShowDataWidget | None = None
@@ -72,25 +73,16 @@ class CrossModalScene:
         self._cancelled = False
 
         self._trial_start_time: float | None = None
+        self._audio_onset_time: float | None = None
         self._choice_time: float | None = None
         self._choice_x: int | None = None
         self._choice_y: int | None = None
 
-    def start(self) -> CrossModalResult:
+    def start(self, on_end: Callable[[CrossModalResult], None]) -> None:
+        self._on_end = on_end
         self._create_view()
         self._bind_events()
         self._play_audio()
-        self._theater.mainloop()
-        return CrossModalResult(
-            chosen_side=self._chosen_side,
-            timeout=self._timeout,
-            feedback=self._feedback,
-            cancelled=self._cancelled,
-            trial_start_time=self._trial_start_time,
-            choice_time=self._choice_time,
-            choice_x=self._choice_x,
-            choice_y=self._choice_y,
-        )
 
     def cancel(self) -> None:
         if self._cancelled:
@@ -101,18 +93,9 @@ class CrossModalScene:
         self._stop_and_close()
 
     def _create_view(self) -> None:
-        self._background = CanvasWithInnerBorder(
-            master=self._theater.root,
-            bg="black",
-            width=self._screen.width,
-            height=self._screen.height,
-            border_width=40,
-        )
-        self._background.place(relx=0.5, rely=0.5, anchor="center")
-        self._background.focus_set()
+        self._background = self._theater.scene_layer.acquire(self)
 
-        self._show_data_widget = ShowDataWidget(self._background)
-        self._show_data_widget.place(relx=0, rely=1, anchor="sw")
+        self._show_data_widget = self._theater.scene_layer.overlay
         self._show_data_widget.show_data(
             {
                 "name": self._animal_state.name,
@@ -126,10 +109,11 @@ class CrossModalScene:
             }
         )
 
-        self._background.create_text(
+        self._theater.scene_layer.text(
+            "fixation",
             self._screen.width / 2,
             self._screen.height / 2,
-            text="+",
+            "+",
             fill="white",
             font=("Helvetica", 40),
         )
@@ -141,45 +125,47 @@ class CrossModalScene:
         if self._background is None:
             return
 
-        self._background.delete("all")
-
-        img_size = int(self._left_image_pil.size[0])
+        layer = self._theater.scene_layer
+        layer.hide("fixation")
 
-        self._left_canvas = Canvas(
-            self._background, width=img_size, height=img_size, bg="grey", highlightthickness=0
+        self._left_image = ImageTk.PhotoImage(self._left_image_pil)
+        layer.image(
+            "left_image",
+            self._left_image,
+            self._screen.width * 0.25,
+            self._screen.height * 0.5,
         )
-        self._left_canvas.place(relx=0.25, rely=0.5, anchor=CENTER)
-
-        self._right_canvas = Canvas(
-            self._background, width=img_size, height=img_size, bg="grey", highlightthickness=0
+        layer.bind_item(
+            "left_image", "<ButtonPress-1>", lambda e: self._on_choice("left", e)
         )
-        self._right_canvas.place(relx=0.75, rely=0.5, anchor=CENTER)
-
-        if self._left_canvas is not None:
-            self._left_canvas.bind("<ButtonPress-1>", lambda e: self._on_choice("left", e))
-        if self._right_canvas is not None:
-            self._right_canvas.bind("<ButtonPress-1>", lambda e: self._on_choice("right", e))
-
-        self._left_image = ImageTk.PhotoImage(self._left_image_pil)
-        self._left_canvas.create_image(img_size // 2, img_size // 2, image=self._left_image)
 
         self._right_image = ImageTk.PhotoImage(self._right_image_pil)
-        self._right_canvas.create_image(img_size // 2, img_size // 2, image=self._right_image)
+        layer.image(
+            "right_image",
+            self._right_image,
+            self._screen.width * 0.75,
+            self._screen.height * 0.5,
+        )
+        layer.bind_item(
+            "right_image", "<ButtonPress-1>", lambda e: self._on_choice("right", e)
+        )
 
-        self._background.create_text(
+        layer.text(
+            "left_label",
             self._screen.width * 0.25,
             self._screen.height * 0.8,
-            text=f"Left: {self._trial.left_image_identity_id}",
+            f"Left: {self._trial.left_image_identity_id}",
             fill="white",
         )
-        self._background.create_text(
+        layer.text(
+            "right_label",
             self._screen.width * 0.75,
             self._screen.height * 0.8,
-            text=f"Right: {self._trial.right_image_identity_id}",
+            f"Right: {self._trial.right_image_identity_id}",
             fill="white",
         )
 
-        self._trial_start_time = time()
+        self._trial_start_time = clock.now()
         timeout_ms = self._cross_modal_config.timing.trial_timeout_ms
         self._background.after(timeout_ms, self._on_timeout)
 
@@ -206,7 +192,7 @@ class CrossModalScene:
         if self._cancelled or self._chosen_side is not None:
             return
         self._chosen_side = side
-        self._choice_time = time()
+        self._choice_time = clock.now()
         self._choice_x = event.x_root
         self._choice_y = event.y_root
         self._timeout = False
@@ -222,17 +208,31 @@ class CrossModalScene:
         self._stop_and_close()
 
     def _stop_and_close(self) -> None:
+        if self._on_end is None:
+            return
+        on_end, self._on_end = self._on_end, None
+
+        self._audio_onset_time = self._theater.aplayer.last_onset
         self._theater.aplayer.stop()
         if self._background is not None:
             try:
-                self._background.destroy()
+                self._theater.scene_layer.release(self)
             except Exception:
                 pass
             self._background = None
-        try:
-            self._theater.root.quit()
-        except Exception:
-            pass
+        on_end(
+            CrossModalResult(
+                chosen_side=self._chosen_side,
+                timeout=self._timeout,
+                feedback=self._feedback,
+                cancelled=self._cancelled,
+                trial_start_time=self._trial_start_time,
+                audio_onset_time=self._audio_onset_time,
+                choice_time=self._choice_time,
+                choice_x=self._choice_x,
+                choice_y=self._choice_y,
+            )
+        )
 
     def _give_manual_reward(self) -> None:
         self._theater.reward.give_reward(500)
\ No newline at end of file
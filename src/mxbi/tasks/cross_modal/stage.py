@@ -1,16 +1,18 @@
-import time
 from pathlib import Path
 from typing import TYPE_CHECKING, Final
 
-from PIL import Image
-
 from mxbi.data_logger import DataLogger
-from mxbi.tasks.cross_modal.bundle_dir import CrossModalBundleDir
+from mxbi.tasks.cross_modal.bundle_dir import load_bundle_dir
 from mxbi.tasks.cross_modal.config import CrossModalConfig, load_cross_modal_config
-from mxbi.tasks.cross_modal.media import load_wav_as_int16
+from mxbi.tasks.cross_modal.media_cache import (
+    decoded_audio,
+    prefetch_trial_media,
+    prepared_images,
+)
 from mxbi.tasks.cross_modal.models import CrossModalOutcome, CrossModalResultRecord
 from mxbi.tasks.cross_modal.scene import CrossModalResult, CrossModalScene
 from mxbi.tasks.cross_modal.trial_io import TrialCursor
+from mxbi.utils import clock
 from mxbi.utils.logger import logger
 
 if TYPE_CHECKING:
@@ -19,9 +21,8 @@ if TYPE_CHECKING:
 
     from mxbi.models.animal import AnimalState
     from mxbi.models.session import SessionState
-    from mxbi.models.task import Feedback
+    from mxbi.tasks.task_protocol import TaskDone
     from mxbi.theater import Theater
-    from PIL.Image import Image as PILImage
 
 
 class CrossModalTask:
@@ -46,14 +47,16 @@ class CrossModalTask:
             )
 
         bundle_root = Path(bundle_dir_str).expanduser().resolve()
-        self._bundle_dir = CrossModalBundleDir.from_dir_path(bundle_root)
+        self._bundle_dir = load_bundle_dir(bundle_root)
 
         subject_id = self._animal_state.name
         trials = self._bundle_dir.load_trials(subject_id)
         if not trials:
             raise RuntimeError(f"Bundle contains zero trials for subject '{subject_id}'.")
 
-        self._cursor = TrialCursor(bundle_root=self._bundle_dir.root_dir, subject_id=subject_id)
+        self._cursor = TrialCursor(
+            dataset_id=self._bundle_dir.dataset_meta.dataset_id, subject_id=subject_id
+        )
         self._trial_index = self._cursor.next_index(len(trials))
         self._trial = trials[self._trial_index]
 
@@ -68,16 +71,10 @@ class CrossModalTask:
         right_image_path = self._bundle_dir.resolve_media_path(self._trial.right_image_path)
         audio_path = self._bundle_dir.resolve_media_path(self._trial.audio_path)
 
-        left_image = self._prepare_image(
-            left_image_path,
-            image_size=image_size,
-        )
-        right_image = self._prepare_image(
-            right_image_path,
-            image_size=image_size,
-        )
+        left_image = prepared_images.get(left_image_path, image_size)
+        right_image = prepared_images.get(right_image_path, image_size)
 
-        audio_stimulus = load_wav_as_int16(
+        audio_stimulus = decoded_audio.get(
             audio_path,
             rate_policy=self._cross_modal_config.audio.wav_rate_policy,
             gain=self._cross_modal_config.audio.gain,
@@ -100,8 +97,23 @@ class CrossModalTask:
         )
         self._feedback = False
 
-    def start(self) -> "Feedback":
-        result = self._scene.start()
+        next_trial = trials[self._cursor.peek_index(len(trials))]
+        prefetch_trial_media(
+            [
+                self._bundle_dir.resolve_media_path(next_trial.left_image_path),
+                self._bundle_dir.resolve_media_path(next_trial.right_image_path),
+            ],
+            image_size,
+            self._bundle_dir.resolve_media_path(next_trial.audio_path),
+            rate_policy=self._cross_modal_config.audio.wav_rate_policy,
+            gain=self._cross_modal_config.audio.gain,
+        )
+
+    def start(self, on_done: "TaskDone") -> None:
+        self._on_done = on_done
+        self._scene.start(self._on_trial_end)
+
+    def _on_trial_end(self, result: CrossModalResult) -> None:
         self._feedback = result.feedback
 
         if not result.cancelled:
@@ -119,7 +131,7 @@ class CrossModalTask:
             self._trial.is_partner_call,
             self._feedback,
         )
-        return self._feedback
+        self._on_done(self._feedback)
 
     def quit(self) -> None:
         self._scene.cancel()
@@ -162,7 +174,7 @@ class CrossModalTask:
                 chosen_identity = None
 
             rec = CrossModalResultRecord(
-                timestamp=time.time(),
+                timestamp=clock.now(),
                 session_id=getattr(self._session_state, "session_id", None),
                 subject_id=self._trial.subject_id,
                 partner_id=self._trial.partner_id,
@@ -188,6 +200,7 @@ class CrossModalTask:
                 chosen_identity_id=chosen_identity,
                 outcome=outcome,
                 trial_start_time=result.trial_start_time,
+                audio_onset_time=result.audio_onset_time,
                 choice_time=result.choice_time,
                 latency_sec=latency,
                 choice_x=result.choice_x,
@@ -201,10 +214,3 @@ class CrossModalTask:
             self._data_logger.save_csv_row(payload)
         except Exception:
             logger.exception("Failed to log cross-modal trial")
-
-    @staticmethod
-    def _prepare_image(image_path: Path, *, image_size: int) -> "PILImage":
-        with Image.open(image_path) as img:
-            prepared = img.convert("RGB").rotate(90, expand=True)
-            prepared = prepared.resize((image_size, image_size), Image.LANCZOS)
-            return prepared
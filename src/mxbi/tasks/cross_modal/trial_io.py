@@ -1,23 +1,174 @@
 from __future__ import annotations
 
+import atexit
+import json
+import os
 from dataclasses import dataclass
 from pathlib import Path
+from threading import Lock
+from time import monotonic
+from typing import TextIO
 
-_TRIAL_INDEX_CACHE: dict[tuple[Path, str], int] = {}
+from mxbi.path import TRIAL_CURSOR_LOG_PATH
+from mxbi.utils.logger import logger
+
+FSYNC_INTERVAL_S = 1.0
+# Compact once the log holds this many records beyond one per live cursor.
+COMPACT_SLACK = 1000
+
+
+class TrialCursorStore:
+    """
+    Per (dataset_id, subject) trial positions, persisted in an append-only log.
+
+    Each advance appends one JSON line and flushes it to the OS, so a process
+    crash loses nothing; fsync is batched to at most once per FSYNC_INTERVAL_S.
+    On open the log is replayed (last record wins, a torn tail is dropped) and
+    rewritten as a snapshot once it has grown COMPACT_SLACK records too long.
+    """
+
+    def __init__(self, path: Path, fsync_interval: float = FSYNC_INTERVAL_S) -> None:
+        self._path = path
+        self._fsync_interval = fsync_interval
+        self._lock = Lock()
+        self._positions: dict[tuple[str, str], int] = {}
+        self._file: TextIO | None = None
+        self._records = 0
+        self._last_fsync = 0.0
+        self._unsynced = False
+
+    def get(self, dataset_id: str, subject_id: str) -> int:
+        with self._lock:
+            self._open()
+            return self._positions.get((dataset_id, subject_id), 0)
+
+    def set(self, dataset_id: str, subject_id: str, index: int) -> None:
+        with self._lock:
+            self._open()
+            key = (dataset_id, subject_id)
+            if self._positions.get(key) == index:
+                return
+            self._positions[key] = index
+            self._append(key, index)
+
+            if self._records > len(self._positions) + COMPACT_SLACK:
+                self._compact()
+
+    def sync(self) -> None:
+        with self._lock:
+            self._fsync()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is None:
+                return
+            self._fsync()
+            self._file.close()
+            self._file = None
+
+    def _open(self) -> None:
+        if self._file is not None:
+            return
+
+        started = monotonic()
+        self._positions, self._records = self._replay()
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self._path, "a", encoding="utf-8")
+        if self._records > len(self._positions) + COMPACT_SLACK:
+            self._compact()
+        logger.debug(
+            f"Recovered {len(self._positions)} trial cursors from {self._records} "
+            f"records in {(monotonic() - started) * 1000:.1f} ms"
+        )
+
+    def _replay(self) -> tuple[dict[tuple[str, str], int], int]:
+        positions: dict[tuple[str, str], int] = {}
+        records = 0
+        try:
+            data = self._path.read_bytes()
+        except FileNotFoundError:
+            return positions, records
+
+        lines = data.split(b"\n")
+        if lines[-1]:
+            # Crashed mid-append; drop the partial record so new ones start
+            # on a fresh line.
+            logger.warning(f"Dropping torn trial cursor record in {self._path}")
+            self._truncate(len(data) - len(lines[-1]))
+        for line in lines[:-1]:
+            try:
+                dataset_id, subject_id, index = json.loads(line)
+                positions[(dataset_id, subject_id)] = int(index)
+                records += 1
+            except (ValueError, TypeError):  # includes UnicodeDecodeError
+                logger.warning(f"Skipping bad trial cursor record: {line!r}")
+        return positions, records
+
+    def _truncate(self, size: int) -> None:
+        with open(self._path, "r+b") as f:
+            f.truncate(size)
+
+    def _append(self, key: tuple[str, str], index: int) -> None:
+        assert self._file is not None
+        try:
+            self._file.write(json.dumps([*key, index]) + "\n")
+            self._file.flush()
+            self._records += 1
+            self._unsynced = True
+            if monotonic() - self._last_fsync >= self._fsync_interval:
+                self._fsync()
+        except OSError as e:
+            logger.error(f"Failed to persist trial cursor {key}: {e}")
+
+    def _fsync(self) -> None:
+        if self._file is None or not self._unsynced:
+            return
+        try:
+            os.fsync(self._file.fileno())
+        except OSError as e:
+            logger.error(f"Failed to sync trial cursor log {self._path}: {e}")
+        self._last_fsync = monotonic()
+        self._unsynced = False
+
+    def _compact(self) -> None:
+        tmp_path = self._path.with_name(f"{self._path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for key, index in self._positions.items():
+                    f.write(json.dumps([*key, index]) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self._path)
+        except OSError as e:
+            logger.error(f"Failed to compact trial cursor log {self._path}: {e}")
+            return
+
+        if self._file is not None:
+            self._file.close()
+        self._file = open(self._path, "a", encoding="utf-8")
+        self._records = len(self._positions)
+        self._unsynced = False
+
+
+trial_cursor_store = TrialCursorStore(TRIAL_CURSOR_LOG_PATH)
+atexit.register(trial_cursor_store.close)
 
 
 @dataclass(frozen=True)
 class TrialCursor:
-    bundle_root: Path
+    dataset_id: str
     subject_id: str
+    store: TrialCursorStore = trial_cursor_store
 
     def next_index(self, trial_count: int) -> int:
         if trial_count <= 0:
             raise ValueError("trial_count must be > 0")
-        key = (self.bundle_root.resolve(), self.subject_id)
-        idx = _TRIAL_INDEX_CACHE.get(key, 0)
+        idx = self.store.get(self.dataset_id, self.subject_id)
         return idx % trial_count
 
+    def peek_index(self, trial_count: int, ahead: int = 1) -> int:
+        """Index that next_index() will return after `ahead` more advances."""
+        return (self.next_index(trial_count) + ahead) % trial_count
+
     def advance(self, last_index: int) -> None:
-        key = (self.bundle_root.resolve(), self.subject_id)
-        _TRIAL_INDEX_CACHE[key] = last_index + 1
+        self.store.set(self.dataset_id, self.subject_id, last_index + 1)
@@ -1,10 +1,9 @@
-from tkinter import Canvas
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from mxbi.models.animal import AnimalState, ScheduleCondition
     from mxbi.models.session import SessionState
-    from mxbi.models.task import Feedback
+    from mxbi.tasks.task_protocol import TaskDone
     from mxbi.theater import Theater
 
 
@@ -18,30 +17,26 @@ class ErrorScene:
         self._theater = theater
         self._session_config = session_state
         self._screen_type = self._session_config.session_config.screen_type
-
-        self._on_trial_start()
+        self._on_done: "TaskDone | None" = None
 
     def _on_trial_start(self) -> None:
         self._create_view()
 
     def _create_view(self) -> None:
-        self._background = Canvas(
-            self._theater.root,
-            bg="red",
-            width=self._screen_type.width,
-            height=self._screen_type.height,
-            highlightthickness=0,
-        )
-        self._background.place(relx=0.5, rely=0.5, anchor="center")
-
-    def start(self) -> "Feedback":
-        self._theater.root.mainloop()
+        self._theater.scene_layer.acquire(self, show_overlay=False)
+        self._theater.scene_layer.rectangle("error", "red")
 
-        return True
+    def start(self, on_done: "TaskDone") -> None:
+        self._on_done = on_done
+        self._on_trial_start()
 
     def quit(self) -> None:
-        self._background.destroy()
-        self._theater.root.quit()
+        if self._on_done is None:
+            return
+        on_done, self._on_done = self._on_done, None
+
+        self._theater.scene_layer.release(self)
+        on_done(True)
 
     def on_idle(self) -> None:
         self.quit()
@@ -1,19 +1,29 @@
 from pathlib import Path
-from tkinter.ttk import Label
+from tkinter import Misc
 from typing import TYPE_CHECKING
 
 from PIL import Image, ImageTk
 
-from mxbi.utils.tkinter.components.canvas_with_border import CanvasWithInnerBorder
-
 if TYPE_CHECKING:
     from mxbi.models.animal import AnimalState, ScheduleCondition
     from mxbi.models.session import SessionState
-    from mxbi.models.task import Feedback
+    from mxbi.tasks.task_protocol import TaskDone
     from mxbi.theater import Theater
 
 ASSETS_PATH = Path(__file__).parent / "assets"
 
+# The apple per Tk interpreter; decoding it on every idle period is wasted work.
+_apples: dict[int, ImageTk.PhotoImage] = {}
+
+
+def _apple(master: Misc) -> ImageTk.PhotoImage:
+    apple = _apples.get(id(master.tk))
+    if apple is None:
+        image = Image.open(ASSETS_PATH / "apple_v1.png")
+        image = image.resize((400, 400)).rotate(-90, expand=True)
+        apple = _apples[id(master.tk)] = ImageTk.PhotoImage(image, master=master)
+    return apple
+
 
 class IDLEScene:
     def __init__(
@@ -28,42 +38,35 @@ class IDLEScene:
         self._standard_reward_stimulus = self._theater.new_standard_reward_stimulus(
             1000
         )
+        self._on_done: "TaskDone | None" = None
 
+    def start(self, on_done: "TaskDone") -> None:
+        self._on_done = on_done
         self._on_trial_start()
 
-    def start(self) -> "Feedback":
-        self._theater.root.mainloop()
-
-        return True
-
     def _on_trial_start(self) -> None:
         self._create_view()
         self._bind_events()
 
     def _on_trial_end(self) -> None:
+        if self._on_done is None:
+            return
+        on_done, self._on_done = self._on_done, None
+
         self._theater.aplayer.stop()
-        self._background.destroy()
-        self._theater.root.quit()
+        self._theater.scene_layer.release(self)
+        on_done(True)
 
     def _create_view(self) -> None:
-        self._background = CanvasWithInnerBorder(
-            master=self._theater.root,
-            bg="black",
-            width=self._screen_type.width,
-            height=self._screen_type.height,
-            border_width=40,
-        )
-        self._background.place(relx=0.5, rely=0.5, anchor="center")
+        self._background = self._theater.scene_layer.acquire(self, show_overlay=False)
 
         xshift = 240
         xcenter = self._screen_type.width / 2 + xshift
         ycenter = self._screen_type.height / 2
 
-        self._img = Image.open(ASSETS_PATH / "apple_v1.png")
-        self._img = self._img.resize((400, 400)).rotate(-90, expand=True)
-        self._img = ImageTk.PhotoImage(self._img)
-        self.label_apple = Label(self._background, image=self._img)
-        self.label_apple.place(x=xcenter, y=ycenter, anchor="center")
+        self._theater.scene_layer.image(
+            "idle", _apple(self._background), xcenter, ycenter
+        )
 
     def _bind_events(self) -> None:
         self._background.focus_set()
@@ -1,6 +1,5 @@
 from random import choices
 from typing import TYPE_CHECKING, Final
-from datetime import datetime
 
 from mxbi.data_logger import DataLogger, DataLoggerType
 from mxbi.models.animal import ScheduleCondition
@@ -8,7 +7,7 @@ from mxbi.tasks.default.initial_habituation_training.stages.models import (
     InitialHabituationTrainingStageConfig,
     StageContext,
     StageContexts,
-    config,
+    load_config,
 )
 from mxbi.tasks.default.initial_habituation_training.tasks.stay_to_reward.stay_to_reward import (
     DefaultStayToRewardScene,
@@ -16,19 +15,20 @@ from mxbi.tasks.default.initial_habituation_training.tasks.stay_to_reward.stay_t
 from mxbi.tasks.default.initial_habituation_training.tasks.stay_to_reward.stay_to_reward_models import (
     Result,
     TrialConfig,
+    TrialData,
 )
+from mxbi.utils import clock
 from mxbi.utils.logger import logger
-from mxbi.utils.tkinter.components.canvas_with_border import CanvasWithInnerBorder
 
 if TYPE_CHECKING:
     from mxbi.models.animal import AnimalState
     from mxbi.models.session import SessionConfig, SessionState
     from mxbi.models.task import Feedback
+    from mxbi.tasks.task_protocol import TaskDone
     from mxbi.theater import Theater
 
 
 contexts = StageContexts()
-background: CanvasWithInnerBorder | None = None
 
 
 def _initialize_contexts(session_config: "SessionConfig") -> None:
@@ -38,17 +38,6 @@ def _initialize_contexts(session_config: "SessionConfig") -> None:
             contexts.root[monkey] = StageContext()
 
 
-def _initialize_background(theater: "Theater", session_config: "SessionConfig") -> None:
-    global background
-    background = CanvasWithInnerBorder(
-        master=theater.root,
-        bg="black",
-        width=session_config.screen_type.width,
-        height=session_config.screen_type.height,
-        border_width=40,
-    )
-
-
 class InitialHabituationTrainingStage:
     STAGE_NAME: Final[str] = "DEFAULT_INITIAL_HABITUATION_TRAINING_STAGE"
 
@@ -62,12 +51,9 @@ class InitialHabituationTrainingStage:
         self._session_state = session_state
         self._animal_state = animal_state
 
-        if not contexts.root:
+        if animal_state.name not in contexts.root:
             _initialize_contexts(session_state.session_config)
 
-        if background is None:
-            _initialize_background(theater, session_state.session_config)
-
         context = contexts.root[animal_state.name]
 
         self._stage_config = self._load_stage_config(self._animal_state.name)
@@ -101,19 +87,19 @@ class InitialHabituationTrainingStage:
         if self._animal_state.data_path is None:
             self._animal_state.data_path = self._data_logger.path
 
-        assert background is not None
-
         self._task = DefaultStayToRewardScene(
             theater=theater,
             animal_state=animal_state,
             screen_type=session_state.session_config.screen_type,
             trial_config=_config,
             context=context,
-            background=background,
         )
 
-    def start(self) -> "Feedback":
-        trial_data = self._task.start()
+    def start(self, on_done: "TaskDone") -> None:
+        self._on_done = on_done
+        self._task.start(self._on_trial_end)
+
+    def _on_trial_end(self, trial_data: TrialData) -> None:
         self._data_logger.save(trial_data.model_dump())
 
         feedback = self._handle_result(trial_data.result)
@@ -127,24 +113,25 @@ class InitialHabituationTrainingStage:
             f"feedback={feedback}"
         )
 
-        now = datetime.now().timestamp()
+        now = clock.now()
         if self._animal_state.animal_session_start_time != 0.0:
             session_duration = now - self._animal_state.animal_session_start_time
             if session_duration >= 30:
                 print(session_duration)
                 print(self._animal_state.animal_session_start_time)
                 self._animal_state.animal_session_start_time = (
-                    datetime.now().timestamp()
+                    clock.now()
                 )
 
                 self._theater._scheduler._increase_difficulty(
                     self._animal_state
                 )
 
-        return feedback
+        self._on_done(feedback)
 
     def _load_stage_config(self, monkey: str) -> InitialHabituationTrainingStageConfig:
-        stage_config = config.root.get(monkey) or config.root.get("default")
+        configs = load_config()
+        stage_config = configs.root.get(monkey) or configs.root.get("default")
         if stage_config is None:
             raise ValueError("No default stage config found")
         return stage_config
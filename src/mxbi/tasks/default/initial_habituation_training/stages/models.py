@@ -1,3 +1,4 @@
+from functools import cache
 from pathlib import Path
 
 from pydantic import BaseModel, ConfigDict, Field, RootModel
@@ -47,11 +48,10 @@ class StageContexts(RootModel):
     root: dict[MonkeyName, StageContext] = Field(default_factory=dict)
 
 
+@cache
 def load_config() -> InitialHabituationTrainingStageConfigs:
     configs = Configure(CONFIG_PATH, InitialHabituationTrainingStageConfigs).value
     for config in configs.root.values():
         config.condition.level_count = len(config.levels_table)
     return configs
 
-
-config = load_config()
@@ -1,7 +1,6 @@
-from datetime import datetime
+from collections.abc import Callable
 from math import ceil
 from random import uniform
-from tkinter import Frame
 from typing import TYPE_CHECKING, Final
 
 from mxbi.tasks.default.initial_habituation_training.tasks.stay_to_reward.stay_to_reward_models import (
@@ -9,9 +8,8 @@ from mxbi.tasks.default.initial_habituation_training.tasks.stay_to_reward.stay_t
     Result,
     TrialData,
 )
+from mxbi.utils import clock
 from mxbi.utils.aplayer import ToneConfig
-from mxbi.utils.tkinter.components.canvas_with_border import CanvasWithInnerBorder
-from mxbi.utils.tkinter.components.showdata_widget import ShowDataWidget
 
 if TYPE_CHECKING:
     from concurrent.futures import Future
@@ -38,14 +36,12 @@ class DefaultStayToRewardScene:
         screen_type: "ScreenConfig",
         trial_config: "TrialConfig",
         context: "StageContext",
-        background: "CanvasWithInnerBorder",
     ):
         self._theater: "Final[Theater]" = theater
         self._animal_state: "Final[AnimalState]" = animal_state
         self._screen_type: "Final[ScreenConfig]" = screen_type
         self._trial_config: "Final[TrialConfig]" = trial_config
         self._context: "Final[StageContext]" = context
-        self._background = background
 
         self._play_future: Future[bool] | None = None
 
@@ -55,13 +51,13 @@ class DefaultStayToRewardScene:
         )
 
         self._set_stimulus_intensity()
-        self._on_trial_start()
 
-    # region public api
-    def start(self) -> "TrialData":
-        self._theater.mainloop()
+        self._on_end: Callable[[TrialData], None] | None = None
 
-        return self._data
+    # region public api
+    def start(self, on_end: Callable[[TrialData], None]) -> None:
+        self._on_end = on_end
+        self._on_trial_start()
 
     def cancle(self) -> None:
         self._cleanup()
@@ -86,20 +82,26 @@ class DefaultStayToRewardScene:
 
     def _on_trial_end(self) -> None:
         if self._play_future is not None:
-            self._play_future.add_done_callback(lambda _: self._cleanup())
+            # Done callbacks run on the playback thread.
+            self._play_future.add_done_callback(
+                lambda _: self._theater.root.after(0, self._cleanup)
+            )
         else:
             self._cleanup()
 
     def _cleanup(self) -> None:
-        self._data.trial_end_time = datetime.now().timestamp()
+        if self._on_end is None:
+            return
+        on_end, self._on_end = self._on_end, None
+
+        self._data.trial_end_time = clock.now()
         self._data.stay_duration = (
             self._data.trial_end_time - self._data.trial_start_time
         )
 
         self._theater.aplayer.stop()
-        self._trigger.destroy()
-        self._show_data_widget.destroy()
-        self._theater.root.quit()
+        self._theater.scene_layer.release(self)
+        on_end(self._data)
 
     # endregion
 
@@ -107,20 +109,13 @@ class DefaultStayToRewardScene:
 
     def _create_view(self) -> None:
         self._create_background()
-        self._create_trigger()
         self._create_show_data_widget()
 
     def _create_background(self) -> None:
-        self._background.place(relx=0.5, rely=0.5, anchor="center")
-
-    def _create_trigger(self) -> None:
-        self._trigger = Frame(bg="red", width=0, height=0)
-        self._trigger.place(relx=0.5, rely=0.5, anchor="center")
-        self._trigger.lower()
+        self._background = self._theater.scene_layer.acquire(self)
 
     def _create_show_data_widget(self) -> None:
-        self._show_data_widget = ShowDataWidget(self._background)
-        self._show_data_widget.place(relx=0, rely=1, anchor="sw")
+        self._show_data_widget = self._theater.scene_layer.overlay
         _data = DataToShow(
             name=self._animal_state.name,
             ald=self._animal_state.current_animal_session_trial_id,
@@ -137,11 +132,11 @@ class DefaultStayToRewardScene:
 
     # region event binding
     def _bind_events(self) -> None:
-        self._trigger.focus_set()
+        self._background.focus_set()
 
     def _start_timing(self) -> None:
         target_ms = int(self._trial_config.target * 1000)
-        self._trigger.after(target_ms, self._on_correct)
+        self._background.after(target_ms, self._on_correct)
 
     def _stimulus_loop(self) -> None:
         stimulus_interval = uniform(
@@ -150,7 +145,7 @@ class DefaultStayToRewardScene:
         )
         stimulus_interval_ms = int(stimulus_interval * 1000)
 
-        self._trigger.after(stimulus_interval_ms, self._give_stimulus)
+        self._background.after(stimulus_interval_ms, self._give_stimulus)
 
     # endregion
 
@@ -171,7 +166,7 @@ class DefaultStayToRewardScene:
         self._context.duration += 1
 
         self._show_data_widget.update_data(data.model_dump())
-        self._trigger.after(1000, self._start_tracking_data)
+        self._background.after(1000, self._start_tracking_data)
 
     def _init_data(self) -> None:
         self._data = TrialData(
@@ -180,7 +175,7 @@ class DefaultStayToRewardScene:
             animal_session_trial_id=self._animal_state.current_animal_session_trial_id,
             animal=self._animal_state.name,
             trial_id=self._animal_state.trial_id,
-            trial_start_time=datetime.now().timestamp(),
+            trial_start_time=clock.now(),
             trial_end_time=0,
             stay_duration=0,
             result=Result.CORRECT,
@@ -221,18 +216,18 @@ class DefaultStayToRewardScene:
 
     def _on_direct_stimulus_complete(self, future: "Future[bool]") -> None:
         if future.result():
-            self._trigger.after(0, self._give_reward)
+            self._background.after(0, self._give_reward)
 
-            self._trigger.after(
+            self._background.after(
                 self._trial_config.reward_duration,
                 lambda: (self._start_timing(), self._stimulus_loop()),
             )
 
     def _on_stimulus_complete(self, future: "Future[bool]") -> None:
         if future.result():
-            self._trigger.after(0, self._give_reward)
+            self._background.after(0, self._give_reward)
 
-            self._trigger.after(self._trial_config.reward_duration, self._stimulus_loop)
+            self._background.after(self._trial_config.reward_duration, self._stimulus_loop)
 
     def _on_correct(self) -> None:
         self._data.result = Result.CORRECT
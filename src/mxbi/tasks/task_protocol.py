@@ -1,3 +1,4 @@
+from collections.abc import Callable
 from typing import TYPE_CHECKING, Protocol
 
 if TYPE_CHECKING:
@@ -6,6 +7,10 @@ if TYPE_CHECKING:
     from mxbi.models.task import Feedback
     from mxbi.theater import Theater
 
+# Called exactly once with the task's feedback when its trial has ended, also
+# when it was ended through quit(), on_idle() or on_return().
+TaskDone = Callable[["Feedback"], None]
+
 
 class Task(Protocol):
     def __init__(
@@ -14,7 +19,7 @@ class Task(Protocol):
         session_state: "SessionState",
         animal_state: "AnimalState",
     ) -> None: ...
-    def start(self) -> "Feedback": ...
+    def start(self, on_done: TaskDone) -> None: ...
 
     def quit(self) -> None: ...
 
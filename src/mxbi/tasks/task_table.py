@@ -1,29 +1,75 @@
+from collections.abc import Iterable, Iterator, Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
+from importlib import import_module
+from threading import Lock
+from time import perf_counter
+
 from mxbi.models.task import TaskEnum
-from mxbi.tasks.cross_modal.stage import CrossModalTask
-from mxbi.tasks.default.error_task.error_scene import ErrorScene
-from mxbi.tasks.default.idle_task.idle_scene import IDLEScene
-from mxbi.tasks.default.initial_habituation_training.stages.initial_habituation_training_stage import (
-    InitialHabituationTrainingStage,
-)
-from mxbi.tasks.GNGSiD.stages.detect_stage.detect_stage import GNGSiDDetectStage
-from mxbi.tasks.GNGSiD.stages.discriminate_stage.discriminate_stage import (
-    GNGSiDDiscriminateStage,
-)
-from mxbi.tasks.GNGSiD.stages.size_reduction_stage.size_reduction_stage import (
-    SizeReductionStage,
-)
 from mxbi.tasks.task_protocol import Task
-from mxbi.tasks.two_alternative_choice.stages.size_reduction_stage.size_reduction_stage import (
-    TWOACSizeReductionStage,
-)
-
-task_table: dict[TaskEnum, type[Task]] = {
-    TaskEnum.IDEL: IDLEScene,
-    TaskEnum.ERROR: ErrorScene,
-    TaskEnum.HABITUATION: InitialHabituationTrainingStage,
-    TaskEnum.GNGSiD_SIZE_REDUCTION_STAGE: SizeReductionStage,
-    TaskEnum.GNGSiD_DETECT_STAGE: GNGSiDDetectStage,
-    TaskEnum.GNGSiD_DISCRIMINATE_STAGE: GNGSiDDiscriminateStage,
-    TaskEnum.TWOAC_SIZE_REDUCTION_STAGE: TWOACSizeReductionStage,
-    TaskEnum.CROSS_MODAL: CrossModalTask,
+from mxbi.utils.logger import logger
+
+# "module:attribute" per task; the module is imported on first use.
+TASK_IMPORT_PATHS: dict[TaskEnum, str] = {
+    TaskEnum.IDEL: "mxbi.tasks.default.idle_task.idle_scene:IDLEScene",
+    TaskEnum.ERROR: "mxbi.tasks.default.error_task.error_scene:ErrorScene",
+    TaskEnum.HABITUATION: "mxbi.tasks.default.initial_habituation_training.stages.initial_habituation_training_stage:InitialHabituationTrainingStage",
+    TaskEnum.GNGSiD_SIZE_REDUCTION_STAGE: "mxbi.tasks.GNGSiD.stages.size_reduction_stage.size_reduction_stage:SizeReductionStage",
+    TaskEnum.GNGSiD_DETECT_STAGE: "mxbi.tasks.GNGSiD.stages.detect_stage.detect_stage:GNGSiDDetectStage",
+    TaskEnum.GNGSiD_DISCRIMINATE_STAGE: "mxbi.tasks.GNGSiD.stages.discriminate_stage.discriminate_stage:GNGSiDDiscriminateStage",
+    TaskEnum.TWOAC_SIZE_REDUCTION_STAGE: "mxbi.tasks.two_alternative_choice.stages.size_reduction_stage.size_reduction_stage:TWOACSizeReductionStage",
+    TaskEnum.CROSS_MODAL: "mxbi.tasks.cross_modal.stage:CrossModalTask",
 }
+
+
+class LazyTaskTable(Mapping[TaskEnum, type[Task]]):
+    """TaskEnum -> task class, importing each task's module on first lookup."""
+
+    def __init__(self, import_paths: dict[TaskEnum, str]) -> None:
+        self._import_paths = import_paths
+        self._loaded: dict[TaskEnum, type[Task]] = {}
+        self._lock = Lock()
+        self.load_times: dict[TaskEnum, float] = {}
+
+    def __getitem__(self, task: TaskEnum) -> type[Task]:
+        loaded = self._loaded.get(task)
+        if loaded is not None:
+            return loaded
+
+        import_path = self._import_paths[task]
+        with self._lock:
+            loaded = self._loaded.get(task)
+            if loaded is None:
+                module_name, attr = import_path.split(":")
+                started = perf_counter()
+                loaded = getattr(import_module(module_name), attr)
+                self.load_times[task] = perf_counter() - started
+                self._loaded[task] = loaded
+                logger.debug(
+                    f"Loaded task {task} in {self.load_times[task] * 1000:.1f} ms"
+                )
+        return loaded
+
+    def __iter__(self) -> Iterator[TaskEnum]:
+        return iter(self._import_paths)
+
+    def __len__(self) -> int:
+        return len(self._import_paths)
+
+    def preload(self, tasks: Iterable[TaskEnum]) -> Future[None]:
+        """Import the given tasks on a background thread."""
+        pending = [task for task in dict.fromkeys(tasks) if task not in self._loaded]
+
+        def _preload() -> None:
+            for task in pending:
+                try:
+                    self[task]
+                except Exception:
+                    logger.exception(f"Failed to preload task {task}")
+
+        executor = ThreadPoolExecutor(1, thread_name_prefix="task_preload")
+        future = executor.submit(_preload)
+        executor.shutdown(wait=False)
+        return future
+
+
+task_table = LazyTaskTable(TASK_IMPORT_PATHS)
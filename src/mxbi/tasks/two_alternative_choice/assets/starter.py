@@ -1,27 +1,22 @@
-from tkinter import Canvas
+from tkinter import Misc
 
-from mxbi.utils.tkinter.create_circle import create_circle
+from PIL import ImageTk
 
+from mxbi.utils.tkinter.sprite_cache import sprite_cache
 
-class Starter(Canvas):
-    def __init__(self, master, size) -> None:
-        super().__init__(
-            master, width=size, height=size, bg="blue", highlightthickness=0
-        )
 
-        create_circle(
-            size * 0.5,
-            size * 0.5,
-            (size - 1) / 2,
-            self,
-            "white",
-        )
+def starter_target(master: Misc, size: int) -> ImageTk.PhotoImage:
+    # radius (size - 1) / 2
+    circles = [(0.5, 0.5, 2 * size / max(size - 1, 1), "white")]
+    return sprite_cache.get(master, "starter", size, "blue", circles)
 
 
 if __name__ == "__main__":
-    from tkinter import Tk
+    from tkinter import Canvas, Tk
 
     root = Tk()
     root.geometry("300x300")
-    Starter(root, 300).pack()
+    canvas = Canvas(root, width=300, height=300, highlightthickness=0)
+    canvas.create_image(0, 0, image=starter_target(root, 300), anchor="nw")
+    canvas.pack()
     root.mainloop()
@@ -45,6 +45,8 @@ class BaseTrialData(BaseModel):
     current_level_trial_id: int
     trial_start_time: float
     trial_end_time: float
+    # When the trial's stimulus reached the DAC; None if none was played
+    audio_onset_time: float | None = None
     result: Result
     correct_rate: float
     touch_events: list[TouchEvent]
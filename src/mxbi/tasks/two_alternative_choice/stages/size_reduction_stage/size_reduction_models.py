@@ -1,3 +1,4 @@
+from functools import cache
 from pathlib import Path
 
 from pydantic import BaseModel, ConfigDict, RootModel
@@ -32,11 +33,10 @@ class SizeReductionStageConfigs(RootModel):
     root: dict[MonkeyName, SizeReductionStageConfig]
 
 
+@cache
 def load_config() -> SizeReductionStageConfigs:
     configs = Configure(CONFIG_PATH, SizeReductionStageConfigs).value
     for config in configs.root.values():
         config.condition.level_count = len(config.levels_table)
     return configs
 
-
-config = load_config()
@@ -3,7 +3,7 @@ from typing import TYPE_CHECKING, Final
 from mxbi.data_logger import DataLogger, DataLoggerType
 from mxbi.tasks.two_alternative_choice.models import PersistentData, Result
 from mxbi.tasks.two_alternative_choice.stages.size_reduction_stage.size_reduction_models import (
-    config,
+    load_config,
 )
 from mxbi.tasks.two_alternative_choice.tasks.touch.touch_scene import TwoACTouchScene
 from mxbi.utils.logger import logger
@@ -12,9 +12,11 @@ if TYPE_CHECKING:
     from mxbi.models.animal import AnimalState, ScheduleCondition
     from mxbi.models.session import SessionState
     from mxbi.models.task import Feedback
+    from mxbi.tasks.task_protocol import TaskDone
     from mxbi.tasks.two_alternative_choice.stages.size_reduction_stage.size_reduction_models import (
         SizeReductionStageConfig,
     )
+    from mxbi.tasks.two_alternative_choice.tasks.touch.touch_models import TrialData
     from mxbi.theater import Theater
 
 _presistent_data: dict[str, PersistentData] = {}
@@ -68,8 +70,11 @@ class TWOACSizeReductionStage:
             self._presistent_data,
         )
 
-    def start(self) -> "Feedback":
-        trial_data = self._task.start()
+    def start(self, on_done: "TaskDone") -> None:
+        self._on_done = on_done
+        self._task.start(self._on_trial_end)
+
+    def _on_trial_end(self, trial_data: "TrialData") -> None:
         self._data_logger.save(trial_data.model_dump())
 
         feedback = self._handle_result(trial_data.result)
@@ -83,10 +88,11 @@ class TWOACSizeReductionStage:
             f"feedback={feedback}"
         )
 
-        return feedback
+        self._on_done(feedback)
 
     def _load_stage_config(self, monkey: str) -> "SizeReductionStageConfig":
-        stage_config = config.root.get(monkey) or config.root.get("default")
+        configs = load_config()
+        stage_config = configs.root.get(monkey) or configs.root.get("default")
         if stage_config is None:
             raise ValueError("No default stage config found")
         return stage_config
@@ -6,20 +6,23 @@ from typing import Callable
 from mss import mss, tools
 
 from mxbi.config import session_config
-from mxbi.data_logger import DataLogger, DataLoggerType
+from mxbi.data_logger import DataLogger, DataLoggerType, jsonl_writer
 from mxbi.models.session import SessionConfig, SessionState
 from mxbi.peripheral.audio_player.controller.controller import Controller
 from mxbi.peripheral.audio_player.controller.controller_factory import (
     AudioControllerEnum,
     AudioControllerFactory,
 )
-from mxbi.peripheral.pumps.pump_factory import PumpFactory
+from mxbi.peripheral.pumps.pump_factory import PumpEnum, PumpFactory
 from mxbi.peripheral.pumps.rewarder import Rewarder
 from mxbi.scheduler import Scheduler
+from mxbi.utils import clock
 from mxbi.utils.aplayer import APlayer
 from mxbi.utils.detect_platform import PlatformEnum
 from mxbi.utils.logger import logger
+from mxbi.utils.staged_init import StagedInitializer, StartupRecord
 from mxbi.utils.stimulus.standard_reward_stimulus import StandardRewardStimulus
+from mxbi.utils.tkinter.scene_layer import SceneLayer
 
 
 class Theater:
@@ -27,7 +30,7 @@ class Theater:
         self._config = session_config.value
         self._session_state = SessionState(
             session_id=DataLogger.init_session_id(),
-            start_time=datetime.now().timestamp(),
+            start_time=clock.now(),
             session_config=self._config,
         )
 
@@ -38,16 +41,42 @@ class Theater:
         # callback for quit event
         self._on_quit: list[Callable[[], None]] = []
 
-        self._rewarder = self._init_rewarder()
-        self._acontroller = self._init_audio_controller()
-        self._aplayer = APlayer(self)
+        # Peripherals do not depend on each other or on Tk, so they come up
+        # on worker threads while Tk (which must stay on this thread) starts.
+        startup = StagedInitializer()
+        startup.submit(
+            "rewarder",
+            self._init_rewarder,
+            fallback=lambda: PumpFactory.create(PumpEnum.MOCK),
+        )
+        startup.submit(
+            "audio_controller",
+            self._init_audio_controller,
+            fallback=lambda: AudioControllerFactory.create(AudioControllerEnum.MOCK),
+        )
+        startup.submit(
+            "aplayer",
+            lambda: APlayer(self),
+            fallback=lambda: APlayer(self, silent=True),
+        )
 
         # init theater
-        self._init_tk()
+        startup.run("tk", self._init_tk)
         self._bind_event()
 
-        self._scheduler = Scheduler(self)
+        ready = startup.join()
+        self._rewarder: Rewarder = ready["rewarder"]
+        self._acontroller: Controller = ready["audio_controller"]
+        self._aplayer: APlayer = ready["aplayer"]
+
+        self._scheduler = startup.run("scheduler", lambda: Scheduler(self))
+        self._startup_timeline = startup.timeline
+        self._session_state.startup_fallbacks = startup.fallbacks
+        logger.info(f"Startup ready in {startup.elapsed_ms:.0f} ms: {startup.summary()}")
+
+        # Every trial runs on this one loop until <Escape> ends the session.
         self._scheduler.start()
+        self.mainloop()
 
     @property
     def data_path(self) -> list[Path]:
@@ -83,15 +112,18 @@ class Theater:
         self._root.configure(bg="black")
         self._root.after(1000, lambda: self._root.attributes("-fullscreen", True))
 
+        self._scene_layer = SceneLayer(self._root, screen_type)
+
     def _bind_event(self) -> None:
         self._root.bind("<Escape>", self._quit)
 
     def _quit(self, _: Event) -> None:
-        self._session_state.end_time = datetime.now().timestamp()
+        self._session_state.end_time = clock.now()
         self._session_logger.save(self._session_state.model_dump())
         for callback in self._on_quit:
             callback()
 
+        jsonl_writer.close()
         self._root.destroy()
 
     def register_event_quit(self, callback: Callable[[], None]) -> None:
@@ -121,6 +153,10 @@ class Theater:
         except Exception as e:
             logger.error(f"Screenshot failed: {e}")
 
+    @property
+    def startup_timeline(self) -> list[StartupRecord]:
+        return self._startup_timeline
+
     @property
     def reward(self) -> Rewarder:
         return self._rewarder
@@ -140,11 +176,14 @@ class Theater:
     def root(self) -> Tk:
         return self._root
 
+    @property
+    def scene_layer(self) -> SceneLayer:
+        return self._scene_layer
+
     @property
     def session_config(self) -> SessionConfig:
         return self._config
 
 
 if __name__ == "__main__":
-    theater = Theater()
-    theater.root.mainloop()
+    Theater()
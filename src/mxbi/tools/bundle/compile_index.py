@@ -0,0 +1,34 @@
+from pathlib import Path
+
+import typer
+from rich import print
+
+from mxbi.tasks.cross_modal.bundle_dir import BundleValidationError, CrossModalBundleDir
+from mxbi.tasks.cross_modal.bundle_index import compile_bundle_index, trials_json_source
+
+
+def compile_index(bundle_dir: Path) -> None:
+    """Validate a bundle from its JSON and write its compiled trial index."""
+    root_dir = bundle_dir.expanduser().resolve()
+    print(f"[cyan]🔄 Validating {root_dir}...[/cyan]")
+    try:
+        bundle = CrossModalBundleDir.from_dir_path(root_dir, use_index=False)
+    except BundleValidationError as e:
+        print("[bold red]❌ Invalid bundle:[/bold red]")
+        for error in e.errors:
+            print(f"  - {error}")
+        raise typer.Exit(1)
+
+    subject_ids = bundle.subject_ids()
+    trials_by_subject = {s: bundle.load_trials(s) for s in subject_ids}
+    sources = {
+        s: trials_json_source(root_dir / "trial_sets" / s / "trials.json")
+        for s in subject_ids
+    }
+
+    index_dir = compile_bundle_index(root_dir, trials_by_subject, sources)
+    trial_count = sum(len(trials) for trials in trials_by_subject.values())
+    print(
+        f"[bold green]✅ Compiled[/bold green] {trial_count} trials for "
+        f"{len(subject_ids)} subjects into {index_dir}"
+    )
@@ -0,0 +1,22 @@
+from pathlib import Path
+
+import typer
+
+from mxbi.tools.bundle.compile_index import compile_index
+from mxbi.tools.bundle.warm_audio import warm_audio
+
+app = typer.Typer()
+
+
+@app.command()
+def warm(bundle_dir: Path) -> None:
+    warm_audio(bundle_dir)
+
+
+@app.command("compile")
+def compile_(bundle_dir: Path) -> None:
+    compile_index(bundle_dir)
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,46 @@
+from pathlib import Path
+
+import typer
+from rich import print
+
+from mxbi.tasks.cross_modal.bundle_dir import BundleValidationError, load_bundle_dir
+from mxbi.tasks.cross_modal.config import CrossModalConfig, load_cross_modal_config
+from mxbi.tasks.cross_modal.media_cache import decoded_audio
+
+
+def warm_audio(bundle_dir: Path) -> None:
+    """Decode every audio exemplar of a bundle into the decoded-audio store."""
+    try:
+        bundle = load_bundle_dir(bundle_dir.expanduser().resolve())
+    except BundleValidationError as e:
+        print("[bold red]❌ Invalid bundle:[/bold red]")
+        for error in e.errors:
+            print(f"  - {error}")
+        raise typer.Exit(1)
+
+    try:
+        audio_config = load_cross_modal_config().audio
+    except FileNotFoundError:
+        audio_config = CrossModalConfig().audio
+
+    audio_paths = sorted(
+        {
+            bundle.resolve_media_path(exemplar.relative_path)
+            for identity in bundle.manifest.identities
+            for exemplar in identity.audio_exemplars
+        }
+    )
+
+    print(f"[cyan]🔄 Decoding {len(audio_paths)} WAVs from {bundle.root_dir}...[/cyan]")
+    for audio_path in audio_paths:
+        decoded_audio.get(
+            audio_path,
+            rate_policy=audio_config.wav_rate_policy,
+            gain=audio_config.gain,
+        )
+
+    stats = decoded_audio.stats
+    print(
+        f"[bold green]✅ Done:[/bold green] {stats.misses} decoded, "
+        f"{stats.disk_hits} already stored"
+    )
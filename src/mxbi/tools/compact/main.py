@@ -0,0 +1,39 @@
+from pathlib import Path
+
+import typer
+from rich import print
+
+from mxbi.columnar import compact_all, compact_day, compact_recent
+from mxbi.path import DATA_DIR_PATH
+
+app = typer.Typer()
+
+
+@app.command()
+def run(
+    day: str | None = typer.Option(None, help="Only this day (YYYYMMDD)."),
+    all_days: bool = typer.Option(False, "--all", help="Every day in the data tree."),
+    force: bool = typer.Option(False, help="Rewrite files that are up to date."),
+    data_dir: Path = typer.Option(DATA_DIR_PATH, help="Data tree to compact."),
+) -> None:
+    """Write Parquet copies of the stage JSONL; today and yesterday by default."""
+    if not data_dir.is_dir():
+        print(f"[bold red]❌ Data directory not found:[/bold red] {data_dir}")
+        raise typer.Exit(1)
+
+    print(f"[cyan]🔄 Compacting trial logs in {data_dir}...[/cyan]")
+    if all_days:
+        written = compact_all(data_dir, force=force)
+    elif day is not None:
+        written = compact_day(day, data_dir, force=force)
+    else:
+        written = compact_recent(data_dir=data_dir, force=force)
+
+    for path in written:
+        print(f"[green]✅ Wrote:[/green] {path}")
+    if not written:
+        print("[green]✅ Everything is up to date[/green]")
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,114 @@
+import sys
+from pathlib import Path
+from tempfile import mkdtemp
+
+import typer
+from rich import print
+from rich.table import Table
+
+from mxbi.headless.load_test import run_load_test
+from mxbi.models.task import TaskEnum
+from mxbi.utils.logger import STDERR_HANDLER_ID, logger
+
+app = typer.Typer()
+
+
+@app.command()
+def run(
+    animals: int = typer.Option(8, help="Synthetic animals sharing the box."),
+    hours: float = typer.Option(8.0, help="Virtual session length."),
+    task: TaskEnum = typer.Option(TaskEnum.GNGSiD_DETECT_STAGE, help="Starting task."),
+    level: int = typer.Option(0, help="Starting level."),
+    dropouts: float = typer.Option(2.0, help="Reader dropouts per hour."),
+    errors: float = typer.Option(0.5, help="Reader errors per hour."),
+    sample_minutes: float = typer.Option(10.0, help="Memory sample interval."),
+    trace_memory: bool = typer.Option(True, help="Track allocations with tracemalloc."),
+    seed: int = 0,
+    data_dir: Path | None = typer.Option(
+        None, help="Where the session data goes; a fresh temp dir by default."
+    ),
+    log_level: str = typer.Option("WARNING", help="Console log level during the run."),
+) -> None:
+    """Drive the scheduler with synthetic animals on virtual time and report."""
+    data_dir = data_dir or Path(mkdtemp(prefix="mxbi-loadtest-"))
+    logger.remove(STDERR_HANDLER_ID)
+    logger.add(sys.stderr, level=log_level.upper())
+
+    print(
+        f"[cyan]🔄 {animals} animals, {hours:g} h of {task.value}, "
+        f"data in {data_dir}...[/cyan]"
+    )
+    report = run_load_test(
+        animals,
+        hours,
+        task=task,
+        level=level,
+        dropouts_per_hour=dropouts,
+        errors_per_hour=errors,
+        sample_every_s=sample_minutes * 60,
+        trace_memory=trace_memory,
+        seed=seed,
+        data_dir=data_dir,
+    )
+    stats = report.run
+
+    print(
+        f"[bold green]✅ {stats.trials} trials[/bold green] in "
+        f"{stats.virtual_s / 3600:.1f} virtual h, {stats.wall_s:.1f} s wall "
+        f"({stats.speedup:.0f}x): {report.trials_per_hour:.0f} trials/h, "
+        f"{stats.trials_per_wall_s:.0f} trials/s wall"
+    )
+    print(
+        f"  {report.visits} visits, {report.swaps} swaps, {report.dropouts} dropouts, "
+        f"{report.errors} reader errors, {report.touches} touches, "
+        f"{stats.rewards} rewards, {stats.events} timer events"
+    )
+
+    latency = Table(title="Detector event handling (ms)")
+    for column in ("event", "count", "mean", "max"):
+        latency.add_column(column, justify="left" if column == "event" else "right")
+    for event, histogram in report.latency.items():
+        latency.add_row(
+            event,
+            str(histogram["total"]),
+            f"{histogram['mean_ms']:.3f}",
+            f"{histogram['max_ms']:.3f}",
+        )
+    print(latency)
+
+    memory = Table(title="Memory")
+    for column in (
+        "virtual h",
+        "trials",
+        "traced KiB",
+        "animal states B",
+        "persistent data B",
+        "data loggers",
+        "open files",
+    ):
+        memory.add_column(column, justify="right")
+    for sample in report.samples:
+        memory.add_row(
+            f"{sample.virtual_s / 3600:.2f}",
+            str(sample.trials),
+            f"{sample.traced_bytes / 1024:.0f}",
+            str(sample.animal_states_bytes),
+            str(sample.persistent_data_bytes),
+            str(sample.data_loggers),
+            str(sample.open_files),
+        )
+    print(memory)
+
+    for metric in (
+        "traced_bytes",
+        "animal_states_bytes",
+        "persistent_data_bytes",
+        "data_loggers",
+    ):
+        growth = report.growth(metric)
+        if growth > 0:
+            print(f"[yellow]⚠️ {metric} grew by {growth} in the second half[/yellow]")
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,85 @@
+import sys
+from pathlib import Path
+from tempfile import mkdtemp
+
+import typer
+from rich import print
+from rich.table import Table
+
+from mxbi.headless.replay import ReplayError, find_sessions, replay_session
+from mxbi.utils.logger import STDERR_HANDLER_ID, logger
+
+app = typer.Typer()
+
+
+@app.command()
+def replay(
+    paths: list[Path] = typer.Argument(
+        ..., help="Session directories, or directories to search for sessions."
+    ),
+    verbose: bool = typer.Option(False, "--verbose", "-v", help="Print every step."),
+    log_level: str = typer.Option("WARNING", help="Console log level during replay."),
+) -> None:
+    """Replay recorded sessions in virtual time and diff their level/task trajectories."""
+    sessions = [session for path in paths for session in find_sessions(path.expanduser())]
+    if not sessions:
+        print("[bold red]❌ No session directories found[/bold red]")
+        raise typer.Exit(1)
+
+    # Replayed trials are logged like live ones; keep them out of the data dir.
+    data_dir = Path(mkdtemp(prefix="mxbi-replay-"))
+    logger.remove(STDERR_HANDLER_ID)
+    logger.add(sys.stderr, level=log_level.upper())
+
+    table = Table(title=f"Replayed {len(sessions)} sessions")
+    for column in ("session", "trials", "virtual h", "wall s", "steps", "result"):
+        table.add_column(column, justify="left" if column in ("session", "result") else "right")
+
+    diverged = 0
+    for session_dir in sessions:
+        try:
+            report = replay_session(session_dir, data_dir)
+        except ReplayError as e:
+            table.add_row(str(session_dir), "", "", "", "", f"[yellow]⚠️ {e}[/yellow]")
+            continue
+
+        counters = report.counters
+        steps = sum(len(diff.recorded) for diff in report.diffs)
+        if report.matches:
+            result = "[green]✅ match[/green]"
+        else:
+            diverged += 1
+            result = "[red]❌ " + ", ".join(
+                diff.animal for diff in report.diffs if not diff.matches
+            ) + "[/red]"
+        if not report.timestamped:
+            result += " [dim](untimed log)[/dim]"
+        table.add_row(
+            str(session_dir),
+            f"{counters.matched}/{counters.matched + counters.skipped}",
+            f"{report.run.virtual_s / 3600:.1f}",
+            f"{report.run.wall_s:.2f}",
+            str(steps),
+            result,
+        )
+
+        for diff in report.diffs:
+            divergence = diff.first_divergence
+            if divergence is None and not verbose:
+                continue
+            print(f"[bold]{session_dir} / {diff.animal}[/bold]")
+            for i in range(max(len(diff.recorded), len(diff.replayed))):
+                recorded = diff.recorded[i] if i < len(diff.recorded) else "—"
+                replayed = diff.replayed[i] if i < len(diff.replayed) else "—"
+                marker = "❌" if divergence is not None and i >= divergence else "  "
+                print(f"  {marker} recorded: {recorded}\n     replayed: {replayed}")
+
+    print(table)
+    if diverged:
+        print(f"[bold red]❌ {diverged} of {len(sessions)} sessions diverged[/bold red]")
+        raise typer.Exit(1)
+    print("[bold green]✅ All trajectories match[/bold green]")
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+from time import perf_counter
+
+import typer
+from rich import print
+from rich.table import Table
+
+from mxbi.data_logger import session_index, set_data_dir
+from mxbi.path import DATA_DIR_PATH
+
+app = typer.Typer()
+
+
+@app.command()
+def rebuild(data_dir: Path = typer.Option(DATA_DIR_PATH, help="Data tree to index.")) -> None:
+    """Index every session already on disk (the index fills itself from then on)."""
+    if not data_dir.is_dir():
+        print(f"[bold red]❌ Data directory not found:[/bold red] {data_dir}")
+        raise typer.Exit(1)
+
+    set_data_dir(data_dir)
+    index = session_index()
+    print(f"[cyan]🔄 Indexing {data_dir}...[/cyan]")
+    started = perf_counter()
+    found = index.rebuild()
+    print(
+        f"[bold green]✅ {found} sessions indexed[/bold green] in "
+        f"{perf_counter() - started:.1f} s: {index.path}"
+    )
+
+
+@app.command()
+def find(
+    animal: str | None = typer.Option(None, help="Only files of this animal."),
+    name: str | None = typer.Option(
+        None, help="Stage name (or task), 'scheduler' or 'session_data'."
+    ),
+    days: float | None = typer.Option(None, help="Only sessions of the last N days."),
+    data_dir: Path = typer.Option(DATA_DIR_PATH, help="Data tree to query."),
+) -> None:
+    """List the data files of matching sessions, oldest first."""
+    set_data_dir(data_dir)
+    since = datetime.now() - timedelta(days=days) if days is not None else None
+
+    started = perf_counter()
+    files = session_index().files(animal=animal, name=name, since=since)
+    elapsed_ms = (perf_counter() - started) * 1000
+
+    table = Table(title=f"{len(files)} files ({elapsed_ms:.1f} ms)")
+    for column in ("started", "session", "animal", "name", "path"):
+        table.add_column(column)
+    for file in files:
+        started_at = (
+            datetime.fromtimestamp(file.start_time).strftime("%Y-%m-%d %H:%M")
+            if file.start_time is not None
+            else ""
+        )
+        table.add_row(
+            started_at,
+            f"{file.date}/{file.session_id}",
+            file.animal,
+            file.name,
+            str(file.path),
+        )
+    print(table)
+
+
+if __name__ == "__main__":
+    app()
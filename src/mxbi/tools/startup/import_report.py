@@ -0,0 +1,78 @@
+import subprocess
+import sys
+from collections import defaultdict
+from dataclasses import dataclass
+
+import typer
+from rich import print
+from rich.table import Table
+
+from mxbi.tasks.task_table import TASK_IMPORT_PATHS
+
+DEFAULT_MODULES = ["mxbi.theater"]
+
+
+@dataclass(frozen=True)
+class ImportTime:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def measure_imports(modules: list[str]) -> list[ImportTime]:
+    """Import `modules` in a fresh interpreter under -X importtime."""
+    statement = "; ".join(f"import {module}" for module in modules)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        print(f"[bold red]❌ Import failed:[/bold red]\n{result.stderr[-2000:]}")
+        raise typer.Exit(result.returncode)
+
+    times: list[ImportTime] = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        stripped = name.lstrip()
+        depth = (len(name) - len(stripped) - 1) // 2
+        times.append(
+            ImportTime(stripped.strip(), int(self_us), int(cumulative_us), depth)
+        )
+
+    # Drop interpreter startup, which finishes with the top-level `site` import.
+    for i, t in enumerate(times):
+        if t.module == "site" and t.depth == 0:
+            return times[i + 1 :]
+    return times
+
+
+def import_report(modules: list[str], *, with_tasks: bool = False, top: int = 20) -> None:
+    """Print per-module and per-package import cost of a cold start."""
+    modules = modules or DEFAULT_MODULES
+    if with_tasks:
+        modules = modules + [path.split(":")[0] for path in TASK_IMPORT_PATHS.values()]
+
+    times = measure_imports(modules)
+    total_ms = sum(t.cumulative_us for t in times if t.depth == 0) / 1000
+    print(f"[cyan]🔄 import {', '.join(modules)}[/cyan]")
+    print(f"[bold green]✅ {len(times)} modules, {total_ms:.1f} ms total[/bold green]")
+
+    by_package: dict[str, int] = defaultdict(int)
+    for t in times:
+        by_package[t.module.split(".")[0]] += t.self_us
+
+    package_table = Table("package", "self ms", title="By top-level package")
+    for package, self_us in sorted(by_package.items(), key=lambda kv: -kv[1])[:top]:
+        package_table.add_row(package, f"{self_us / 1000:.1f}")
+    print(package_table)
+
+    module_table = Table("module", "self ms", "cumulative ms", title="Slowest modules")
+    for t in sorted(times, key=lambda t: -t.self_us)[:top]:
+        module_table.add_row(
+            t.module, f"{t.self_us / 1000:.1f}", f"{t.cumulative_us / 1000:.1f}"
+        )
+    print(module_table)
@@ -0,0 +1,25 @@
+import typer
+
+from mxbi.tools.startup.import_report import import_report
+
+app = typer.Typer()
+
+
+@app.callback()
+def main() -> None:
+    """Startup diagnostics."""
+
+
+@app.command()
+def imports(
+    modules: list[str] = typer.Argument(None),
+    with_tasks: bool = typer.Option(
+        False, "--with-tasks", help="Also import every task module, as startup did before lazy loading."
+    ),
+    top: int = 20,
+) -> None:
+    import_report(modules or [], with_tasks=with_tasks, top=top)
+
+
+if __name__ == "__main__":
+    app()
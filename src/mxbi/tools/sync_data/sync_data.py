@@ -5,9 +5,11 @@ import typer
 from rich import print
 
 from mxbi.path import (
+    CACHE_DIR_NAME,
     DATA_DIR_PATH,
     SAMBA_BACKUP_DIR_PATH,
     SAMBA_MOUNT_PATH,
+    STATE_DIR_NAME,
 )
 
 
@@ -34,6 +36,8 @@ def sync_data() -> None:
         "--progress",  # show progress bar
         "--backup",  # keep old versions of changed files
         f"--backup-dir={SAMBA_BACKUP_DIR_PATH}_{timestamp}",  # backup directory
+        f"--exclude=/{CACHE_DIR_NAME}",  # derived media caches
+        f"--exclude=/{STATE_DIR_NAME}",  # local run state (trial cursors)
         f"{DATA_DIR_PATH}/",  # source
         f"{SAMBA_MOUNT_PATH}/",  # destination
     ]
@@ -11,7 +11,12 @@ from mxbi.models.reward import RewardEnum
 from mxbi.models.session import ScreenTypeEnum, SessionConfig
 from mxbi.models.task import TaskEnum
 from mxbi.peripheral.pumps.pump_factory import PumpEnum
-from mxbi.tasks.cross_modal.bundle_dir import BundleValidationError, CrossModalBundleDir
+from mxbi.tasks.cross_modal.bundle_dir import (
+    BundleValidationError,
+    CrossModalBundleDir,
+    invalidate_bundle_cache,
+    load_bundle_dir,
+)
 from mxbi.tasks.cross_modal.config import (
     CrossModalConfig,
     load_cross_modal_config,
@@ -318,8 +323,9 @@ class LaunchPanel:
             return
 
         bundle_dir = Path(bundle_dir_str).expanduser().resolve()
+        invalidate_bundle_cache(bundle_dir)
         try:
-            bundle = CrossModalBundleDir.from_dir_path(bundle_dir)
+            bundle = load_bundle_dir(bundle_dir)
         except BundleValidationError as e:
             self._cross_modal_bundle = None
             self._set_cross_modal_subjects([])
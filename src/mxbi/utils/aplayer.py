@@ -1,9 +1,11 @@
 import wave
+from bisect import bisect_left
+from collections import OrderedDict
 from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from functools import lru_cache
 from pathlib import Path
-from threading import Event
+from threading import Event, Lock
 from typing import TYPE_CHECKING
 
 import numpy as np
@@ -11,6 +13,8 @@ import pyaudio
 from numpy.typing import NDArray
 from pydantic import BaseModel
 
+from mxbi.utils.audio_output import CallbackOutputEngine, NullOutputEngine
+
 if TYPE_CHECKING:
     from mxbi.theater import Theater
 
@@ -53,18 +57,209 @@ def _cached_wave_unit(frequency: int, duration: int) -> NDArray[np.int16]:
     return (tone * max_val).astype(np.int16)
 
 
+@dataclass(frozen=True)
+class StimulusCue:
+    offset: int  # samples
+    master_volume: int
+    digital_volume: int
+    lead: int = 0  # silent samples right before offset
+
+
+@dataclass(frozen=True)
+class CompiledStimulus:
+    """A whole stimulus sequence as one read-only buffer plus volume cue points."""
+
+    buffer: NDArray[np.int16]
+    cues: tuple[StimulusCue, ...] = ()
+
+    @property
+    def duration(self) -> int:
+        return int(len(self.buffer) / SAMPLE_RATE * 1000)
+
+
+_UnitKey = tuple[int | None, int | None, int, int | None, int | None]
+
+COMPILED_SEQUENCE_CACHE_SIZE = 16
+
+
+def _unit_duration(unit: StimulusSequenceUnit) -> int:
+    if unit.duration is not None:
+        return unit.duration + unit.interval
+    if unit.stimulus is not None:
+        return int(len(unit.stimulus) / SAMPLE_RATE * 1000)
+    raise ValueError(
+        "StimulusSequenceUnit must define duration or stimulus before sequencing"
+    )
+
+
+def _expand_sequence_count(units: list[StimulusSequenceUnit], duration: int) -> int:
+    """Number of units that fit into `duration` when cycling through `units`."""
+    unit_durations = [_unit_duration(unit) for unit in units]
+    cycle_duration = sum(unit_durations)
+
+    k, r = divmod(duration, cycle_duration)
+
+    count = k * len(units)
+    for dur in unit_durations:
+        if r >= dur:
+            r -= dur
+            count += 1
+        else:
+            break
+    return count
+
+
+class _RenderedSequence:
+    """Tiled rendering of one unit cycle, grown on demand and shared read-only."""
+
+    def __init__(self, units: list[StimulusSequenceUnit]) -> None:
+        self._units = units
+
+        pieces: list[NDArray[np.int16]] = []
+        self._unit_offsets: list[int] = []
+        self._unit_silences: list[int] = []
+        offset = 0
+        for unit in units:
+            self._unit_offsets.append(offset)
+            if unit.stimulus is not None:
+                pieces.append(unit.stimulus)
+                self._unit_silences.append(0)
+                offset += len(unit.stimulus)
+                continue
+            if unit.frequency is None or unit.duration is None:
+                raise ValueError(
+                    "StimulusSequenceUnit requires frequency and duration when stimulus is not provided"
+                )
+            tone = _cached_wave_unit(unit.frequency, unit.duration)
+            silence = _cached_wave_unit(0, unit.interval)
+            pieces.extend((tone, silence))
+            self._unit_silences.append(len(silence))
+            offset += len(tone) + len(silence)
+
+        self._cycle = np.concatenate(pieces) if pieces else np.zeros(0, np.int16)
+        self._cycle_samples = len(self._cycle)
+
+        self._cycles = 0
+        self._buffer = np.zeros(0, dtype=np.int16)
+        self._buffer.setflags(write=False)
+        self._cues: tuple[StimulusCue, ...] = ()
+        self._cue_offsets: list[int] = []
+
+    def compile(self, duration: int) -> CompiledStimulus:
+        unit_count = _expand_sequence_count(self._units, duration)
+        full_cycles, partial = divmod(unit_count, len(self._units))
+        self._ensure_cycles(full_cycles + (1 if partial else 0))
+
+        end = full_cycles * self._cycle_samples
+        if partial:
+            end += self._unit_offsets[partial]
+
+        cue_count = bisect_left(self._cue_offsets, end)
+        return CompiledStimulus(self._buffer[:end], self._cues[:cue_count])
+
+    def _ensure_cycles(self, cycles: int) -> None:
+        if cycles <= self._cycles:
+            return
+
+        # Grow geometrically so a session settles on a single rendering.
+        cycles = max(cycles, self._cycles * 2)
+        buffer = np.tile(self._cycle, cycles)
+        buffer.setflags(write=False)
+
+        cues: list[StimulusCue] = []
+        previous: tuple[int, int] | None = None
+        for cycle in range(cycles):
+            for index, (unit, unit_offset) in enumerate(
+                zip(self._units, self._unit_offsets)
+            ):
+                if unit.master_volume is None or unit.digital_volume is None:
+                    continue
+                volume = (unit.master_volume, unit.digital_volume)
+                if volume == previous:
+                    continue
+                previous = volume
+                first = cycle == 0 and index == 0
+                cues.append(
+                    StimulusCue(
+                        offset=cycle * self._cycle_samples + unit_offset,
+                        master_volume=unit.master_volume,
+                        digital_volume=unit.digital_volume,
+                        lead=0 if first else self._unit_silences[index - 1],
+                    )
+                )
+
+        self._buffer = buffer
+        self._cues = tuple(cues)
+        self._cue_offsets = [cue.offset for cue in cues]
+        self._cycles = cycles
+
+
+_rendered_sequences: OrderedDict[tuple[_UnitKey, ...], _RenderedSequence] = OrderedDict()
+_rendered_sequences_lock = Lock()
+
+
+def _unit_key(unit: StimulusSequenceUnit) -> _UnitKey:
+    return (
+        unit.frequency,
+        unit.duration,
+        unit.interval,
+        unit.master_volume,
+        unit.digital_volume,
+    )
+
+
+def compile_stimulus_sequence(
+    units: list[StimulusSequenceUnit], duration: int
+) -> CompiledStimulus:
+    """
+    Compile a stimulus sequence into a CompiledStimulus.
+
+    Tone-only sequences are rendered once per unit tuple (LRU cached) and every
+    requested duration is a zero-copy prefix of that rendering.
+    """
+    if any(unit.stimulus is not None for unit in units):
+        return _RenderedSequence(list(units)).compile(duration)
+
+    key = tuple(_unit_key(unit) for unit in units)
+    with _rendered_sequences_lock:
+        rendered = _rendered_sequences.get(key)
+        if rendered is None:
+            rendered = _RenderedSequence(
+                [
+                    StimulusSequenceUnit(
+                        frequency=frequency,
+                        duration=unit_duration,
+                        interval=interval,
+                        master_volume=master_volume,
+                        digital_volume=digital_volume,
+                    )
+                    for frequency, unit_duration, interval, master_volume, digital_volume in key
+                ]
+            )
+            _rendered_sequences[key] = rendered
+            if len(_rendered_sequences) > COMPILED_SEQUENCE_CACHE_SIZE:
+                _rendered_sequences.popitem(last=False)
+        else:
+            _rendered_sequences.move_to_end(key)
+
+        return rendered.compile(duration)
+
+
 class APlayer:
-    def __init__(self, theater: "Theater") -> None:
+    def __init__(self, theater: "Theater", *, silent: bool = False) -> None:
+        """`silent` keeps stimulus timing but opens no audio device."""
         self._theater = theater
+        self._closed = False
         self._executor = ThreadPoolExecutor(1)
-        self._player = pyaudio.PyAudio()
         self._stop_event = Event()
-        self._stream = self._player.open(
-            format=pyaudio.paInt16,
-            channels=1,
-            rate=SAMPLE_RATE,
-            output=True,
-        )
+        self._player: pyaudio.PyAudio | None = None
+        self._output: CallbackOutputEngine | NullOutputEngine
+        if silent:
+            self._output = NullOutputEngine(SAMPLE_RATE)
+        else:
+            self._player = pyaudio.PyAudio()
+            self._output = CallbackOutputEngine(self._player, SAMPLE_RATE)
+        self._output_latency = int(self._output.output_latency * SAMPLE_RATE)
 
     def _gen_wave_unit(self, tone_config: ToneConfig) -> NDArray[np.int16]:
         cached = _cached_wave_unit(
@@ -117,52 +312,25 @@ class APlayer:
         self, units: list[StimulusSequenceUnit], duration: int
     ) -> list[StimulusSequenceUnit]:
         """Expand stimulus units to fill the target duration while supporting per-unit volume overrides."""
-        unit_durations: list[int] = []
-        for unit in units:
-            if unit.duration is not None:
-                unit_durations.append(unit.duration + unit.interval)
-            elif unit.stimulus is not None:
-                unit_ms = int(len(unit.stimulus) / SAMPLE_RATE * 1000)
-                unit_durations.append(unit_ms)
-            else:
-                raise ValueError(
-                    "StimulusSequenceUnit must define duration or stimulus before sequencing"
-                )
-
-        cycle_duration = sum(unit_durations)
-
-        k, r = divmod(duration, cycle_duration)
-
-        sequence = [self._gen_stimulus_unit(u) for _ in range(k) for u in units]
+        count = _expand_sequence_count(units, duration)
+        return [self._gen_stimulus_unit(units[i % len(units)]) for i in range(count)]
 
-        for unit, dur in zip(units, unit_durations):
-            if r >= dur:
-                r -= dur
-                sequence.append(self._gen_stimulus_unit(unit))
-            else:
-                break
-
-        return sequence
+    def compile_stimulus_sequence(
+        self, units: list[StimulusSequenceUnit], duration: int
+    ) -> CompiledStimulus:
+        """Same expansion as generate_stimulus_sequence, as one cached read-only buffer."""
+        return compile_stimulus_sequence(units, duration)
 
     def _play_stimulus(self, stimulus: "NDArray[np.int16]"):
         """Internal helper for playback when no per-tone volume changes are needed."""
-        data = stimulus.tobytes()
-        chunk_size = 1024
-
-        offset = 0
-        while chunk := data[offset : offset + chunk_size]:
-            if self._stop_event.is_set():
-                self._stop_event.clear()
-                return False
-
-            self._stream.write(chunk)
-            offset += chunk_size
-
-        self._stop_event.clear()
-        return True
+        self._output.mark_onset()
+        if not self._write_samples(stimulus):
+            return False
+        return self._drain()
 
     def _play_stimulus_sequence(self, tones: list[StimulusSequenceUnit]) -> bool:
         """Internal helper that applies volume overrides before each stimulus unit."""
+        self._output.mark_onset()
         for tone in tones:
             if tone.master_volume is not None and tone.digital_volume is not None:
                 self._theater.acontroller.set_master_volume(tone.master_volume)
@@ -171,18 +339,45 @@ class APlayer:
             if tone.stimulus is None:
                 continue
 
-            data = tone.stimulus.tobytes()
-            chunk_size = 1024
+            if not self._write_samples(tone.stimulus):
+                return False
 
-            offset = 0
-            while chunk := data[offset : offset + chunk_size]:
-                if self._stop_event.is_set():
-                    self._stop_event.clear()
-                    return False
+        return self._drain()
 
-                self._stream.write(chunk)
-                offset += chunk_size
+    def _play_compiled_stimulus(self, stimulus: CompiledStimulus) -> bool:
+        """Internal helper that applies volume cues while streaming one shared buffer."""
+        base = self._output.mark_onset()
+        position = 0
+        for cue in stimulus.cues:
+            if not self._write_samples(stimulus.buffer[position : cue.offset]):
+                return False
+            position = cue.offset
+
+            # The mixer acts on what is audible now, which trails what the
+            # device has been handed by the output latency. Switch once the
+            # previous tone has been heard, so the change settles in the gap
+            # before the boundary while the rest of the gap is still queued.
+            apply_at = cue.offset - cue.lead + min(cue.lead, self._output_latency)
+            if not self._output.wait_until(base + apply_at):
+                self._stop_event.clear()
+                return False
+            self._theater.acontroller.set_master_volume(cue.master_volume)
+            self._theater.acontroller.set_digital_volume(cue.digital_volume)
+
+        if not self._write_samples(stimulus.buffer[position:]):
+            return False
+        return self._drain()
+
+    def _write_samples(self, samples: "NDArray[np.int16]") -> bool:
+        if self._stop_event.is_set() or not self._output.write(samples):
+            self._stop_event.clear()
+            return False
+        return True
 
+    def _drain(self) -> bool:
+        if not self._output.drain():
+            self._stop_event.clear()
+            return False
         self._stop_event.clear()
         return True
 
@@ -222,19 +417,12 @@ class APlayer:
                         )
 
                     chunk_size = 1024
-                    while True:
-                        if self._stop_event.is_set():
-                            self._stop_event.clear()
+                    self._output.mark_onset()
+                    while data := wf.readframes(chunk_size):
+                        if not self._write_samples(np.frombuffer(data, np.int16)):
                             return False
 
-                        data = wf.readframes(chunk_size)
-                        if not data:
-                            break
-
-                        self._stream.write(data)
-
-                self._stop_event.clear()
-                return True
+                return self._drain()
 
             except Exception as e:
                 print(f"[APlayer] Error playing WAV file {wav_path}: {e}")
@@ -253,13 +441,31 @@ class APlayer:
         self._stop_event.clear()
         return self._executor.submit(self._play_stimulus_sequence, tones)
 
+    def play_compiled_stimulus(self, stimulus: CompiledStimulus) -> Future[bool]:
+        """Play a compiled sequence, applying its volume cues at the unit boundaries."""
+        self._stop_event.clear()
+        return self._executor.submit(self._play_compiled_stimulus, stimulus)
+
+    @property
+    def last_onset(self) -> float | None:
+        """Wall-clock time the last started stimulus reached the DAC, if it has."""
+        return self._output.onset
+
     def stop(self) -> None:
         self._stop_event.set()
+        self._output.flush()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._output.close()
+        if self._player is not None:
+            self._player.terminate()
+        self._executor.shutdown(wait=False)
 
     def __del__(self) -> None:
-        self._stream.close()
-        self._player.terminate()
-        self._executor.shutdown(wait=False)
+        self.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,243 @@
+from threading import Condition
+from time import monotonic, time
+
+import numpy as np
+import pyaudio
+from numpy.typing import NDArray
+
+FRAMES_PER_BUFFER = 256
+RING_SECONDS = 1.0
+
+
+class CallbackOutputEngine:
+    """
+    Mono int16 PyAudio output driven by the stream callback.
+
+    Producers copy samples into a pre-allocated ring buffer; the PortAudio
+    thread drains it and plays silence on underrun. Positions are counted in
+    samples since the stream was opened, so flush() drops everything queued
+    at a sample boundary and a marked position can be resolved to the time
+    it reaches the DAC.
+    """
+
+    def __init__(
+        self,
+        player: pyaudio.PyAudio,
+        rate: int,
+        frames_per_buffer: int = FRAMES_PER_BUFFER,
+        ring_seconds: float = RING_SECONDS,
+    ) -> None:
+        self._rate = rate
+        self._ring = np.zeros(max(int(rate * ring_seconds), frames_per_buffer), np.int16)
+        self._scratch = np.zeros(frames_per_buffer, np.int16)
+        self._silence = bytes(frames_per_buffer * 2)
+
+        self._cond = Condition()
+        self._read_pos = 0
+        self._write_pos = 0
+        self._generation = 0
+
+        self._mark: int | None = None
+        self._onset: float | None = None
+
+        self._stream = player.open(
+            format=pyaudio.paInt16,
+            channels=1,
+            rate=rate,
+            output=True,
+            frames_per_buffer=frames_per_buffer,
+            stream_callback=self._callback,
+        )
+        self._latency = self._stream.get_output_latency()
+
+    @property
+    def output_latency(self) -> float:
+        return self._latency
+
+    def mark_onset(self) -> int:
+        """Time the next written sample when it reaches the DAC; returns its position."""
+        with self._cond:
+            self._mark = self._write_pos
+            self._onset = None
+            return self._write_pos
+
+    @property
+    def onset(self) -> float | None:
+        """Wall-clock DAC time of the last marked sample, once it has played."""
+        with self._cond:
+            return self._onset
+
+    def write(self, samples: NDArray[np.int16]) -> bool:
+        """Queue samples, blocking while the ring is full. False if flushed meanwhile."""
+        capacity = len(self._ring)
+        total = len(samples)
+        written = 0
+
+        with self._cond:
+            generation = self._generation
+            while written < total:
+                while (
+                    self._write_pos - self._read_pos >= capacity
+                    and generation == self._generation
+                ):
+                    self._cond.wait()
+                if generation != self._generation:
+                    return False
+
+                free = capacity - (self._write_pos - self._read_pos)
+                start = self._write_pos % capacity
+                count = min(total - written, free, capacity - start)
+                self._ring[start : start + count] = samples[written : written + count]
+                written += count
+                self._write_pos += count
+
+        return True
+
+    def wait_until(self, position: int) -> bool:
+        """Wait until the device has been handed every sample before `position`."""
+        with self._cond:
+            generation = self._generation
+            while (
+                self._read_pos < min(position, self._write_pos)
+                and generation == self._generation
+            ):
+                self._cond.wait()
+            return generation == self._generation
+
+    def drain(self) -> bool:
+        with self._cond:
+            position = self._write_pos
+        return self.wait_until(position)
+
+    def flush(self) -> None:
+        with self._cond:
+            self._read_pos = self._write_pos
+            self._mark = None
+            self._generation += 1
+            self._cond.notify_all()
+
+    def close(self) -> None:
+        self.flush()
+        self._stream.stop_stream()
+        self._stream.close()
+
+    def _callback(self, _in_data, frame_count: int, time_info: dict, _status: int):
+        if frame_count > len(self._scratch):
+            self._scratch = np.zeros(frame_count, np.int16)
+            self._silence = bytes(frame_count * 2)
+
+        with self._cond:
+            available = min(self._write_pos - self._read_pos, frame_count)
+            if available == 0:
+                return self._silence[: frame_count * 2], pyaudio.paContinue
+
+            capacity = len(self._ring)
+            start = self._read_pos % capacity
+            head = min(available, capacity - start)
+            out = self._scratch[:frame_count]
+            out[:head] = self._ring[start : start + head]
+            out[head:available] = self._ring[: available - head]
+            out[available:] = 0
+
+            if self._mark is not None and self._mark < self._read_pos + available:
+                self._onset = self._dac_time(time_info) + (
+                    self._mark - self._read_pos
+                ) / self._rate
+                self._mark = None
+
+            self._read_pos += available
+            self._cond.notify_all()
+
+        # PyAudio only accepts bytes back from the callback.
+        return out.tobytes(), pyaudio.paContinue
+
+    def _dac_time(self, time_info: dict) -> float:
+        dac = time_info.get("output_buffer_dac_time", 0.0)
+        now = time_info.get("current_time", 0.0)
+        if dac and now:
+            return time() + (dac - now)
+        return time() + self._latency
+
+
+class NullOutputEngine:
+    """
+    Same interface as CallbackOutputEngine with no device behind it.
+
+    Samples are consumed at `rate` in real time, so waits, drains and onsets
+    behave like a real stream; used when the audio device cannot be opened.
+    """
+
+    def __init__(self, rate: int) -> None:
+        self._rate = rate
+        self._cond = Condition()
+        self._write_pos = 0
+        self._generation = 0
+        # Playback clock: sample _anchor_pos was consumed at monotonic _anchor.
+        self._anchor_pos = 0
+        self._anchor = monotonic()
+
+        self._mark: int | None = None
+        self._onset: float | None = None
+
+    @property
+    def output_latency(self) -> float:
+        return 0.0
+
+    def mark_onset(self) -> int:
+        with self._cond:
+            self._mark = self._write_pos
+            self._onset = None
+            return self._write_pos
+
+    @property
+    def onset(self) -> float | None:
+        with self._cond:
+            if self._onset is None or self._onset > time():
+                return None
+            return self._onset
+
+    def write(self, samples: NDArray[np.int16]) -> bool:
+        with self._cond:
+            if self._read_pos() >= self._write_pos:
+                # Idle until now: playback restarts with these samples.
+                self._anchor_pos = self._write_pos
+                self._anchor = monotonic()
+            if self._mark == self._write_pos and len(samples):
+                delay = (self._write_pos - self._read_pos()) / self._rate
+                self._onset = time() + delay
+                self._mark = None
+            self._write_pos += len(samples)
+        return True
+
+    def wait_until(self, position: int) -> bool:
+        with self._cond:
+            generation = self._generation
+            while generation == self._generation:
+                target = min(position, self._write_pos)
+                remaining = (target - self._read_pos()) / self._rate
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            return generation == self._generation
+
+    def drain(self) -> bool:
+        with self._cond:
+            position = self._write_pos
+        return self.wait_until(position)
+
+    def flush(self) -> None:
+        with self._cond:
+            self._anchor_pos = self._write_pos
+            self._anchor = monotonic()
+            self._mark = None
+            if self._onset is not None and self._onset > time():
+                self._onset = None
+            self._generation += 1
+            self._cond.notify_all()
+
+    def close(self) -> None:
+        self.flush()
+
+    def _read_pos(self) -> int:
+        elapsed = int((monotonic() - self._anchor) * self._rate)
+        return min(self._write_pos, self._anchor_pos + elapsed)
@@ -0,0 +1,23 @@
+"""
+Timestamps for session, scheduler and trial records.
+
+Code that stamps session data or decides on elapsed session time reads now()
+instead of the system clock, so a headless run can substitute its virtual
+clock with set_source().
+"""
+
+from time import time
+from typing import Callable
+
+_source: Callable[[], float] = time
+
+
+def now() -> float:
+    """Seconds since the epoch, like time.time()."""
+    return _source()
+
+
+def set_source(source: Callable[[], float] | None) -> None:
+    """Use `source` for now(); None restores the system clock."""
+    global _source
+    _source = time if source is None else source
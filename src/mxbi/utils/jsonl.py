@@ -0,0 +1,19 @@
+import json
+from pathlib import Path
+from typing import Any, Iterator
+
+from mxbi.utils.logger import logger
+
+
+def read_jsonl(path: Path) -> Iterator[dict[str, Any]]:
+    """The records of a JSONL data file; blank and unreadable lines are skipped."""
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                # A crash can leave a partial last line.
+                logger.warning(f"Skipping unreadable line in {path}")
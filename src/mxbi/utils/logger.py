@@ -6,7 +6,7 @@ from mxbi.path import LOG_PATH
 
 logger.remove()
 
-logger.add(sys.stderr, level="DEBUG")
+STDERR_HANDLER_ID = logger.add(sys.stderr, level="DEBUG")
 
 logger.add(
     f"{LOG_PATH}/mxbi.log",
@@ -0,0 +1,171 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from enum import StrEnum, auto
+from functools import partial
+from threading import current_thread
+from time import perf_counter
+from typing import Any, Callable, TypeVar
+
+from mxbi.utils.logger import logger
+
+T = TypeVar("T")
+
+COMPONENT_TIMEOUT_S = 10.0
+
+
+class StartupStatus(StrEnum):
+    READY = auto()
+    TIMEOUT = auto()
+    FAILED = auto()
+    FALLBACK = auto()
+
+
+@dataclass(frozen=True)
+class StartupRecord:
+    component: str
+    thread: str
+    start_ms: float  # since the initializer was created
+    end_ms: float
+    status: StartupStatus
+    error: str | None = None
+
+    @property
+    def duration_ms(self) -> float:
+        return self.end_ms - self.start_ms
+
+
+@dataclass
+class _Pending:
+    future: Future[Any]
+    fallback: Callable[[], Any] | None
+
+
+class StagedInitializer:
+    """
+    Brings up independent components concurrently and joins them on one barrier.
+
+    submit() starts a component on the pool; run() does a step inline (for
+    things bound to the calling thread, like Tk). join() waits for everything
+    submitted until one shared deadline. A component that fails or misses the
+    deadline is replaced by its fallback; without one the error is raised.
+    One that misses the deadline but comes up later is close()d, so it does
+    not hold its device next to the fallback. Every step lands in `timeline`
+    and every fallback in `fallbacks`.
+    """
+
+    def __init__(self, timeout: float = COMPONENT_TIMEOUT_S, max_workers: int = 4) -> None:
+        self._timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="startup")
+        self._pending: dict[str, _Pending] = {}
+        self._started = perf_counter()
+        self.timeline: list[StartupRecord] = []
+        self.fallbacks: dict[str, str] = {}
+
+    def submit(
+        self,
+        component: str,
+        init: Callable[[], Any],
+        fallback: Callable[[], Any] | None = None,
+    ) -> None:
+        future = self._executor.submit(self._timed, component, init)
+        self._pending[component] = _Pending(future, fallback)
+
+    def run(self, component: str, step: Callable[[], T]) -> T:
+        return self._timed(component, step)
+
+    def join(self) -> dict[str, Any]:
+        """Wait for every submitted component; returns them (or their fallbacks) by name."""
+        deadline = self._started + self._timeout
+        ready: dict[str, Any] = {}
+
+        for component, pending in self._pending.items():
+            try:
+                ready[component] = pending.future.result(
+                    timeout=max(deadline - perf_counter(), 0.0)
+                )
+                continue
+            except FutureTimeoutError:
+                status, error = StartupStatus.TIMEOUT, f"not ready after {self._timeout}s"
+                self._record(component, self._started, status, error)
+                if not pending.future.cancel():
+                    pending.future.add_done_callback(partial(_close_late, component))
+            except Exception as e:
+                # _timed() already recorded the failure.
+                status, error = StartupStatus.FAILED, repr(e)
+                if pending.fallback is None:
+                    raise
+
+            if pending.fallback is None:
+                raise TimeoutError(f"{component} {error}")
+
+            logger.warning(f"Startup: {component} {status}: {error}, using fallback")
+            self.fallbacks[component] = f"{status}: {error}"
+            ready[component] = self._timed(
+                f"{component}:fallback",
+                pending.fallback,
+                status=StartupStatus.FALLBACK,
+            )
+
+        self._pending.clear()
+        # Never block on a component that is still stuck in its initializer.
+        self._executor.shutdown(wait=False)
+        return ready
+
+    def summary(self) -> str:
+        return ", ".join(
+            f"{r.component}={r.duration_ms:.0f}ms"
+            + ("" if r.status == StartupStatus.READY else f" ({r.status})")
+            for r in self.timeline
+        )
+
+    @property
+    def elapsed_ms(self) -> float:
+        return (perf_counter() - self._started) * 1000
+
+    def _timed(
+        self,
+        component: str,
+        step: Callable[[], T],
+        status: StartupStatus = StartupStatus.READY,
+    ) -> T:
+        start = perf_counter()
+        try:
+            result = step()
+        except Exception as e:
+            self._record(component, start, StartupStatus.FAILED, repr(e))
+            raise
+        self._record(component, start, status)
+        return result
+
+    def _record(
+        self,
+        component: str,
+        start: float,
+        status: StartupStatus,
+        error: str | None = None,
+    ) -> None:
+        self.timeline.append(
+            StartupRecord(
+                component=component,
+                thread=current_thread().name,
+                start_ms=(start - self._started) * 1000,
+                end_ms=(perf_counter() - self._started) * 1000,
+                status=status,
+                error=error,
+            )
+        )
+
+
+def _close_late(component: str, future: Future[Any]) -> None:
+    """Close a component that came up after join() had replaced it."""
+    if future.exception() is not None:
+        return
+    close = getattr(future.result(), "close", None)
+    if close is None:
+        return
+    logger.warning(f"Startup: {component} ready after its deadline, closing it")
+    try:
+        close()
+    except Exception as e:
+        logger.error(f"Startup: failed to close late {component}: {e}")
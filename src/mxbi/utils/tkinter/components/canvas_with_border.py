@@ -50,3 +50,8 @@ class CanvasWithInnerBorder(Canvas):
     def set_border_width(self, width: int) -> None:
         self._border_width = max(1, width)
         self._draw_border()
+
+    def clear(self) -> None:
+        self.delete("all")
+        self.configure(bg=self._border_color)
+        self._draw_border()
@@ -0,0 +1,182 @@
+import re
+from collections.abc import Callable
+from tkinter import Misc
+from typing import TYPE_CHECKING
+
+from mxbi.utils.tkinter.components.canvas_with_border import CanvasWithInnerBorder
+from mxbi.utils.tkinter.components.showdata_widget import ShowDataWidget
+
+if TYPE_CHECKING:
+    from tkinter import PhotoImage
+
+    from PIL import ImageTk
+
+    from mxbi.models.session import ScreenConfig
+
+# The Tcl command a tkinter binding script calls: 'if {"[<funcid> %# ...'
+_BOUND_COMMAND = re.compile(r"\[(\S+) ")
+
+
+class RetainedCanvas(CanvasWithInnerBorder):
+    """A background canvas that can cancel the after() callbacks scheduled on it."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._pending: set[str] = set()
+
+    def after(self, ms, func=None, *args):
+        if func is None:
+            return super().after(ms)
+
+        def callback(*callback_args):
+            self._pending.discard(after_id)
+            func(*callback_args)
+
+        after_id = super().after(ms, callback, *args)
+        self._pending.add(after_id)
+        return after_id
+
+    def after_cancel(self, id) -> None:
+        self._pending.discard(id)
+        super().after_cancel(id)
+
+    def cancel_pending(self) -> None:
+        for after_id in self._pending:
+            super().after_cancel(after_id)
+        self._pending.clear()
+
+
+class SceneLayer:
+    """
+    The background canvas and data overlay shared by every scene of a session.
+
+    Scenes acquire() the background instead of building their own and
+    release() it instead of destroying it. What a scene shows goes through
+    image(), rectangle() and text(): each tag names one canvas item that is
+    created the first time it is drawn and only moved and reconfigured after
+    that; remove() takes the place of destroying a target widget, dropping the
+    item's bindings and the timers scheduled for it with after(). Releasing
+    cancels the callbacks and bindings the scene left on the background,
+    removes those items and hides the layer, so the next scene starts from a
+    clean canvas without any widget or item being rebuilt.
+    """
+
+    def __init__(self, root: Misc, screen: "ScreenConfig", border_width: int = 40) -> None:
+        self._screen = screen
+        self._background = RetainedCanvas(
+            master=root,
+            bg="black",
+            width=screen.width,
+            height=screen.height,
+            border_width=border_width,
+        )
+        self._overlay = ShowDataWidget(self._background)
+        self._items: set[str] = set()
+        self._timers: dict[str, set[str]] = {}
+        self._owner: object | None = None
+
+    def acquire(self, owner: object, show_overlay: bool = True) -> RetainedCanvas:
+        if self._owner is not None:
+            self._reset()
+        self._owner = owner
+
+        self._background.place(relx=0.5, rely=0.5, anchor="center")
+        if show_overlay:
+            self._overlay.place(relx=0, rely=1, anchor="sw")
+        else:
+            self._overlay.place_forget()
+        self._background.focus_set()
+        return self._background
+
+    def release(self, owner: object) -> bool:
+        """Hide the layer if `owner` still holds it; stale releases are ignored."""
+        if owner is not self._owner:
+            return False
+
+        self._reset()
+        self._background.place_forget()
+        self._owner = None
+        return True
+
+    def image(
+        self, tag: str, image: "PhotoImage | ImageTk.PhotoImage", x: float, y: float
+    ) -> str:
+        """Show `image` centred on (x, y) as the item `tag`."""
+        return self._draw(tag, "image", (x, y), {"image": image})
+
+    def rectangle(self, tag: str, fill: str) -> str:
+        """Cover the whole screen with `fill` as the item `tag`."""
+        return self._draw(
+            tag,
+            "rectangle",
+            (0, 0, self._screen.width, self._screen.height),
+            {"fill": fill, "outline": ""},
+        )
+
+    def text(self, tag: str, x: float, y: float, text: str, **options) -> str:
+        """Show `text` centred on (x, y) as the item `tag`."""
+        return self._draw(tag, "text", (x, y), {"text": text, **options})
+
+    def hide(self, *tags: str) -> None:
+        for tag in tags:
+            self._background.itemconfigure(tag, state="hidden")
+
+    def remove(self, *tags: str) -> None:
+        """Hide the items and drop their bindings until they are drawn again."""
+        for tag in tags:
+            for sequence in self._background.tag_bind(tag):
+                self.unbind(sequence, tag)
+            for after_id in self._timers.pop(tag, ()):
+                self._background.after_cancel(after_id)
+        self.hide(*tags)
+
+    def after(self, tag: str, ms: int, func: Callable, *args) -> str:
+        """Schedule `func` on the background until the item `tag` is removed."""
+        after_id = self._background.after(ms, func, *args)
+        self._timers.setdefault(tag, set()).add(after_id)
+        return after_id
+
+    def bind_item(self, tag: str, sequence: str, handler: Callable) -> None:
+        """Bind `handler` to the item `tag`, replacing its previous handler."""
+        self.unbind(sequence, tag)
+        self._background.tag_bind(tag, sequence, handler)
+
+    def unbind(self, sequence: str, tag: str | None = None) -> None:
+        """Drop the background's (or the item `tag`'s) handlers for `sequence`."""
+        # unbind() without a funcid leaves the handlers registered, which
+        # would keep every released scene alive; delete them as well.
+        if tag is None:
+            script = self._background.bind(sequence)
+            self._background.unbind(sequence)
+        else:
+            script = self._background.tag_bind(tag, sequence)
+            self._background.tag_unbind(tag, sequence)
+        for funcid in _BOUND_COMMAND.findall(script):
+            self._background.deletecommand(funcid)
+
+    @property
+    def background(self) -> RetainedCanvas:
+        return self._background
+
+    @property
+    def overlay(self) -> ShowDataWidget:
+        return self._overlay
+
+    def _draw(self, tag: str, kind: str, coords: tuple, options: dict) -> str:
+        if tag in self._items:
+            self._background.coords(tag, *coords)
+            self._background.itemconfigure(tag, state="normal", **options)
+        else:
+            create = getattr(self._background, f"create_{kind}")
+            create(*coords, tags=tag, **options)
+            self._items.add(tag)
+        self._background.tag_raise(tag)
+        return tag
+
+    def _reset(self) -> None:
+        self._background.cancel_pending()
+        self._timers.clear()
+        for sequence in self._background.bind():
+            self.unbind(sequence)
+        self.remove(*self._items)
+        self._overlay.show_data({})
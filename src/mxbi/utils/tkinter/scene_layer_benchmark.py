@@ -0,0 +1,104 @@
+"""
+Per-trial setup/teardown cost of fresh scene widgets vs the retained SceneLayer.
+
+Each simulated trial builds the view a GNGSiD scene builds (background, data
+overlay, one target, a pending timeout), lets Tk lay it out, then tears it
+down. The fresh variant gives the target its own canvas, the retained one
+moves a layer item. Reports the time per trial and how many Tk widgets were
+created.
+Needs a display (on the box, or under xvfb-run).
+
+    uv run python -m mxbi.utils.tkinter.scene_layer_benchmark [trials]
+"""
+
+import sys
+from time import perf_counter
+from tkinter import Canvas, Tk
+
+from PIL import ImageTk
+
+from mxbi.models.session import ScreenConfig
+from mxbi.utils.tkinter.components.canvas_with_border import CanvasWithInnerBorder
+from mxbi.utils.tkinter.components.showdata_widget import ShowDataWidget
+from mxbi.utils.tkinter.scene_layer import SceneLayer
+from mxbi.utils.tkinter.sprite_cache import render_circles
+
+TRIALS = 500
+DATA = {"name": "mock", "id": 1, "level_id": 1, "level": 0, "rewards": 0}
+
+
+def _widget_count(root: Tk) -> int:
+    return int(root.tk.eval("llength [info commands .!*]"))
+
+
+def _place_target(background: Canvas) -> None:
+    target = Canvas(background, width=200, height=200, bg="black", highlightthickness=0)
+    target.create_oval(0, 0, 200, 200, fill="white")
+    target.place(relx=0.5, rely=0.5, anchor="center")
+    background.after(60_000, lambda: None)
+
+
+def run_fresh(root: Tk, screen: ScreenConfig, trials: int) -> tuple[float, int]:
+    created = 0
+    started = perf_counter()
+    for _ in range(trials):
+        before = _widget_count(root)
+        background = CanvasWithInnerBorder(
+            master=root,
+            bg="black",
+            width=screen.width,
+            height=screen.height,
+            border_width=40,
+        )
+        background.place(relx=0.5, rely=0.5, anchor="center")
+        overlay = ShowDataWidget(background)
+        overlay.place(relx=0, rely=1, anchor="sw")
+        overlay.show_data(DATA)
+        _place_target(background)
+        root.update()
+        created += _widget_count(root) - before
+
+        background.destroy()
+        root.update()
+    return perf_counter() - started, created
+
+
+def run_retained(root: Tk, screen: ScreenConfig, trials: int) -> tuple[float, int]:
+    layer = SceneLayer(root, screen)
+    target = ImageTk.PhotoImage(
+        render_circles(200, "black", [(0.5, 0.5, 2, "white")]), master=root
+    )
+    created = 0
+    started = perf_counter()
+    for trial in range(trials):
+        before = _widget_count(root)
+        background = layer.acquire(trial)
+        layer.overlay.show_data(DATA)
+        layer.image("target", target, screen.width / 2, screen.height / 2)
+        background.after(60_000, lambda: None)
+        root.update()
+        created += _widget_count(root) - before
+
+        layer.release(trial)
+        root.update()
+    return perf_counter() - started, created
+
+
+def main(trials: int = TRIALS) -> None:
+    root = Tk()
+    screen = ScreenConfig()
+    root.geometry(f"{screen.width}x{screen.height}")
+    root.update()
+
+    for name, fn in (("fresh", run_fresh), ("retained", run_retained)):
+        elapsed, created = fn(root, screen, trials)
+        print(
+            f"{name:>8}: {elapsed / trials * 1e3:7.3f} ms/trial, "
+            f"{created / trials:4.1f} widgets created/trial"
+        )
+
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else TRIALS)
@@ -0,0 +1,64 @@
+from collections import OrderedDict
+from collections.abc import Sequence
+from tkinter import Misc
+
+from PIL import Image, ImageDraw, ImageTk
+
+# (center x, center y, radius divisor, color); centers are fractions of the size
+# and the radius is size / divisor, as with create_circle().
+Circle = tuple[float, float, float, str]
+
+SPRITE_CACHE_SIZE = 32
+
+
+def render_circles(size: int, background: str, circles: Sequence[Circle]) -> Image.Image:
+    image = Image.new("RGB", (size, size), background)
+    draw = ImageDraw.Draw(image)
+    for cx, cy, divisor, color in circles:
+        r = size / divisor
+        x, y = size * cx, size * cy
+        draw.ellipse((x - r, y - r, x + r, y + r), fill=color)
+    return image
+
+
+class SpriteCache:
+    """LRU of rasterized target sprites, keyed by kind and size."""
+
+    def __init__(self, maxsize: int = SPRITE_CACHE_SIZE) -> None:
+        self._maxsize = maxsize
+        self._sprites: OrderedDict[tuple[int, str, int], ImageTk.PhotoImage] = (
+            OrderedDict()
+        )
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self,
+        master: Misc,
+        kind: str,
+        size: int,
+        background: str,
+        circles: Sequence[Circle],
+    ) -> ImageTk.PhotoImage:
+        # PhotoImages belong to one Tk interpreter.
+        key = (id(master.tk), kind, size)
+        sprite = self._sprites.get(key)
+        if sprite is not None:
+            self._sprites.move_to_end(key)
+            self.hits += 1
+            return sprite
+
+        self.misses += 1
+        sprite = ImageTk.PhotoImage(
+            render_circles(size, background, circles), master=master
+        )
+        self._sprites[key] = sprite
+        if len(self._sprites) > self._maxsize:
+            self._sprites.popitem(last=False)
+        return sprite
+
+    def clear(self) -> None:
+        self._sprites.clear()
+
+
+sprite_cache = SpriteCache()